@@ -0,0 +1,41 @@
+# benchmarks/_common.py
+# Gemeinsame Helfer der Benchmark-Skripte: Projektpfad, temporäre DB, Zeitmessung.
+# Aufruf der Skripte aus dem Projektordner, z. B. `python benchmarks/bench_connection.py`.
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def temp_db(name: str = "bench.sqlite"):
+    """Legt eine leere, migrierte DB in einem Temp-Ordner an und stellt models darauf um."""
+    import database.models as m
+    m.DB_PATH = os.path.join(tempfile.mkdtemp(prefix="ibu-bench-"), name)
+    m._init_db()
+    return m
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5) -> float:
+    """Beste Laufzeit in Sekunden aus repeat Durchläufen."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def rate(fn: Callable[[], object], n: int) -> Tuple[float, float]:
+    """(Aufrufe/s, µs je Aufruf) für n Aufrufe von fn."""
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    dt = time.perf_counter() - t0
+    return n / dt, dt / n * 1e6
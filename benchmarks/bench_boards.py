@@ -0,0 +1,138 @@
+# benchmarks/bench_boards.py
+# Scheibenzuweisung für ein großes Turnier (Standard: 200 Spieler, 20 Scheiben): alle Gruppen,
+# danach KO-Runde 1 mit 64 Qualifikanten. Verglichen werden das frühere Greedy-Verfahren der
+# Ansichten (je Gruppe, Spiel für Spiel) und database/scheduler.py (Zuordnung je Spieltag);
+# Qualität über board_fairness und die Höchstlast einer Scheibe je Spieltag.
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, Tuple
+
+from _common import temp_db
+
+
+def _greedy(con, table: str, turnier_id: int, matches, boards) -> None:
+    """Früheres Verfahren: Historie je Aufruf, dann je Spiel die Scheibe mit
+    (Einsätze der Spieler dort, Gesamtlast, Nummer) minimal – ohne Blick auf den Spieltag."""
+    count_sb: Dict[Tuple[int, int], int] = {}
+    count_b: Dict[int, int] = {int(b["id"]): 0 for b in boards}
+    hist = [r for t in ("spiele", "ko_spiele") for r in con.execute(
+        f"SELECT p1_id, p2_id, board_id FROM {t} WHERE turnier_id=? AND board_id IS NOT NULL", (turnier_id,))]
+    for r in hist + [m for m in matches if m["board_id"]]:
+        for pid in (r["p1_id"], r["p2_id"]):
+            if pid is not None:
+                count_sb[(pid, r["board_id"])] = count_sb.get((pid, r["board_id"]), 0) + 1
+        count_b[r["board_id"]] = count_b.get(r["board_id"], 0) + 1
+    for m in matches:
+        if m["board_id"]:
+            continue
+        pids = [p for p in (m["p1_id"], m["p2_id"]) if p is not None]
+        bid = min((sum(count_sb.get((p, int(b["id"])), 0) for p in pids), count_b[int(b["id"])], int(b["nummer"]), int(b["id"]))
+                  for b in boards)[3]
+        con.execute(f"UPDATE {table} SET board_id=? WHERE id=?", (bid, int(m["id"])))
+        count_b[bid] += 1
+        for p in pids:
+            count_sb[(p, bid)] = count_sb.get((p, bid), 0) + 1
+    con.commit()
+
+
+def _alt_gruppe(m, path: str) -> Callable[[int, int], None]:
+    from database.boards import fetch_boards
+    def run(tid: int, gid: int) -> None:
+        con = m._connect()
+        rc = m.column_map(path).group_round or "runde"
+        matches = con.execute(
+            f"SELECT id, p1_id, p2_id, board_id FROM spiele WHERE turnier_id=? AND gruppe_id=? ORDER BY {rc}, match_no, id",
+            (tid, gid),
+        ).fetchall()
+        _greedy(con, "spiele", tid, matches, fetch_boards(True, path))
+    return run
+
+
+def _alt_runde(m, path: str) -> Callable[[int, int], None]:
+    from database.boards import fetch_boards
+    def run(tid: int, runde: int) -> None:
+        con = m._connect()
+        matches = con.execute(
+            "SELECT id, p1_id, p2_id, board_id FROM ko_spiele WHERE turnier_id=? AND runde=? ORDER BY match_no, id",
+            (tid, runde),
+        ).fetchall()
+        _greedy(con, "ko_spiele", tid, matches, fetch_boards(True, path))
+    return run
+
+
+def _turnier(spieler: int, gruppe: int, scheiben: int):
+    from database.boards import add_board
+    m = temp_db(f"boards_{spieler}_{gruppe}.sqlite")
+    for b in range(scheiben):
+        add_board(b + 1, f"Scheibe {b + 1}", m.DB_PATH)
+    pids = [m.insert_teilnehmer(f"P{i:03d}") for i in range(spieler)]
+    tid = m.insert_turnier("Bench", "2026-01-01", "x")
+    m.set_turnier_teilnehmer(tid, pids)
+    random.Random(3).shuffle(pids)
+    m.save_grouping(tid, [(f"G{g:02d}", pids[a:a + gruppe]) for g, a in enumerate(range(0, spieler, gruppe))])
+    m.generate_group_round_robin(tid)
+    return m, tid
+
+
+def _max_last(con, table: str, rcol: str, tid: int) -> int:
+    """Höchste Spielzahl einer Scheibe an einem Spieltag bzw. in einer Runde."""
+    return int(con.execute(
+        f"SELECT COALESCE(MAX(c), 0) FROM (SELECT COUNT(*) AS c FROM {table} WHERE turnier_id=? AND board_id IS NOT NULL "
+        f"GROUP BY {rcol}, board_id)", (tid,)).fetchone()[0])
+
+
+def run(verfahren: str, spieler: int, gruppe: int, scheiben: int, ko: int) -> None:
+    from database import scheduler
+    m, tid = _turnier(spieler, gruppe, scheiben)
+    path = m.DB_PATH
+    if verfahren == "alt":
+        gruppe_fn, runde_fn = _alt_gruppe(m, path), _alt_runde(m, path)
+    else:
+        gruppe_fn = lambda t, g: scheduler.assign_group_boards(t, g, path)
+        runde_fn = lambda t, r: scheduler.assign_round_boards(t, r, path)
+    con = m._connect()
+    rcol = m.column_map(path).group_round or "runde"
+
+    t0 = time.perf_counter()
+    for gid, _name in m.fetch_groups(tid):
+        gruppe_fn(tid, gid)
+    t_gruppen = time.perf_counter() - t0
+    last_gruppen = _max_last(con, "spiele", rcol, tid)
+
+    rnd = random.Random(5)
+    m.save_results_batch([(int(r[0]), 3, rnd.randint(0, 2)) for r in con.execute(
+        "SELECT id FROM spiele WHERE turnier_id=?", (tid,)).fetchall()])
+    m.generate_ko_bracket_total(tid, ko)
+    t0 = time.perf_counter()
+    runde_fn(tid, 1)
+    t_ko = time.perf_counter() - t0
+    last_ko = _max_last(con, "ko_spiele", "runde", tid)
+
+    f = scheduler.board_fairness(tid, path)
+    print(f"{verfahren:<4} {gruppe:>5} {t_gruppen * 1000:>9.1f}ms {last_gruppen:>9} {t_ko * 1000:>7.1f}ms {last_ko:>6} "
+          f"{f.spiele:>7} {f.wiederholungen:>8} {f.max_gleiche_scheibe:>8} {f.last_min:>5}-{f.last_max:<5}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--spieler", type=int, default=200)
+    ap.add_argument("--gruppen", type=int, nargs="+", default=[5, 20], help="Gruppengrößen")
+    ap.add_argument("--scheiben", type=int, default=20)
+    ap.add_argument("--ko", type=int, default=64, help="Qualifikanten für den KO-Plan")
+    args = ap.parse_args()
+
+    print(f"{args.spieler} Spieler, {args.scheiben} Scheiben, KO mit {args.ko}")
+    print(f"{'':<4} {'Gr.':>5} {'Gruppen':>11} {'max/Tag':>9} {'KO-R1':>9} {'max/R1':>6} "
+          f"{'Spiele':>7} {'Wdh.':>8} {'max S×S':>8} {'Last':>11}")
+    for gruppe in args.gruppen:
+        for verfahren in ("alt", "neu"):
+            run(verfahren, args.spieler, gruppe, args.scheiben, args.ko)
+    print("max/Tag, max/R1: meiste Spiele einer Scheibe an einem Spieltag bzw. in KO-Runde 1;"
+          " Wdh./max S×S/Last: board_fairness (wiederholungen, max_gleiche_scheibe, last_min-last_max)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# benchmarks/bench_connection.py
+# Aufrufe/s typischer Lesefunktionen: langlebige Verbindung je Thread (database/connection.py)
+# gegen "neue Verbindung je Aufruf" wie vor dem Verbindungs-Manager.
+from __future__ import annotations
+
+import argparse
+import sqlite3
+
+from _common import rate, temp_db
+
+
+def _per_call_connection(m):
+    """Ersetzt den Verbindungs-Manager durch das alte Verhalten: sqlite3.connect bei jedem _connect()."""
+    def connect(path=None):
+        con = sqlite3.connect(path or m.DB_PATH)
+        con.row_factory = sqlite3.Row
+        return con
+    return connect
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("-n", type=int, default=3000, help="Aufrufe je Messung")
+    args = ap.parse_args()
+
+    m = temp_db()
+    tid = m.insert_turnier("Bench", "2026-01-01", "x")
+    ids = [m.insert_teilnehmer(f"P{i}") for i in range(16)]
+    m.set_turnier_teilnehmer(tid, ids)
+    m.save_grouping(tid, [("A", ids[:8]), ("B", ids[8:])])
+    m.generate_group_round_robin(tid)
+    gid = m.fetch_groups(tid)[0][0]
+
+    calls = {
+        "fetch_group_matches": lambda: m.fetch_group_matches(tid, gid),
+        "has_group_matches": lambda: m.has_group_matches(tid),
+        "fetch_groups": lambda: m.fetch_groups(tid),
+    }
+    pooled = m.get_connection
+    results = {}
+    for mode, conn_fn in (("je Aufruf", _per_call_connection(m)), ("je Thread", pooled)):
+        m.get_connection = conn_fn
+        try:
+            for name, fn in calls.items():
+                fn()  # Caches (Namen, Spaltenliste) vorwärmen – gemessen wird nur die Verbindung
+                results[(name, mode)] = rate(fn, args.n)
+        finally:
+            m.get_connection = pooled
+
+    print(f"{'Funktion':<22} {'neue Verbindung':>18} {'Verbindung je Thread':>22} {'Faktor':>7}")
+    for name in calls:
+        before, after = results[(name, "je Aufruf")][0], results[(name, "je Thread")][0]
+        print(f"{name:<22} {before:>14,.0f} /s {after:>18,.0f} /s {after / before:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_html.py
+# HTML-Tabellen der Exporte (Qt-PDF-Pfad): utils/exporter._html_table gegen den früheren
+# f-String-Renderer (je Zelle ein f-String, ohne Escaping) und gegen zellenweises Escaping
+# (_zeile). Daten wie die Saison-Spielliste, einmal ohne Sonderzeichen, einmal mit '<'/'&' in
+# jedem 50. Spielernamen.
+from __future__ import annotations
+
+import argparse
+from typing import List, Optional, Sequence
+
+from _common import best_of, temp_db
+
+HEADER = ["Turnier", "Datum", "Phase", "Gruppe/Runde", "Runde/Match", "Spieler 1", "Spieler 2", "S1", "S2"]
+
+
+def alt_html_table(headers: Sequence[str], rows: Sequence[Sequence[object]], caption: Optional[str] = None) -> str:
+    """Früheres _html_table (f-Strings, kein Escaping)."""
+    thead = "".join(f"<th>{h}</th>" for h in headers)
+    body_rows = []
+    for r in rows:
+        tds = "".join(f"<td>{'' if v is None else v}</td>" for v in r)
+        body_rows.append(f"<tr>{tds}</tr>")
+    caption_html = f"<h2>{caption}</h2>" if caption else ""
+    return f"""
+      {caption_html}
+      <table>
+        <thead><tr>{thead}</tr></thead>
+        <tbody>
+          {''.join(body_rows)}
+        </tbody>
+      </table>
+    """
+
+
+def zeilen(n: int, sonderzeichen: bool) -> List[List[object]]:
+    return [[f"Turnier {i // 500}", f"2026-{1 + i % 12:02d}-01", "Gruppenphase", f"G{i % 20:02d}",
+             f"{i // 200 + 1}/{i % 10 + 1}", f"Spieler {i % 500}",
+             f"Spieler {(i * 7 + 3) % 500}" + (" <Gast> & Co" if sonderzeichen and i % 50 == 0 else ""),
+             3, i % 3 if i % 17 else None]
+            for i in range(n)]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--zeilen", type=int, nargs="+", default=[5_000, 50_000])
+    ap.add_argument("--repeat", type=int, default=7)
+    args = ap.parse_args()
+
+    temp_db()
+    from utils import exporter as ex
+
+    def zellenweise(headers, rows, caption=None):
+        return ex._fuellen(ex._TABELLE, "", ex._thead(tuple(headers)), "".join(map(ex._zeile, rows)))
+
+    print(f"best of {args.repeat}, ms        alt (f-String)  zellenweise  _html_table  Faktor ggü. alt")
+    for n in args.zeilen:
+        for sonder in (False, True):
+            rows = zeilen(n, sonder)
+            if not sonder:
+                assert ex._html_table(HEADER, rows) == alt_html_table(HEADER, rows)  # ohne Sonderzeichen identisch
+            t_alt, t_zelle, t_neu = (best_of(lambda f=f: f(HEADER, rows), args.repeat) * 1000
+                                     for f in (alt_html_table, zellenweise, ex._html_table))
+            art = "mit <&" if sonder else "ohne <&"
+            print(f"{n:>7,} Zeilen {art:<8} {t_alt:>10.1f} {t_zelle:>12.1f} {t_neu:>12.1f} {t_alt / t_neu:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# benchmarks/bench_pdf.py
+# PDF-Export einer großen Tabelle (Standard: 5 000 Zeilen, Layout wie die Saison-Spielliste):
+# dieselbe Tabelle über save_pdf(..., backend="intern") (utils/pdfwriter.py) und backend="qt"
+# (QTextDocument/QPrinter). Die Qt-Spalte entfällt mit Hinweis, wenn PyQt6 oder eine
+# QGuiApplication nicht verfügbar ist (ohne Anzeige wird QT_QPA_PLATFORM=offscreen versucht).
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from typing import Optional
+
+from _common import best_of, temp_db
+
+HEADER = ["Turnier", "Datum", "Phase", "Gruppe/Runde", "Runde/Match", "Spieler 1", "Spieler 2", "S1", "S2"]
+
+
+def tabelle(n: int):
+    from utils.pdfwriter import Tabelle
+    rows = [[f"Turnier {i // 500}", f"2026-{1 + i % 12:02d}-01", "Gruppenphase", f"G{i % 20:02d}", f"{i // 200 + 1}/{i % 10 + 1}",
+             f"Spieler {i % 500} & Co", f"Spieler {(i * 7 + 3) % 500} <Gast>", 3, i % 3 if i % 17 else None]
+            for i in range(n)]
+    return Tabelle(HEADER, rows, f"{n} Spiele")
+
+
+def qt_app() -> Optional[object]:
+    """QGuiApplication für den Qt-Pfad oder None (Grund wird ausgegeben)."""
+    if not os.environ.get("DISPLAY") and not os.environ.get("WAYLAND_DISPLAY"):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt6.QtGui import QGuiApplication
+    except ImportError as e:
+        print(f"Qt übersprungen: PyQt6 nicht verfügbar ({e})")
+        return None
+    try:
+        return QGuiApplication.instance() or QGuiApplication([])
+    except Exception as e:  # z. B. keine Plattform-Plugins
+        print(f"Qt übersprungen: keine QGuiApplication ({e})")
+        return None
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--zeilen", type=int, default=5_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    temp_db()  # Fußzeile/Einstellungen nicht aus der echten DB
+    from utils import exporter as ex
+
+    tab = tabelle(args.zeilen)
+    out = tempfile.mkdtemp(prefix="ibu-bench-")
+    backends = ["intern"] + (["qt"] if qt_app() is not None else [])
+    print(f"{args.zeilen:,} Zeilen, Querformat, best of {args.repeat}")
+    for backend in backends:
+        path = os.path.join(out, f"{backend}.pdf")
+        dt = best_of(lambda: ex.save_pdf("Saison-Spiele", ["<b>Saison:</b> Benchmark"], [tab], path, "landscape", backend),
+                     args.repeat)
+        print(f"{backend:<7} {dt * 1000:>8.0f} ms  {os.path.getsize(path) / 1024:>7.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_round_robin.py
+# Jeder-gegen-jeden für große synthetische Turniere (Standard: 10 000 Spieler):
+# Paarungstabelle (utils/spielplan_generator.py) und generate_group_round_robin (ein executemany)
+# gegen einzelne INSERTs je Spiel, jeweils mit Hin- bzw. Hin- und Rückrunde.
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from _common import best_of, temp_db
+
+
+def _turnier(m, spieler: int, gruppe: int) -> int:
+    con = m._connect()
+    con.executemany("INSERT INTO teilnehmer(name,spitzname) VALUES(?,'')", [(f"P{i:05d}",) for i in range(spieler)])
+    con.commit()
+    tid = m.insert_turnier(f"Open {spieler}/{gruppe}", "2026-01-01", "x")
+    ids = [int(r[0]) for r in con.execute("SELECT id FROM teilnehmer ORDER BY id DESC LIMIT ?", (spieler,))]
+    random.Random(3).shuffle(ids)
+    m.save_grouping(tid, [(f"G{i:04d}", ids[a:a + gruppe]) for i, a in enumerate(range(0, spieler, gruppe))])
+    return tid
+
+
+def _einzeln(m, tid: int, legs: int) -> int:
+    """Vergleich: dieselben Zeilen, aber ein execute je Spiel (eine Transaktion)."""
+    from utils.spielplan_generator import round_robin_schedule
+    con = m._connect()
+    rcol = m.column_map(m.DB_PATH).group_round or "spieltag"
+    con.execute("DELETE FROM spiele WHERE turnier_id=?", (tid,))
+    grouping = m.fetch_grouping(tid)
+    n = 0
+    for gid, name in m.fetch_groups(tid):
+        ids = sorted(pid for pid, _n, _s in grouping[name])
+        for runde, no, p1, p2 in round_robin_schedule(ids, legs):
+            con.execute(
+                f"INSERT INTO spiele(turnier_id,gruppe_id,{rcol},match_no,p1_id,p2_id,s1,s2) VALUES(?,?,?,?,?,?,NULL,NULL)",
+                (tid, gid, runde, no, p1, p2),
+            )
+            n += 1
+    con.commit()
+    return n
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--spieler", type=int, default=10_000)
+    ap.add_argument("--gruppen", type=int, nargs="+", default=[16, 7], help="Gruppengrößen")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    from utils.spielplan_generator import round_robin_table
+
+    m = temp_db("round_robin.sqlite")
+    print(f"{'Gruppen à':>9} {'Legs':>4} {'Spiele':>8} {'Tabelle':>9} {'executemany':>12} {'Einzel-INSERT':>14} {'Spiele/s':>11}")
+    for gruppe in args.gruppen:
+        tid = _turnier(m, args.spieler, gruppe)
+        sizes = {len(v) for v in m.fetch_grouping(tid).values()}
+        for legs in (1, 2):
+            def tabelle():
+                round_robin_table.cache_clear()
+                for n in sizes:
+                    round_robin_table(n, legs)
+            t_tab = best_of(tabelle, args.repeat)
+            t_bulk = best_of(lambda: m.generate_group_round_robin(tid, legs), args.repeat)
+            spiele = int(m._connect().execute("SELECT COUNT(*) FROM spiele WHERE turnier_id=?", (tid,)).fetchone()[0])
+            t0 = time.perf_counter()
+            n = _einzeln(m, tid, legs)
+            t_single = time.perf_counter() - t0
+            assert n == spiele, (n, spiele)
+            print(f"{gruppe:>9} {legs:>4} {spiele:>8,} {t_tab * 1000:>7.1f}ms {t_bulk * 1000:>10.1f}ms "
+                  f"{t_single * 1000:>12.1f}ms {spiele / t_bulk:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_season_export.py
+# Saison-Export mit ~1 Mio. Spielen (Standard: 50 Turniere × 20 000 Gruppenspiele + KO):
+# gestreamt (export_meisterschaft_spiele_csv, fetchmany) gegen "erst alle Zeilen als Liste,
+# dann schreiben". Jede Variante läuft in einem eigenen Prozess, damit maxRSS vergleichbar ist.
+from __future__ import annotations
+
+import argparse
+import filecmp
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from _common import ROOT  # noqa: F401  (Projektpfad für die Importe)
+
+HEADER = ["Turnier", "Datum", "Phase", "Gruppe/Runde", "Runde/Match", "Spieler 1", "Spieler 2", "S1", "S2"]
+KO_RUNDEN = ((1, 16), (2, 8), (3, 4), (4, 2), (5, 1), (99, 1))
+
+
+def build(path: str, turniere: int, spiele: int, spieler: int = 500, gruppen: int = 20) -> int:
+    """Synthetische Saison direkt per executemany (Ergebnisse gesetzt); liefert die Meisterschafts-ID."""
+    import database.models as m
+    m.DB_PATH = path
+    m._init_db()
+    con = m._connect()
+    rcol = m.column_map(path).group_round or "spieltag"
+    con.executemany("INSERT INTO teilnehmer(name,spitzname) VALUES(?,'')", [(f"Spieler {i}",) for i in range(spieler)])
+    pids = [int(r[0]) for r in con.execute("SELECT id FROM teilnehmer ORDER BY id")]
+    ms = m.insert_meisterschaft("Saison", "2026")
+    tids = []
+    for t in range(turniere):
+        tid = m.insert_turnier(f"T{t}", f"2026-{1 + t % 12:02d}-{1 + t % 28:02d}", "x")
+        tids.append(tid)
+        gids = [con.execute("INSERT INTO gruppen(turnier_id,name) VALUES(?,?)", (tid, f"G{g:02d}")).lastrowid
+                for g in range(gruppen)]
+        con.executemany(
+            f"INSERT INTO spiele(turnier_id,gruppe_id,{rcol},match_no,p1_id,p2_id,s1,s2) VALUES(?,?,?,?,?,?,?,?)",
+            ((tid, gids[i % gruppen], i // 200 + 1, i % 10 + 1, pids[i % spieler], pids[(i * 7 + 3) % spieler], 3, i % 3)
+             for i in range(spiele)),
+        )
+        con.executemany(
+            "INSERT INTO ko_spiele(turnier_id,runde,match_no,p1_id,p2_id,s1,s2) VALUES(?,?,?,?,?,3,1)",
+            [(tid, r, k + 1, pids[k], pids[k + 1]) for r, n in KO_RUNDEN for k in range(n)],
+        )
+    con.commit()
+    m.set_meisterschaft_turniere(ms, tids)
+    return ms
+
+
+def messen(path: str, ms: int, modus: str, out: str, trace: bool) -> None:
+    import database.models as m
+    from utils import exporter as ex
+    m.DB_PATH = path
+    g = m.iter_meisterschaft_spiele(ms, 1)
+    next(g)
+    g.close()  # Namen/Spaltenliste vorwärmen
+    rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    if modus == "stream":
+        ex.export_meisterschaft_spiele_csv(ms, out)
+    else:
+        rows = [
+            [tn, d, "KO-Phase", "Bronze" if r == 99 else ex._ko_round_label_from_match_count(n), mn, a, b, s1, s2] if ko
+            else [tn, d, "Gruppenphase", gn, f"{r}/{mn}", a, b, s1, s2]
+            for tn, d, ko, gn, r, mn, n, a, b, s1, s2 in list(m.iter_meisterschaft_spiele(ms))
+        ]
+        ex.save_csv(rows, HEADER, out)
+    dt = time.perf_counter() - t0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    heap = ""
+    if trace:
+        heap = f"  Python-Peak {tracemalloc.get_traced_memory()[1] / 2**20:>7.1f} MiB"
+        tracemalloc.stop()
+    print(f"{modus:<7} {dt:>7.2f} s  maxRSS {rss:>5.0f} MiB (vorher {rss0:.0f}){heap}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turniere", type=int, default=50)
+    ap.add_argument("--spiele", type=int, default=20_000, help="Gruppenspiele je Turnier")
+    ap.add_argument("--db", help="vorhandene/zu erstellende DB (Standard: Temp-Ordner)")
+    ap.add_argument("--trace", action="store_true", help="zusätzlich Python-Heap-Peak (tracemalloc, deutlich langsamer)")
+    ap.add_argument("--modus", choices=("stream", "liste"), help=argparse.SUPPRESS)  # Kindprozess
+    ap.add_argument("--ms", type=int, default=1, help=argparse.SUPPRESS)
+    ap.add_argument("--out", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.modus:
+        messen(args.db, args.ms, args.modus, args.out, args.trace)
+        return
+
+    tmp = tempfile.mkdtemp(prefix="ibu-bench-")
+    path = args.db or os.path.join(tmp, "season.sqlite")
+    if not os.path.exists(path):
+        t0 = time.perf_counter()
+        ms = build(path, args.turniere, args.spiele)
+        print(f"DB erstellt in {time.perf_counter() - t0:.1f} s: {path}")
+    else:
+        ms = args.ms
+    import sqlite3
+    with sqlite3.connect(path) as con:
+        n = con.execute("SELECT (SELECT COUNT(*) FROM spiele) + (SELECT COUNT(*) FROM ko_spiele)").fetchone()[0]
+    print(f"{n:,} Spiele")
+    outs = {}
+    for modus in ("stream", "liste"):
+        outs[modus] = os.path.join(tmp, f"{modus}.csv")
+        subprocess.run([sys.executable, __file__, "--db", path, "--ms", str(ms), "--modus", modus,
+                        "--out", outs[modus]] + (["--trace"] if args.trace else []), check=True)
+    print("Dateien identisch:", filecmp.cmp(outs["stream"], outs["liste"], shallow=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# database/__init__.py
+from . import schema  # noqa: F401  – registriert die Schema-Migrationen beim ersten Verbindungsaufbau
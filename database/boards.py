@@ -0,0 +1,78 @@
+# database/boards.py
+# Dartscheiben-Register: alle Scheiben einmal geladen und gecacht (geteilt von Gruppen-/KO-Ansicht
+# und den Einstellungen). Änderungen nur über die Funktionen hier -> Cache wird invalidiert.
+from __future__ import annotations
+import os, sqlite3, threading
+from typing import Dict, List, Optional, Tuple
+
+from .connection import DB_PATH, get_connection, register_initializer
+
+_lock = threading.Lock()
+_boards: Dict[str, Tuple[sqlite3.Row, ...]] = {}
+
+
+def board_label(nummer: Optional[int], name: Optional[str]) -> str:
+    if nummer is None:
+        return ""
+    return f"{nummer} – {name}"
+
+
+def fetch_boards(only_active: bool = True, path: Optional[str] = None) -> List[sqlite3.Row]:
+    """Scheiben sortiert (aktive zuerst, dann Nummer); only_active=True: nur aktive nach Nummer."""
+    con = get_connection(path)
+    key = os.path.abspath(path or DB_PATH)
+    rows = _boards.get(key)
+    if rows is None:
+        with _lock:
+            rows = _boards.get(key)
+            if rows is None:
+                rows = tuple(con.execute("SELECT * FROM dartscheiben ORDER BY aktiv DESC, nummer").fetchall())
+                _boards[key] = rows
+    if only_active:
+        return [b for b in rows if b["aktiv"]]
+    return list(rows)
+
+
+def board_labels(path: Optional[str] = None) -> Dict[int, str]:
+    """id -> 'Nummer – Name' für alle Scheiben (aus dem Cache)."""
+    return {int(b["id"]): board_label(b["nummer"], b["name"]) for b in fetch_boards(False, path)}
+
+
+def invalidate_boards(path: Optional[str] = None) -> None:
+    with _lock:
+        if path is None:
+            _boards.clear()
+        else:
+            _boards.pop(os.path.abspath(path), None)
+
+
+# ------------------------------------------------------------
+# Änderungen (committen & invalidieren)
+# ------------------------------------------------------------
+def add_board(nummer: int, name: str, path: Optional[str] = None) -> int:
+    """Legt eine aktive Scheibe an; sqlite3.IntegrityError bei doppelter Nummer."""
+    with get_connection(path) as con:
+        cur = con.execute("INSERT INTO dartscheiben(nummer, name, aktiv) VALUES(?,?,1)", (nummer, name))
+    invalidate_boards(path)
+    return int(cur.lastrowid)
+
+
+def toggle_board(board_id: int, path: Optional[str] = None) -> None:
+    with get_connection(path) as con:
+        con.execute("UPDATE dartscheiben SET aktiv=CASE WHEN aktiv THEN 0 ELSE 1 END WHERE id=?", (board_id,))
+    invalidate_boards(path)
+
+
+def rename_board(board_id: int, name: str, path: Optional[str] = None) -> None:
+    with get_connection(path) as con:
+        con.execute("UPDATE dartscheiben SET name=? WHERE id=?", (name, board_id))
+    invalidate_boards(path)
+
+
+def delete_board(board_id: int, path: Optional[str] = None) -> None:
+    with get_connection(path) as con:
+        con.execute("DELETE FROM dartscheiben WHERE id=?", (board_id,))
+    invalidate_boards(path)
+
+
+register_initializer(lambda path, _con: invalidate_boards(path))
@@ -0,0 +1,253 @@
+# database/bracket.py
+# KO-Baum im Speicher: ein SELECT je Turnier, Zugriff über (runde, match_no) in O(1).
+# Ergebnisse werden hier eingetragen und weitergetragen; flush() schreibt nur die
+# geänderten Spiele nach 'ko_spiele'. Nur sqlite3 – benutzt von models.py.
+from __future__ import annotations
+import sqlite3
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .rangliste import BRONZE_ROUND
+
+
+def next_slot(match_no: int) -> Tuple[int, int]:
+    """Zielspiel (match_no der Folgerunde) und Seite (1/2) für den Sieger von match_no."""
+    return (match_no + 1) // 2, 1 if match_no % 2 == 1 else 2
+
+
+def bracket_size(n: int) -> int:
+    """Kleinste 2er-Potenz >= n (Anzahl Startplätze)."""
+    return 1 << max(1, (n - 1).bit_length())
+
+
+def seed_order(size: int) -> List[int]:
+    """Setzplatz je Startposition (Standard-Seeding): 1 und 2 treffen frühestens im Finale,
+    1–4 frühestens im Halbfinale usw.; Setzplatz s spielt in Runde 1 gegen size+1-s."""
+    order = [1]
+    while len(order) < size:
+        n = 2 * len(order) + 1
+        order = [x for s in order for x in (s, n - s)]
+    return order
+
+
+PlanRow = Tuple[int, int, Optional[int], Optional[int]]  # (runde, match_no, p1_id, p2_id)
+
+
+def plan_rows(slots: Sequence[Optional[int]]) -> List[PlanRow]:
+    """Alle KO-Spiele für eine Startaufstellung (Länge 2^k, None = Freilos).
+
+    Freilos-Spiele werden nicht angelegt – der Spieler steht direkt in Runde 2;
+    match_no bleibt die Position im Raster (Lücken in Runde 1 möglich).
+    """
+    size = len(slots)
+    rounds = size.bit_length() - 1
+    if size < 2 or size != 1 << rounds:
+        raise ValueError("Startaufstellung muss 2^k Plätze haben.")
+    rows: List[PlanRow] = []
+    vor: Dict[int, List[Optional[int]]] = {}  # Runde-2-Spiel -> [p1, p2] aus Freilosen
+    for no in range(1, size // 2 + 1):
+        a, b = slots[2 * no - 2], slots[2 * no - 1]
+        if a is not None and b is not None:
+            rows.append((1, no, a, b))
+            continue
+        if a is None and b is None:
+            raise ValueError(f"Runde 1, Match {no}: Freilos gegen Freilos.")
+        target, side = next_slot(no)
+        vor.setdefault(target, [None, None])[side - 1] = a if a is not None else b
+    for r in range(2, rounds + 1):
+        for no in range(1, (size >> r) + 1):
+            p1, p2 = vor.get(no, (None, None)) if r == 2 else (None, None)
+            rows.append((r, no, p1, p2))
+    return rows
+
+
+class KoKorrektur(NamedTuple):
+    geaendert: Set[int]                         # alle geschriebenen Spiele (inkl. Folgespiele/Bronze)
+    zurueckgesetzt: List[Tuple[int, int, int]]  # (id, runde, match_no) verworfener Ergebnisse
+
+
+class KoSpiel:
+    __slots__ = ("id", "runde", "match_no", "p1", "p2", "s1", "s2")
+
+    def __init__(self, id: int, runde: int, match_no: int, p1: Optional[int], p2: Optional[int],
+                 s1: Optional[int], s2: Optional[int]):
+        self.id = id; self.runde = runde; self.match_no = match_no
+        self.p1 = p1; self.p2 = p2; self.s1 = s1; self.s2 = s2
+
+    def winner_loser(self) -> Optional[Tuple[int, int]]:
+        if self.s1 is None or self.s2 is None or self.s1 == self.s2 or self.p1 is None or self.p2 is None:
+            return None
+        return (self.p1, self.p2) if self.s1 > self.s2 else (self.p2, self.p1)
+
+    def winner(self) -> Optional[int]:
+        wl = self.winner_loser()
+        return wl[0] if wl else None
+
+
+class KoBracket:
+    """KO-Plan eines Turniers; Spiele liegen in einem Raster [runde-1][match_no-1]."""
+
+    def __init__(self, turnier_id: int, spiele: Iterable[KoSpiel]):
+        self.turnier_id = turnier_id
+        self.bronze: Optional[KoSpiel] = None
+        self._by_id: Dict[int, KoSpiel] = {}
+        self._grid: List[List[Optional[KoSpiel]]] = []
+        self._dirty: Set[int] = set()
+        self._insert_bronze = False
+        self._invalid: Set[int] = set()
+        for m in spiele:
+            self._by_id[m.id] = m
+            if m.runde == BRONZE_ROUND:
+                self.bronze = m
+                continue
+            while len(self._grid) < m.runde:
+                self._grid.append([])
+            col = self._grid[m.runde - 1]
+            while len(col) < m.match_no:
+                col.append(None)
+            col[m.match_no - 1] = m
+        self.final_round = len(self._grid)
+
+    @classmethod
+    def load(cls, con: sqlite3.Connection, turnier_id: int) -> "KoBracket":
+        rows = con.execute(
+            "SELECT id, runde, match_no, p1_id, p2_id, s1, s2 FROM ko_spiele WHERE turnier_id=? AND runde>0 AND match_no>0",
+            (turnier_id,),
+        ).fetchall()
+        return cls(turnier_id, (KoSpiel(*(None if v is None else int(v) for v in r)) for r in rows))
+
+    def spiel(self, runde: int, match_no: int) -> Optional[KoSpiel]:
+        if runde == BRONZE_ROUND:
+            return self.bronze
+        if not (0 < runde <= len(self._grid)) or not (0 < match_no <= len(self._grid[runde - 1])):
+            return None
+        return self._grid[runde - 1][match_no - 1]
+
+    def by_id(self, match_id: int) -> Optional[KoSpiel]:
+        return self._by_id.get(match_id)
+
+    def final(self) -> Optional[KoSpiel]:
+        return self.spiel(self.final_round, 1) if self.final_round else None
+
+    def parent(self, m: KoSpiel) -> Optional[Tuple[KoSpiel, int]]:
+        """Folgespiel und Seite, in die der Sieger von m einzieht (None für Finale/Bronze)."""
+        if m.runde == BRONZE_ROUND or m.runde >= self.final_round:
+            return None
+        target_no, side = next_slot(m.match_no)
+        target = self.spiel(m.runde + 1, target_no)
+        return (target, side) if target is not None else None
+
+    def placement_ids(self) -> Set[int]:
+        """Spiele, aus denen Platz 1–4 folgen (Finale & Bronze)."""
+        return {m.id for m in (self.final(), self.bronze) if m is not None and m.id is not None}
+
+    def platzierungen(self) -> Dict[int, int]:
+        """teilnehmer_id -> Platz 1–4 (leer, solange das Finale offen ist)."""
+        fin = self.final()
+        wl = fin.winner_loser() if fin is not None else None
+        if wl is None:
+            return {}
+        out = {wl[0]: 1, wl[1]: 2}
+        bwl = self.bronze.winner_loser() if self.bronze is not None else None
+        if bwl is not None:
+            out[bwl[0]] = 3
+            out[bwl[1]] = 4
+        return out
+
+    def zurueckgesetzt(self) -> List[Tuple[int, int, int]]:
+        """Spiele, deren Ergebnis durch eine Korrektur weiter vorn verworfen wurde."""
+        ms = sorted((m for m in self._by_id.values() if m.id in self._invalid), key=self.order_key)
+        return [(m.id, m.runde, m.match_no) for m in ms]
+
+    @staticmethod
+    def order_key(m: KoSpiel) -> Tuple[bool, int, int]:
+        """Rundenfolge, Bronze zuletzt."""
+        return (m.runde == BRONZE_ROUND, m.runde, m.match_no)
+
+    # --------------------------------------------------------
+    # Ändern
+    # --------------------------------------------------------
+    def set_result(self, match_id: int, s1: Optional[int], s2: Optional[int]) -> bool:
+        """Trägt ein Ergebnis ein und zieht den Sieger weiter; False, wenn unverändert.
+
+        ValueError, wenn ein Ergebnis für eine (noch) unvollständige Paarung eingetragen werden soll.
+        """
+        m = self._by_id[match_id]
+        if (m.s1, m.s2) == (s1, s2):
+            return False
+        if (s1 is not None or s2 is not None) and (m.p1 is None or m.p2 is None):
+            raise ValueError(f"Match {match_id}: Paarung ist noch unvollständig.")
+        before = m.winner()
+        m.s1, m.s2 = s1, s2
+        self._dirty.add(m.id)
+        self._invalid.discard(m.id)  # neu eingetragen -> nicht mehr verworfen
+        if m.winner() != before:
+            self._advance(m)
+        return True
+
+    def _advance(self, m: KoSpiel) -> None:
+        """Setzt den (neuen) Sieger von m ins Folgespiel; ein dort schon gespieltes Ergebnis gehört
+        zur alten Paarung und wird samt allem, was daraus weitergetragen wurde, verworfen."""
+        par = self.parent(m)
+        if par is None:
+            return
+        target, side = par
+        winner = m.winner()
+        if (target.p1 if side == 1 else target.p2) == winner:
+            return
+        had_winner = target.winner() is not None
+        if side == 1:
+            target.p1 = winner
+        else:
+            target.p2 = winner
+        self._clear_result(target)
+        self._dirty.add(target.id)
+        if had_winner:
+            self._advance(target)
+
+    def _clear_result(self, m: KoSpiel) -> None:
+        if m.s1 is not None or m.s2 is not None:
+            m.s1 = m.s2 = None
+            self._invalid.add(m.id)
+
+    def derive_bronze(self) -> bool:
+        """Bronze = Verlierer der beiden Halbfinals. Legt das Spiel an, sobald beide entschieden sind;
+        ändert sich die Paarung (auch: Halbfinale wieder offen), wird ein Bronze-Ergebnis verworfen."""
+        if self.final_round < 2:
+            return False
+        semis = [self.spiel(self.final_round - 1, no) for no in (1, 2)]
+        if semis[0] is None or semis[1] is None:
+            return False
+        losers = [wl[1] if wl else None for wl in (s.winner_loser() for s in semis)]
+        b = self.bronze
+        if b is None:
+            if None in losers:
+                return False
+            self.bronze = KoSpiel(None, BRONZE_ROUND, 1, losers[0], losers[1], None, None)
+            self._insert_bronze = True
+            return True
+        if [b.p1, b.p2] == losers:
+            return False
+        b.p1, b.p2 = losers
+        self._clear_result(b)
+        self._dirty.add(b.id)
+        return True
+
+    def flush(self, con: sqlite3.Connection) -> Set[int]:
+        """Schreibt nur die geänderten Spiele (ohne Commit); liefert deren IDs."""
+        ids = self._dirty
+        self._dirty = set()
+        con.executemany(
+            "UPDATE ko_spiele SET p1_id=?, p2_id=?, s1=?, s2=? WHERE id=?",
+            [(m.p1, m.p2, m.s1, m.s2, m.id) for m in (self._by_id[i] for i in sorted(ids))],
+        )
+        if self._insert_bronze:
+            b = self.bronze
+            cur = con.execute(
+                "INSERT INTO ko_spiele(turnier_id,runde,match_no,p1_id,p2_id,s1,s2) VALUES(?,?,?,?,?,NULL,NULL)",
+                (self.turnier_id, BRONZE_ROUND, 1, b.p1, b.p2),
+            )
+            b.id = int(cur.lastrowid)
+            self._by_id[b.id] = b
+            self._insert_bronze = False
+            ids.add(b.id)
+        return ids
@@ -0,0 +1,114 @@
+# database/connection.py
+# Prozessweite SQLite-Verbindungen: eine langlebige Verbindung pro Thread und DB-Datei
+from __future__ import annotations
+import os, sqlite3, threading
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+DB_PATH = os.path.join(DATA_DIR, "ibu.sqlite")
+
+# Wird beim Öffnen jeder Verbindung einmal gesetzt (nicht pro Aufruf)
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",     # in WAL sicher, spart fsync pro Commit
+    "PRAGMA cache_size=-16000",      # ~16 MB Page-Cache
+    "PRAGMA mmap_size=67108864",     # 64 MB Memory-Mapped I/O
+    "PRAGMA temp_store=MEMORY",
+)
+STATEMENT_CACHE_SIZE = 256  # vorbereitete Statements je Verbindung
+FETCH_SIZE = 2000           # Zeilen je fetchmany beim Streamen großer Abfragen
+
+_local = threading.local()
+_lock = threading.RLock()
+_open_connections: List[sqlite3.Connection] = []
+_generation = 0  # wird von close_all() erhöht -> Thread-Caches verwerfen
+
+# Einmal pro Prozess & DB-Datei beim ersten Öffnen (z. B. Schema-Migrationen, siehe schema.py)
+_initializers: List[Callable[[str, sqlite3.Connection], None]] = []
+_initialized: Set[str] = set()
+
+
+def register_initializer(fn: Callable[[str, sqlite3.Connection], None]) -> None:
+    if fn not in _initializers:
+        _initializers.append(fn)
+
+
+def _open(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # check_same_thread=False nur, damit close_all() aus dem GUI-Thread schließen darf;
+    # benutzt wird jede Verbindung ausschließlich von ihrem eigenen Thread.
+    con = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+    con.row_factory = sqlite3.Row
+    for pragma in _PRAGMAS:
+        try:
+            con.execute(pragma)
+        except sqlite3.DatabaseError:
+            pass
+    return con
+
+
+def get_connection(path: Optional[str] = None) -> sqlite3.Connection:
+    """Liefert die Verbindung des aktuellen Threads (wird beim ersten Zugriff geöffnet).
+
+    Die Verbindung wird NICHT geschlossen; `with get_connection() as con:` committet
+    bzw. macht ein Rollback wie bisher.
+    """
+    key = os.path.abspath(path or DB_PATH)
+    cons: Optional[Dict[str, sqlite3.Connection]] = getattr(_local, "cons", None)
+    if cons is None or getattr(_local, "generation", -1) != _generation:
+        cons = {}
+        _local.cons = cons
+        _local.generation = _generation
+    con = cons.get(key)
+    if con is None:
+        con = _open(key)
+        cons[key] = con
+        with _lock:
+            _open_connections.append(con)
+    if key not in _initialized:
+        with _lock:
+            if key not in _initialized:
+                for fn in _initializers:
+                    fn(key, con)
+                _initialized.add(key)
+    return con
+
+
+def open_connection(path: Optional[str] = None) -> sqlite3.Connection:
+    """Eigene, nicht geteilte Verbindung (gleiche PRAGMAs) – für Lesetransaktionen, die über
+    yield hinweg offen bleiben. Schreibzugriffe desselben Threads über get_connection() landen
+    sonst in dieser Transaktion und beenden sie mit ihrem Commit. Der Aufrufer schließt sie."""
+    key = os.path.abspath(path or DB_PATH)
+    get_connection(key)  # Initialisierung (Migrationen) wie gewohnt über die Thread-Verbindung
+    return _open(key)
+
+
+def iter_rows(cur: sqlite3.Cursor, size: int = FETCH_SIZE) -> Iterator[sqlite3.Row]:
+    """Zeilen eines Cursors blockweise (fetchmany) – nie mehr als size Zeilen gleichzeitig in Python."""
+    while True:
+        rows = cur.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+
+def checkpoint(path: Optional[str] = None) -> None:
+    """Schreibt das WAL in die Hauptdatei zurück (z. B. vor einer Datei-Kopie/Backup)."""
+    con = get_connection(path)
+    con.commit()
+    con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def close_all() -> None:
+    """Schließt alle offenen Verbindungen (z. B. vor einem Restore der DB-Datei)."""
+    global _generation
+    with _lock:
+        for con in _open_connections:
+            try:
+                con.close()
+            except Exception:
+                pass
+        _open_connections.clear()
+        _initialized.clear()
+        _generation += 1
@@ -1,23 +1,33 @@
 # database/models.py
 from __future__ import annotations
-import os, math, sqlite3
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+import os, sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .connection import FETCH_SIZE, get_connection, iter_rows, open_connection, register_initializer
+from .schema import column_map, ensure_schema
+from .namen import display_names, invalidate_names, sort_by_name
+from .tabellen import GruppenTabelle, TabellenCache, TabellenZeile, compute_tables
+from .bracket import KoBracket, KoKorrektur, plan_rows
+from .seeding import build_slots
+from .snapshot import TurnierSnapshot, load_snapshot
+from utils.spielplan_generator import round_robin_schedule
+from .rangliste import (
+    BRONZE_ROUND, check_consistency, derive_bronze, fetch_rangliste, materialize_platzierungen,
+    meisterschaften_of_turnier, refresh_for_turnier, refresh_meisterschaft, turnier_player_ids,
+    write_platzierungen,
+)
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 DB_PATH = os.path.join(DATA_DIR, "ibu.sqlite")
 
-BRONZE_ROUND = 99  # internes Kennzeichen für „Kleines Finale“
-
-
 # ------------------------------------------------------------
 # DB / Helpers
 # ------------------------------------------------------------
 def _connect() -> sqlite3.Connection:
-    con = sqlite3.connect(DB_PATH)
-    con.row_factory = sqlite3.Row
-    return con
+    """Langlebige Verbindung des aktuellen Threads (siehe database/connection.py)."""
+    return get_connection(DB_PATH)
 
 
 def _to_int_bool(v: Any) -> int:
@@ -37,91 +47,7 @@ def _to_int_bool(v: Any) -> int:
 
 
 def _init_db():
-    with _connect() as con:
-        c = con.cursor()
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS turniere(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            datum TEXT,
-            modus TEXT,
-            meisterschaft INTEGER DEFAULT 0
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS teilnehmer(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            spitzname TEXT
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS turnier_teilnehmer(
-            turnier_id INTEGER NOT NULL,
-            teilnehmer_id INTEGER NOT NULL,
-            UNIQUE(turnier_id, teilnehmer_id)
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS gruppen(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            turnier_id INTEGER NOT NULL,
-            name TEXT NOT NULL
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS gruppen_teilnehmer(
-            gruppe_id INTEGER NOT NULL,
-            teilnehmer_id INTEGER NOT NULL,
-            UNIQUE(gruppe_id, teilnehmer_id)
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS spiele(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            turnier_id INTEGER NOT NULL,
-            gruppe_id INTEGER NOT NULL,
-            spieltag INTEGER,            -- frühere Version: 'runde'
-            match_no INTEGER,
-            p1_id INTEGER,
-            p2_id INTEGER,
-            s1 INTEGER,
-            s2 INTEGER
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS ko_spiele(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            turnier_id INTEGER NOT NULL,
-            runde INTEGER,
-            match_no INTEGER,
-            p1_id INTEGER,
-            p2_id INTEGER,
-            s1 INTEGER,
-            s2 INTEGER
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS turnier_platzierungen(
-            turnier_id INTEGER NOT NULL,
-            teilnehmer_id INTEGER NOT NULL,
-            platz INTEGER NOT NULL,
-            UNIQUE(turnier_id, teilnehmer_id)
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS meisterschaften(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            saison TEXT,
-            punkteschema TEXT
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS meisterschaft_turniere(
-            meisterschaft_id INTEGER NOT NULL,
-            turnier_id INTEGER NOT NULL,
-            UNIQUE(meisterschaft_id, turnier_id)
-        )""")
-        c.execute("""
-        CREATE TABLE IF NOT EXISTS meisterschaft_punkteschema(
-            meisterschaft_id INTEGER NOT NULL,
-            platz INTEGER NOT NULL,
-            punkte INTEGER NOT NULL,
-            UNIQUE(meisterschaft_id, platz)
-        )""")
-        con.commit()
+    ensure_schema(DB_PATH)
 
 
 def init_db():
@@ -131,35 +57,10 @@ def init_db():
 _init_db()
 
 
-def _display_name_by_id(con: sqlite3.Connection, pid: Optional[int]) -> str:
+def _display_name_by_id(pid: Optional[int]) -> str:
     if pid is None:
         return ""
-    r = con.execute(
-        "SELECT COALESCE(NULLIF(TRIM(spitzname),''), name) AS n FROM teilnehmer WHERE id=?",
-        (pid,),
-    ).fetchone()
-    return "" if r is None else (r["n"] or "")
-
-
-def _log2_int(x: int) -> int:
-    return int(round(math.log2(x))) if x > 0 else 0
-
-
-def _col_exists(con: sqlite3.Connection, table: str, col: str) -> bool:
-    try:
-        rows = con.execute(f"PRAGMA table_info({table})").fetchall()
-        return any(str(r["name"]).lower() == col.lower() for r in rows)
-    except Exception:
-        return False
-
-
-def _group_round_col(con: sqlite3.Connection) -> Optional[str]:
-    """Ermittelt, ob die Spalte für die Gruppen-Runden 'spieltag' (neu) oder 'runde' (alt) heißt."""
-    if _col_exists(con, "spiele", "spieltag"):
-        return "spieltag"
-    if _col_exists(con, "spiele", "runde"):
-        return "runde"
-    return None
+    return display_names(DB_PATH).get(int(pid), "")
 
 
 # ------------------------------------------------------------
@@ -193,11 +94,14 @@ def update_turnier(turnier_id: int, name: str, datum: str, modus: str, meistersc
             "UPDATE turniere SET name=?, datum=?, modus=?, meisterschaft=? WHERE id=?",
             (name, datum, modus, _to_int_bool(meisterschaft), int(turnier_id)),
         )
+        refresh_for_turnier(con, int(turnier_id), turnier_player_ids(con, int(turnier_id)))  # Datum -> letztes_datum
         con.commit()
 
 
 def delete_turnier(turnier_id: int) -> None:
     with _connect() as con:
+        ms_ids = meisterschaften_of_turnier(con, turnier_id)
+        pids = turnier_player_ids(con, turnier_id)
         con.execute("DELETE FROM turnier_teilnehmer WHERE turnier_id=?", (turnier_id,))
         con.execute(
             "DELETE FROM gruppen_teilnehmer WHERE gruppe_id IN (SELECT id FROM gruppen WHERE turnier_id=?)",
@@ -209,7 +113,10 @@ def delete_turnier(turnier_id: int) -> None:
         con.execute("DELETE FROM turnier_platzierungen WHERE turnier_id=?", (turnier_id,))
         con.execute("DELETE FROM meisterschaft_turniere WHERE turnier_id=?", (turnier_id,))
         con.execute("DELETE FROM turniere WHERE id=?", (turnier_id,))
+        for ms_id in ms_ids:
+            refresh_meisterschaft(con, ms_id, pids)
         con.commit()
+    invalidate_group_tables(turnier_id)
 
 
 # ------------------------------------------------------------
@@ -219,6 +126,7 @@ def insert_teilnehmer(name: str, spitzname: str = "") -> int:
     with _connect() as con:
         cur = con.execute("INSERT INTO teilnehmer(name, spitzname) VALUES(?,?)", (name, spitzname))
         con.commit()
+        invalidate_names(DB_PATH)
         return int(cur.lastrowid)
 
 
@@ -232,6 +140,7 @@ def update_teilnehmer(teilnehmer_id: int, name: str, spitzname: str = "") -> Non
     with _connect() as con:
         con.execute("UPDATE teilnehmer SET name=?, spitzname=? WHERE id=?", (name, spitzname, int(teilnehmer_id)))
         con.commit()
+        invalidate_names(DB_PATH)
 
 
 def delete_teilnehmer(teilnehmer_id: int) -> None:
@@ -239,8 +148,10 @@ def delete_teilnehmer(teilnehmer_id: int) -> None:
         con.execute("DELETE FROM turnier_teilnehmer WHERE teilnehmer_id=?", (teilnehmer_id,))
         con.execute("DELETE FROM gruppen_teilnehmer WHERE teilnehmer_id=?", (teilnehmer_id,))
         con.execute("DELETE FROM turnier_platzierungen WHERE teilnehmer_id=?", (teilnehmer_id,))
+        con.execute("DELETE FROM meisterschaft_rangliste WHERE teilnehmer_id=?", (teilnehmer_id,))
         con.execute("DELETE FROM teilnehmer WHERE id=?", (teilnehmer_id,))
         con.commit()
+        invalidate_names(DB_PATH)
 
 
 def add_turnier_teilnehmer(turnier_id: int, teilnehmer_id: int) -> None:
@@ -249,36 +160,35 @@ def add_turnier_teilnehmer(turnier_id: int, teilnehmer_id: int) -> None:
             "INSERT OR IGNORE INTO turnier_teilnehmer(turnier_id,teilnehmer_id) VALUES(?,?)",
             (turnier_id, teilnehmer_id),
         )
+        refresh_for_turnier(con, turnier_id, [teilnehmer_id])
         con.commit()
 
 
 def remove_turnier_teilnehmer(turnier_id: int, teilnehmer_id: int) -> None:
     with _connect() as con:
         con.execute("DELETE FROM turnier_teilnehmer WHERE turnier_id=? AND teilnehmer_id=?", (turnier_id, teilnehmer_id))
+        refresh_for_turnier(con, turnier_id, [teilnehmer_id])
         con.commit()
 
 
 def set_turnier_teilnehmer(turnier_id: int, teilnehmer_ids: Sequence[int]) -> None:
     with _connect() as con:
+        before = turnier_player_ids(con, turnier_id)
         con.execute("DELETE FROM turnier_teilnehmer WHERE turnier_id=?", (turnier_id,))
         con.executemany(
             "INSERT INTO turnier_teilnehmer(turnier_id,teilnehmer_id) VALUES(?,?)",
             [(turnier_id, int(pid)) for pid in teilnehmer_ids],
         )
+        refresh_for_turnier(con, turnier_id, before ^ {int(pid) for pid in teilnehmer_ids})
         con.commit()
 
 
 def fetch_turnier_teilnehmer(turnier_id: int) -> List[Tuple[int, str]]:
     with _connect() as con:
-        rows = con.execute(
-            """
-            SELECT te.id, COALESCE(NULLIF(TRIM(te.spitzname),''), te.name) AS n
-            FROM turnier_teilnehmer tt JOIN teilnehmer te ON te.id=tt.teilnehmer_id
-            WHERE tt.turnier_id=? ORDER BY n ASC
-            """,
-            (turnier_id,),
-        ).fetchall()
-        return [(int(r[0]), str(r[1])) for r in rows]
+        names = display_names(DB_PATH)
+        rows = con.execute("SELECT teilnehmer_id FROM turnier_teilnehmer WHERE turnier_id=?", (turnier_id,)).fetchall()
+        pids = sort_by_name([int(r[0]) for r in rows if int(r[0]) in names], DB_PATH)
+        return [(pid, names[pid]) for pid in pids]
 
 
 # ------------------------------------------------------------
@@ -313,6 +223,7 @@ def clear_group_matches(turnier_id: int) -> None:
     with _connect() as con:
         con.execute("DELETE FROM spiele WHERE turnier_id=?", (turnier_id,))
         con.commit()
+    invalidate_group_tables(turnier_id)
 
 
 def clear_grouping(turnier_id: int) -> None:
@@ -324,6 +235,7 @@ def clear_grouping(turnier_id: int) -> None:
         )
         con.execute("DELETE FROM gruppen WHERE turnier_id=?", (turnier_id,))
         con.commit()
+    invalidate_group_tables(turnier_id)
 
 
 def save_grouping(turnier_id: int, groups: Sequence[Tuple[str, Sequence[int]]]) -> None:
@@ -345,6 +257,7 @@ def save_grouping(turnier_id: int, groups: Sequence[Tuple[str, Sequence[int]]])
                     [(gid, int(pid)) for pid in ids],
                 )
         con.commit()
+    invalidate_group_tables(turnier_id)
 
 
 def fetch_groups(turnier_id: int) -> List[Tuple[int, str]]:
@@ -363,7 +276,7 @@ def fetch_grouping(turnier_id: int) -> Dict[str, List[Tuple[int, str, str]]]:
             LEFT JOIN gruppen_teilnehmer gt ON gt.gruppe_id=g.id
             LEFT JOIN teilnehmer te ON te.id=gt.teilnehmer_id
             WHERE g.turnier_id=?
-            ORDER BY g.name ASC, COALESCE(NULLIF(TRIM(te.spitzname),''), te.name) ASC
+            ORDER BY g.name ASC
             """,
             (turnier_id,),
         ).fetchall()
@@ -372,71 +285,53 @@ def fetch_grouping(turnier_id: int) -> Dict[str, List[Tuple[int, str, str]]]:
             out.setdefault(g, [])
             if r["id"] is not None:
                 out[g].append((int(r["id"]), str(r["name"]), str(r["nick"])))
+        names = display_names(DB_PATH)
+        for members in out.values():
+            members.sort(key=lambda m: names.get(m[0], ""))
         return out
 
 
-def _group_member_ids(con: sqlite3.Connection, gruppe_id: int) -> List[int]:
-    rows = con.execute(
-        "SELECT teilnehmer_id FROM gruppen_teilnehmer WHERE gruppe_id=? ORDER BY teilnehmer_id", (gruppe_id,)
-    ).fetchall()
-    return [int(r[0]) for r in rows]
-
-
-def _round_robin_rounds(ids: List[int]) -> List[List[Tuple[int, int]]]:
-    ids = ids[:]
-    if len(ids) % 2 == 1:
-        ids.append(None)
-    n = len(ids)
-    half = n // 2
-    rounds = []
-    for _ in range(n - 1):
-        left = ids[:half]
-        right = list(reversed(ids[half:]))
-        pairs = []
-        for a, b in zip(left, right):
-            if a is None or b is None:
-                continue
-            pairs.append((a, b))
-        rounds.append(pairs)
-        ids = [ids[0]] + [ids[-1]] + ids[1:-1]
-    return rounds
-
-
-def generate_group_round_robin(turnier_id: int) -> None:
+def generate_group_round_robin(turnier_id: int, legs: int = 1) -> None:
+    """Jeder-gegen-jeden für alle Gruppen (legs=2: mit Rückrunde), ein executemany pro Turnier."""
     with _connect() as con:
         con.execute("DELETE FROM spiele WHERE turnier_id=?", (turnier_id,))
-        rcol = _group_round_col(con) or "spieltag"
-        groups = con.execute("SELECT id FROM gruppen WHERE turnier_id=? ORDER BY name ASC", (turnier_id,)).fetchall()
-        for g in groups:
-            gid = int(g[0])
-            ids = _group_member_ids(con, gid)
-            rr = _round_robin_rounds(ids)
-            match_no = 1
-            for r_idx, pairs in enumerate(rr, start=1):
-                for p1, p2 in pairs:
-                    con.execute(
-                        f"INSERT INTO spiele(turnier_id,gruppe_id,{rcol},match_no,p1_id,p2_id,s1,s2) "
-                        "VALUES(?,?,?,?,?,?,NULL,NULL)",
-                        (turnier_id, gid, r_idx, match_no, p1, p2),
-                    )
-                    match_no += 1
+        rcol = column_map(DB_PATH).group_round or "spieltag"
+        rows = con.execute(
+            """
+            SELECT g.id AS gid, gt.teilnehmer_id AS pid
+            FROM gruppen g LEFT JOIN gruppen_teilnehmer gt ON gt.gruppe_id=g.id
+            WHERE g.turnier_id=?
+            ORDER BY g.name ASC, g.id ASC, gt.teilnehmer_id ASC
+            """,
+            (turnier_id,),
+        ).fetchall()
+        members: Dict[int, List[int]] = {}
+        for r in rows:
+            ids = members.setdefault(int(r["gid"]), [])
+            if r["pid"] is not None:
+                ids.append(int(r["pid"]))
+        con.executemany(
+            f"INSERT INTO spiele(turnier_id,gruppe_id,{rcol},match_no,p1_id,p2_id,s1,s2) VALUES(?,?,?,?,?,?,NULL,NULL)",
+            [
+                (turnier_id, gid, runde, match_no, p1, p2)
+                for gid, ids in members.items()
+                for runde, match_no, p1, p2 in round_robin_schedule(ids, legs)
+            ],
+        )
         con.commit()
+    invalidate_group_tables(turnier_id)
 
 
 def fetch_group_matches(
     turnier_id: int, gruppe_id: int
 ) -> List[Tuple[int, int, int, str, str, Optional[int], Optional[int]]]:
     with _connect() as con:
-        rcol = _group_round_col(con)
+        rcol = column_map(DB_PATH).group_round
         if rcol:
             sql = f"""
                 SELECT sp.id, COALESCE(sp.{rcol},1) AS runde, COALESCE(sp.match_no,1) AS match_no,
-                       COALESCE(NULLIF(TRIM(t1.spitzname),''), t1.name) AS n1,
-                       COALESCE(NULLIF(TRIM(t2.spitzname),''), t2.name) AS n2,
-                       sp.s1, sp.s2
+                       sp.p1_id, sp.p2_id, sp.s1, sp.s2
                 FROM spiele sp
-                LEFT JOIN teilnehmer t1 ON t1.id=sp.p1_id
-                LEFT JOIN teilnehmer t2 ON t2.id=sp.p2_id
                 WHERE sp.turnier_id=? AND sp.gruppe_id=?
                 ORDER BY runde ASC, match_no ASC
             """
@@ -444,82 +339,117 @@ def fetch_group_matches(
             # Fallback (sollte praktisch nie eintreten)
             sql = """
                 SELECT sp.id, 1 AS runde, COALESCE(sp.match_no,1) AS match_no,
-                       COALESCE(NULLIF(TRIM(t1.spitzname),''), t1.name) AS n1,
-                       COALESCE(NULLIF(TRIM(t2.spitzname),''), t2.name) AS n2,
-                       sp.s1, sp.s2
+                       sp.p1_id, sp.p2_id, sp.s1, sp.s2
                 FROM spiele sp
-                LEFT JOIN teilnehmer t1 ON t1.id=sp.p1_id
-                LEFT JOIN teilnehmer t2 ON t2.id=sp.p2_id
                 WHERE sp.turnier_id=? AND sp.gruppe_id=?
                 ORDER BY match_no ASC
             """
         rows = con.execute(sql, (turnier_id, gruppe_id)).fetchall()
-        return [(int(r[0]), int(r[1]), int(r[2]), str(r[3] or ""), str(r[4] or ""), r[5], r[6]) for r in rows]
+        names = display_names(DB_PATH)
+        return [(int(r[0]), int(r[1]), int(r[2]), names.get(r[3], ""), names.get(r[4], ""), r[5], r[6]) for r in rows]
 
 
 def save_match_result(match_id: int, s1: Optional[int], s2: Optional[int]) -> None:
-    with _connect() as con:
-        con.execute("UPDATE spiele SET s1=?, s2=? WHERE id=?", (s1, s2, match_id))
+    save_results_batch([(match_id, s1, s2)])
+
+
+# ------------------------------------------------------------
+# Ergebnisse gesammelt speichern (Gruppe & KO)
+# ------------------------------------------------------------
+ResultRow = Tuple[int, Optional[int], Optional[int]]  # (match_id, s1, s2)
+
+
+def _validate_results(rows: Sequence[ResultRow]) -> List[ResultRow]:
+    out: List[ResultRow] = []
+    for mid, s1, s2 in rows:
+        s1 = None if s1 is None else int(s1)
+        s2 = None if s2 is None else int(s2)
+        if (s1 is not None and s1 < 0) or (s2 is not None and s2 < 0):
+            raise ValueError(f"Match {mid}: Negative Ergebnisse sind nicht erlaubt.")
+        if s1 is not None and s2 is not None and s1 == s2:
+            raise ValueError(f"Match {mid}: Unentschieden ist nicht erlaubt.")
+        out.append((int(mid), s1, s2))
+    return out
+
+
+def _rows_by_id(con: sqlite3.Connection, table: str, cols: str, ids: Sequence[int]) -> Dict[int, sqlite3.Row]:
+    out: Dict[int, sqlite3.Row] = {}
+    for i in range(0, len(ids), 500):
+        chunk = list(ids[i:i + 500])
+        for r in con.execute(
+            f"SELECT id, {cols} FROM {table} WHERE id IN ({','.join('?' * len(chunk))})", chunk
+        ).fetchall():
+            out[int(r["id"])] = r
+    return out
+
+
+def save_results_batch(rows: Sequence[ResultRow], ko: bool = False) -> Set[int]:
+    """Speichert mehrere Ergebnisse in EINER Transaktion (ko=True: 'ko_spiele', sonst 'spiele').
+
+    Alle Zeilen werden vorab geprüft (ValueError, bevor etwas geschrieben wird); unveränderte
+    Zeilen werden übersprungen (KO: siehe save_ko_results). Liefert die IDs aller geänderten
+    Spiele (inkl. der durch Weitertragen/Bronze geänderten).
+    """
+    rows = _validate_results(rows)
+    if not rows:
+        return set()
+    if ko:
+        return save_ko_results(rows).geaendert
+
+    with _connect() as con:
+        old = _rows_by_id(con, "spiele", "turnier_id, gruppe_id, p1_id, p2_id, s1, s2", [r[0] for r in rows])
+        todo = [(mid, s1, s2) for mid, s1, s2 in rows if mid in old and (old[mid]["s1"], old[mid]["s2"]) != (s1, s2)]
+        con.executemany("UPDATE spiele SET s1=?, s2=? WHERE id=?", [(s1, s2, mid) for mid, s1, s2 in todo])
         con.commit()
 
+    db = os.path.abspath(DB_PATH)
+    patch = column_map(DB_PATH).group_s1 == "s1"  # Tabellen lesen sets1/sets2 -> Cache nicht fortschreibbar
+    for mid, s1, s2 in todo:
+        m = old[mid]
+        if m["gruppe_id"] is None:
+            continue
+        if not patch:
+            invalidate_group_tables(int(m["turnier_id"]))
+            continue
+        new = None
+        if None not in (s1, s2, m["p1_id"], m["p2_id"]):
+            new = (int(m["p1_id"]), int(m["p2_id"]), s1, s2)
+        _tabellen_cache.apply_result(db, int(m["turnier_id"]), int(m["gruppe_id"]), mid, new)
+    return {mid for mid, _s1, _s2 in todo}
 
-def compute_group_table(turnier_id: int, gruppe_id: int) -> List[Dict[str, Any]]:
+
+# Gruppentabellen-Cache: wird von save_match_result fortgeschrieben, alle anderen Schreibzugriffe
+# auf Gruppen/Spiele eines Turniers verwerfen ihn (invalidate_group_tables).
+_tabellen_cache = TabellenCache(maxsize=512)
+register_initializer(lambda path, _con: _tabellen_cache.invalidate(path))
+
+
+def invalidate_group_tables(turnier_id: Optional[int] = None) -> None:
+    """Verwirft gecachte Gruppentabellen (eines Turniers bzw. alle)."""
+    _tabellen_cache.invalidate(os.path.abspath(DB_PATH), turnier_id)
+
+
+def compute_group_tables(turnier_id: int, mode: Optional[str] = None) -> Dict[int, GruppenTabelle]:
+    """Tabellen aller Gruppen (ein Durchlauf über 'spiele', danach aus dem Cache); mode=None -> turniere.group_rank_mode."""
     with _connect() as con:
-        mem = con.execute(
-            """
-            SELECT te.id, COALESCE(NULLIF(TRIM(te.spitzname),''), te.name) AS n
-            FROM gruppen_teilnehmer gt JOIN teilnehmer te ON te.id=gt.teilnehmer_id
-            WHERE gt.gruppe_id=?
-            """,
-            (gruppe_id,),
-        ).fetchall()
-        ids = [int(r["id"]) for r in mem]
-        name_of = {int(r["id"]): str(r["n"]) for r in mem}
-        tab = {
-            pid: {
-                "teilnehmer_id": pid,
-                "spieler": name_of.get(pid, f"#{pid}"),
-                "spiele": 0,
-                "siege": 0,
-                "niederlagen": 0,
-                "lf": 0,
-                "la": 0,
-                "diff": 0,
-                "pkt": 0,
-            }
-            for pid in ids
-        }
-        matches = con.execute(
-            "SELECT p1_id,p2_id,s1,s2 FROM spiele WHERE turnier_id=? AND gruppe_id=?",
-            (turnier_id, gruppe_id),
-        ).fetchall()
-        for m in matches:
-            p1 = m["p1_id"]; p2 = m["p2_id"]; s1 = m["s1"]; s2 = m["s2"]
-            if p1 is None or p2 is None or s1 is None or s2 is None or s1 == s2:
-                continue
-            p1 = int(p1); p2 = int(p2); s1 = int(s1); s2 = int(s2)
-            if p1 in tab and p2 in tab:
-                tab[p1]["spiele"] += 1; tab[p2]["spiele"] += 1
-                tab[p1]["lf"] += s1; tab[p1]["la"] += s2
-                tab[p2]["lf"] += s2; tab[p2]["la"] += s1
-                if s1 > s2:
-                    tab[p1]["siege"] += 1; tab[p2]["niederlagen"] += 1; tab[p1]["pkt"] += 2
-                else:
-                    tab[p2]["siege"] += 1; tab[p1]["niederlagen"] += 1; tab[p2]["pkt"] += 2
-        for pid in tab:
-            tab[pid]["diff"] = int(tab[pid]["lf"]) - int(tab[pid]["la"])
-        rows = list(tab.values())
-        rows.sort(key=lambda d: (-int(d["pkt"]), -int(d["diff"]), -int(d["lf"]), d["spieler"].lower()))
-        return rows
+        cmap = column_map(DB_PATH)
+        return _tabellen_cache.tables(
+            con, os.path.abspath(DB_PATH), turnier_id, display_names(DB_PATH), cmap.group_s1, cmap.group_s2, mode
+        )
+
+
+def compute_group_table(turnier_id: int, gruppe_id: int) -> List[Dict[str, Any]]:
+    tab = compute_group_tables(turnier_id).get(int(gruppe_id))
+    if tab is None:
+        return []
+    return [dict(z._asdict(), teilnehmer_id=z.pid) for z in tab.zeilen]
 
 
 def compute_group_ranking_ids(turnier_id: int, gruppe_id: int) -> List[int]:
-    return [int(r["teilnehmer_id"]) for r in compute_group_table(turnier_id, gruppe_id)]
+    tab = compute_group_tables(turnier_id).get(int(gruppe_id))
+    return [] if tab is None else [z.pid for z in tab.zeilen]
 
 
-# ------------------------------------------------------------
-# KO-Phase (+ Bronze)
-# ------------------------------------------------------------
 def has_ko_matches(turnier_id: int) -> bool:
     with _connect() as con:
         return con.execute("SELECT 1 FROM ko_spiele WHERE turnier_id=? LIMIT 1", (turnier_id,)).fetchone() is not None
@@ -539,6 +469,7 @@ def has_recorded_ko_results(turnier_id: int) -> bool:
 def clear_ko_matches(turnier_id: int) -> None:
     with _connect() as con:
         con.execute("DELETE FROM ko_spiele WHERE turnier_id=?", (turnier_id,))
+        refresh_for_turnier(con, turnier_id, materialize_platzierungen(con, turnier_id))
         con.commit()
 
 
@@ -560,154 +491,133 @@ def fetch_ko_matches(turnier_id: int, runde: int) -> List[Tuple[int, int, str, s
     with _connect() as con:
         rows = con.execute(
             """
-            SELECT k.id, k.match_no,
-                   COALESCE(NULLIF(TRIM(t1.spitzname),''), t1.name) AS n1,
-                   COALESCE(NULLIF(TRIM(t2.spitzname),''), t2.name) AS n2,
-                   k.s1, k.s2
+            SELECT k.id, k.match_no, k.p1_id, k.p2_id, k.s1, k.s2
             FROM ko_spiele k
-            LEFT JOIN teilnehmer t1 ON t1.id=k.p1_id
-            LEFT JOIN teilnehmer t2 ON t2.id=k.p2_id
             WHERE k.turnier_id=? AND k.runde=?
             ORDER BY k.match_no ASC
             """,
             (turnier_id, runde),
         ).fetchall()
-        return [(int(r[0]), int(r[1]), str(r[2] or ""), str(r[3] or ""), r[4], r[5]) for r in rows]
+        names = display_names(DB_PATH)
+        return [(int(r[0]), int(r[1]), names.get(r[2], ""), names.get(r[3], ""), r[4], r[5]) for r in rows]
 
 
-def _next_round_slot_for(match_no: int) -> Tuple[int, int]:
-    target = (match_no + 1) // 2
-    slot = 1 if (match_no % 2 == 1) else 2
-    return target, slot
-
+def generate_ko_bracket_total(
+    turnier_id: int, total_qualifiers: int, seeding: str = "auto", same_group_from: Optional[int] = None
+) -> None:
+    """KO-Plan für beliebig viele Qualifikanten (>= 2), Setzverfahren siehe database/seeding.py.
+
+    "auto": gerade Gruppenzahl, gleich viele je Gruppe und 2er-Potenz -> klassisch A1–B{n}, A2–B{n-1}, …;
+    sonst Standard-Seeding über alle Gruppen, fehlende Plätze bis zur 2er-Potenz sind Freilose für
+    die Besten (direkt in Runde 2). same_group_from=N: Spieler derselben Gruppe treffen frühestens
+    in Runde N aufeinander (1 = egal); None: bis Runde 2 getrennt, soweit die Gruppen es zulassen.
+    """
+    if total_qualifiers < 2:
+        raise ValueError("Mindestens 2 Qualifikanten.")
+    con = _connect()
+    # Läuft schon eine Transaktion des Aufrufers, schreiben wir in ihr – Commit/Rollback bleibt bei ihm
+    own = not con.in_transaction
+    if own:
+        con.execute("BEGIN IMMEDIATE")  # Gruppen, Tabellen & neuer Plan aus EINEM Stand
+    try:
+        groups, ranking = _ko_snapshot(con, turnier_id)
+        rows = plan_rows(build_slots(groups, ranking, total_qualifiers, seeding, same_group_from))
+        con.execute("DELETE FROM ko_spiele WHERE turnier_id=?", (turnier_id,))
+        refresh_for_turnier(con, turnier_id, materialize_platzierungen(con, turnier_id))
+        con.executemany(
+            "INSERT INTO ko_spiele(turnier_id,runde,match_no,p1_id,p2_id,s1,s2) VALUES(?,?,?,?,?,NULL,NULL)",
+            [(turnier_id, r, no, p1, p2) for r, no, p1, p2 in rows],
+        )
+    except BaseException:
+        if own:
+            con.rollback()
+        raise
+    if own:
+        con.commit()
 
-def generate_ko_bracket_total(turnier_id: int, total_qualifiers: int) -> None:
-    if total_qualifiers <= 1 or (total_qualifiers & (total_qualifiers - 1)) != 0:
-        raise ValueError("Gesamt-Qualifikanten muss 2er-Potenz sein (2,4,8,16,...).")
 
-    groups = fetch_groups(turnier_id)
+def _ko_snapshot(
+    con: sqlite3.Connection, turnier_id: int
+) -> Tuple[List[Tuple[int, str]], Dict[int, List[TabellenZeile]]]:
+    """Gruppen (nach Name) und ihre Tabellen – ein Durchlauf über 'spiele' auf der übergebenen Verbindung."""
+    groups = [(int(r[0]), str(r[1])) for r in con.execute(
+        "SELECT id,name FROM gruppen WHERE turnier_id=? ORDER BY name ASC", (turnier_id,)
+    ).fetchall()]
     if not groups:
         raise ValueError("Keine Gruppen vorhanden.")
-    if len(groups) % 2 != 0:
-        raise ValueError("Anzahl Gruppen muss gerade sein.")
-    per_group = total_qualifiers // len(groups)
-    if per_group == 0:
-        raise ValueError("Qualifikantenzahl kleiner als Anzahl Gruppen.")
-    for gid, _ in groups:
-        if len(compute_group_ranking_ids(turnier_id, gid)) < per_group:
-            raise ValueError("Nicht jede Gruppe hat genug Qualifikanten.")
-
-    with _connect() as con:
-        con.execute("DELETE FROM ko_spiele WHERE turnier_id=?", (turnier_id,))
-        gnames = [g for (_gid, g) in groups]
-        gid_by_name = {g: gid for (gid, g) in groups}
-        pairs: List[Tuple[str, str]] = []
-        for i in range(0, len(gnames), 2):
-            if i + 1 < len(gnames):
-                pairs.append((gnames[i], gnames[i + 1]))
-
-        runde = 1
-        match_no = 1
-        for (ga, gb) in pairs:
-            gida = gid_by_name[ga]; gidb = gid_by_name[gb]
-            top_a = compute_group_ranking_ids(turnier_id, gida)[:per_group]
-            top_b = compute_group_ranking_ids(turnier_id, gidb)[:per_group]
-            for i in range(per_group):
-                p1 = top_a[i]
-                p2 = top_b[per_group - i - 1]
-                con.execute(
-                    "INSERT INTO ko_spiele(turnier_id,runde,match_no,p1_id,p2_id,s1,s2) VALUES(?,?,?,?,?,NULL,NULL)",
-                    (turnier_id, runde, match_no, p1, p2),
-                )
-                match_no += 1
-
-        rounds_total = _log2_int(total_qualifiers)
-        for r in range(2, rounds_total + 1):
-            mcount = max(1, total_qualifiers // (2 ** r))
-            for m in range(1, mcount + 1):
-                con.execute(
-                    "INSERT INTO ko_spiele(turnier_id,runde,match_no,p1_id,p2_id,s1,s2) VALUES(?, ?, ?, NULL, NULL, NULL, NULL)",
-                    (turnier_id, r, m),
-                )
-        con.commit()
+    cmap = column_map(DB_PATH)
+    tables = compute_tables(con, turnier_id, display_names(DB_PATH), cmap.group_s1, cmap.group_s2)
+    return groups, {gid: list(tables[gid].zeilen) if gid in tables else [] for gid, _ in groups}
 
 
 def save_ko_result_and_propagate(
     match_id: int, s1: Optional[int], s2: Optional[int], turnier_id: Optional[int] = None
 ) -> None:
-    with _connect() as con:
-        if turnier_id is None:
-            rtid = con.execute("SELECT turnier_id FROM ko_spiele WHERE id=?", (match_id,)).fetchone()
-            if not rtid:
-                return
-            turnier_id = int(rtid["turnier_id"])
-        row = con.execute("SELECT runde, match_no, p1_id, p2_id FROM ko_spiele WHERE id=?", (match_id,)).fetchone()
-        if not row:
-            return
-        runde = int(row["runde"]) if row["runde"] is not None else None
-        match_no = int(row["match_no"]) if row["match_no"] is not None else None
-        con.execute("UPDATE ko_spiele SET s1=?, s2=? WHERE id=?", (s1, s2, match_id))
-        con.commit()
-        if runde is None or match_no is None or s1 is None or s2 is None or s1 == s2:
-            return
-
-        # Finale nicht propagieren, Bronze ebenfalls nicht
-        r_max = con.execute(
-            "SELECT MAX(runde) AS r FROM ko_spiele WHERE turnier_id=? AND runde<>?", (turnier_id, BRONZE_ROUND)
-        ).fetchone()
-        if r_max and runde == int(r_max["r"]):
-            return
-
-        p1_id = int(row["p1_id"]) if row["p1_id"] is not None else None
-        p2_id = int(row["p2_id"]) if row["p2_id"] is not None else None
-        if p1_id is None or p2_id is None:
-            return
-        winner_id = p1_id if int(s1) > int(s2) else p2_id
-        target_m, slot = _next_round_slot_for(match_no)
-        con.execute(
-            f"UPDATE ko_spiele SET {'p1_id' if slot == 1 else 'p2_id'}=? WHERE turnier_id=? AND runde=? AND match_no=?",
-            (winner_id, turnier_id, runde + 1, target_m),
-        )
+    # turnier_id wird aus dem Spiel gelesen; Parameter bleibt für bestehende Aufrufer
+    save_results_batch([(match_id, s1, s2)], ko=True)
+
+
+def _apply_ko_results(con: sqlite3.Connection, rows: Sequence[ResultRow]) -> List[KoBracket]:
+    """Lädt je betroffenem Turnier den KO-Baum und trägt die Ergebnisse in Rundenfolge ein (nur im Speicher)."""
+    meta = _rows_by_id(con, "ko_spiele", "turnier_id", [r[0] for r in rows])
+    by_tid: Dict[int, List[ResultRow]] = {}
+    for r in rows:
+        if r[0] in meta:
+            by_tid.setdefault(int(meta[r[0]]["turnier_id"]), []).append(r)
+    out: List[KoBracket] = []
+    for tid, trows in by_tid.items():
+        bracket = KoBracket.load(con, tid)
+        trows = [r for r in trows if bracket.by_id(r[0]) is not None]
+        # Rundenfolge, damit Sieger früherer Runden schon eingetragen sind
+        trows.sort(key=lambda r: KoBracket.order_key(bracket.by_id(r[0])))
+        for mid, s1, s2 in trows:
+            bracket.set_result(mid, s1, s2)
+        bracket.derive_bronze()
+        out.append(bracket)
+    return out
+
+
+def preview_ko_results(rows: Sequence[ResultRow]) -> KoKorrektur:
+    """Wie save_ko_results, schreibt aber nichts – z. B. um vor dem Verwerfen späterer Ergebnisse zu fragen."""
+    rows = _validate_results(rows)
+    with _connect() as con:
+        brackets = _apply_ko_results(con, rows)
+    return KoKorrektur(set(), [z for b in brackets for z in b.zurueckgesetzt()])
+
+
+def save_ko_results(rows: Sequence[ResultRow]) -> KoKorrektur:
+    """Speichert KO-Ergebnisse in einer Transaktion.
+
+    Wird ein früheres Ergebnis korrigiert, werden nur die Spiele auf dem Weg des alten Siegers
+    (Folgerunden, ggf. Bronze) geleert; Platzierungen werden nur neu geschrieben, wenn Finale
+    oder Bronze betroffen sind. Liefert geänderte und verworfene Spiele.
+    """
+    rows = _validate_results(rows)
+    changed: Set[int] = set()
+    invalid: List[Tuple[int, int, int]] = []
+    with _connect() as con:
+        for bracket in _apply_ko_results(con, rows):
+            invalid.extend(bracket.zurueckgesetzt())
+            ids = bracket.flush(con)
+            changed |= ids
+            # Platzierungen & Rangliste nur nachziehen, wenn Finale/Bronze berührt –
+            # Lesepfade bleiben reine SELECTs
+            if ids & bracket.placement_ids():
+                tid = bracket.turnier_id
+                refresh_for_turnier(con, tid, write_platzierungen(con, tid, bracket.platzierungen()))
         con.commit()
+    return KoKorrektur(changed, invalid)
 
 
 def ensure_bronze_from_semis(turnier_id: int) -> bool:
-    """Lege/aktualisiere Bronze (runde=99), sobald beide Halbfinals entschieden sind."""
+    """Lege/aktualisiere Bronze (runde=99), sobald beide Halbfinals entschieden sind.
+
+    Passiert bereits in save_ko_result_and_propagate; schreibt/committet nur bei Änderung.
+    """
     with _connect() as con:
-        r = con.execute(
-            "SELECT MAX(runde) AS r FROM ko_spiele WHERE turnier_id=? AND runde<>?", (turnier_id, BRONZE_ROUND)
-        ).fetchone()
-        if not r or r["r"] is None:
-            return False
-        final_r = int(r["r"])
-        if final_r < 2:
+        if not derive_bronze(con, turnier_id):
             return False
-        semi_r = final_r - 1
-        rows = con.execute(
-            "SELECT p1_id,p2_id,s1,s2 FROM ko_spiele WHERE turnier_id=? AND runde=? ORDER BY match_no",
-            (turnier_id, semi_r),
-        ).fetchall()
-        if len(rows) < 2:
-            return False
-        losers: List[int] = []
-        for m in rows[:2]:
-            if m["s1"] is None or m["s2"] is None or m["s1"] == m["s2"]:
-                return False
-            p1 = int(m["p1_id"]); p2 = int(m["p2_id"])
-            s1 = int(m["s1"]); s2 = int(m["s2"])
-            loser = p2 if s1 > s2 else p1
-            losers.append(loser)
-
-        bron = con.execute(
-            "SELECT id FROM ko_spiele WHERE turnier_id=? AND runde=? LIMIT 1", (turnier_id, BRONZE_ROUND)
-        ).fetchone()
-        if bron is None:
-            con.execute(
-                "INSERT INTO ko_spiele(turnier_id,runde,match_no,p1_id,p2_id,s1,s2) VALUES(?,?,?,?,?,NULL,NULL)",
-                (turnier_id, BRONZE_ROUND, 1, losers[0], losers[1]),
-            )
-        else:
-            con.execute("UPDATE ko_spiele SET p1_id=?, p2_id=? WHERE id=?", (losers[0], losers[1], int(bron["id"])))
+        refresh_for_turnier(con, turnier_id, materialize_platzierungen(con, turnier_id))
         con.commit()
         return True
 
@@ -729,7 +639,24 @@ def fetch_ko_champion(turnier_id: int) -> Optional[Tuple[int, str]]:
         p1 = int(m["p1_id"]); p2 = int(m["p2_id"])
         s1 = int(m["s1"]);  s2 = int(m["s2"])
         winner = p1 if s1 > s2 else p2
-        return winner, _display_name_by_id(con, winner)
+        return winner, _display_name_by_id(winner)
+
+
+def fetch_turnier_snapshot(turnier_id: int) -> TurnierSnapshot:
+    """Kompletter Turnierstand (Teilnehmer, Gruppen, Spiele, Tabellen, KO) aus einer Lesetransaktion."""
+    con = _connect()
+    own = not con.in_transaction
+    if own:
+        con.execute("BEGIN")  # WAL: alle folgenden SELECTs sehen denselben Stand
+    try:
+        cmap = column_map(DB_PATH)
+        names = display_names(DB_PATH)
+        # Tabellen aus dem Cache (wird bei jedem Speichern nachgeführt), sonst auf derselben Verbindung geladen
+        tabellen = _tabellen_cache.tables(con, os.path.abspath(DB_PATH), turnier_id, names, cmap.group_s1, cmap.group_s2)
+        return load_snapshot(con, turnier_id, names, cmap.group_round, cmap.group_s1, cmap.group_s2, tabellen)
+    finally:
+        if own:
+            con.commit()
 
 
 # ------------------------------------------------------------
@@ -758,17 +685,28 @@ def delete_meisterschaft(ms_id: int) -> None:
     with _connect() as con:
         con.execute("DELETE FROM meisterschaft_punkteschema WHERE meisterschaft_id=?", (ms_id,))
         con.execute("DELETE FROM meisterschaft_turniere WHERE meisterschaft_id=?", (ms_id,))
+        con.execute("DELETE FROM meisterschaft_rangliste WHERE meisterschaft_id=?", (ms_id,))
         con.execute("DELETE FROM meisterschaften WHERE id=?", (ms_id,))
         con.commit()
 
 
 def set_meisterschaft_turniere(ms_id: int, turnier_ids: Sequence[int]) -> None:
     with _connect() as con:
+        before = {
+            int(r[0]) for r in con.execute(
+                "SELECT turnier_id FROM meisterschaft_turniere WHERE meisterschaft_id=?", (ms_id,)
+            ).fetchall()
+        }
         con.execute("DELETE FROM meisterschaft_turniere WHERE meisterschaft_id=?", (ms_id,))
         con.executemany(
             "INSERT INTO meisterschaft_turniere(meisterschaft_id,turnier_id) VALUES(?,?)",
             [(ms_id, int(tid)) for tid in turnier_ids],
         )
+        # Delta: nur Teilnehmer hinzugekommener/entfernter Turniere neu aggregieren
+        pids = set()
+        for tid in before ^ {int(t) for t in turnier_ids}:
+            pids |= turnier_player_ids(con, tid)
+        refresh_meisterschaft(con, ms_id, pids)
         con.commit()
 
 
@@ -780,6 +718,55 @@ def fetch_meisterschaft_turnier_ids(ms_id: int) -> List[int]:
         return [int(r[0]) for r in rows]
 
 
+# Turnier, Datum, KO?, Gruppe (None bei KO), Runde, Match, Spiele in der KO-Runde (0 bei Gruppe), Spieler 1/2, S1, S2
+SaisonSpiel = Tuple[str, str, bool, Optional[str], int, int, int, str, str, Optional[int], Optional[int]]
+
+
+def iter_meisterschaft_spiele(ms_id: int, batch: int = FETCH_SIZE) -> Iterator[SaisonSpiel]:
+    """Alle Gruppen- und KO-Spiele aller Turniere einer Meisterschaft, gestreamt (fetchmany).
+
+    Eine Lesetransaktion über den ganzen Lauf (konsistenter Stand) auf einer eigenen, kurzlebigen
+    Verbindung – Schreibzugriffe desselben Threads zwischen zwei Zeilen beenden sie so nicht.
+    Sortiert wird je Turnier, nicht über die Saison – im Speicher liegen höchstens batch Zeilen,
+    die Namenstabelle und SQLites Sortierpuffer für ein Turnier. Reihenfolge: Turnierdatum, je
+    Turnier Gruppen (nach Name, Runde, Match) vor KO (nach Runde, Bronze zuletzt).
+    """
+    cmap = column_map(DB_PATH)
+    names = display_names(DB_PATH)
+    con = open_connection(DB_PATH)
+    try:
+        con.execute("BEGIN")
+        runde = f"COALESCE(s.{cmap.group_round},1)" if cmap.group_round else "1"
+        group_sql = f"""
+            SELECT g.name, {runde} AS runde, COALESCE(s.match_no,1) AS match_no,
+                   s.p1_id, s.p2_id, s.{cmap.group_s1}, s.{cmap.group_s2}
+            FROM spiele s LEFT JOIN gruppen g ON g.id = s.gruppe_id
+            WHERE s.turnier_id = ?
+            ORDER BY g.name, runde, match_no
+        """
+        ko_sql = """
+            SELECT runde, COALESCE(match_no,1) AS match_no, COUNT(*) OVER (PARTITION BY runde),
+                   p1_id, p2_id, s1, s2
+            FROM ko_spiele
+            WHERE turnier_id = ? AND runde IS NOT NULL
+            ORDER BY runde, match_no
+        """
+        turniere = con.execute(
+            "SELECT t.id, t.name, COALESCE(t.datum,'') FROM meisterschaft_turniere mt JOIN turniere t ON t.id = mt.turnier_id "
+            "WHERE mt.meisterschaft_id=? ORDER BY 3, 1", (ms_id,)
+        ).fetchall()
+        for tid, tname, datum in turniere:
+            tname, datum = str(tname or ""), str(datum)
+            for r in iter_rows(con.execute(group_sql, (tid,)), batch):
+                yield (tname, datum, False, r[0], int(r[1]), int(r[2]), 0,
+                       names.get(r[3], ""), names.get(r[4], ""), r[5], r[6])
+            for r in iter_rows(con.execute(ko_sql, (tid,)), batch):
+                yield (tname, datum, True, None, int(r[0]), int(r[1]), int(r[2]),
+                       names.get(r[3], ""), names.get(r[4], ""), r[5], r[6])
+    finally:
+        con.close()  # beendet die Lesetransaktion (auch bei abgebrochenem Lauf)
+
+
 def save_punkteschema(ms_id: int, entries: Sequence[Tuple[int, int]]) -> None:
     with _connect() as con:
         con.execute("DELETE FROM meisterschaft_punkteschema WHERE meisterschaft_id=?", (ms_id,))
@@ -787,6 +774,7 @@ def save_punkteschema(ms_id: int, entries: Sequence[Tuple[int, int]]) -> None:
             "INSERT INTO meisterschaft_punkteschema(meisterschaft_id,platz,punkte) VALUES(?,?,?)",
             [(ms_id, int(platz), int(punkte)) for (platz, punkte) in entries],
         )
+        refresh_meisterschaft(con, ms_id)  # Punkte aller Spieler betroffen
         con.commit()
 
 
@@ -802,64 +790,9 @@ def standard_punkteschema_basic(ms_id: int) -> None:
     save_punkteschema(ms_id, [(1, 30), (2, 24), (3, 18), (4, 15), (5, 5)])
 
 
-def _ms_fetch_turniere(ms_id: int) -> List[sqlite3.Row]:
-    with _connect() as con:
-        return con.execute(
-            """
-            SELECT t.id, t.name, COALESCE(t.datum,'') AS datum
-            FROM meisterschaft_turniere mt JOIN turniere t ON t.id=mt.turnier_id
-            WHERE mt.meisterschaft_id=? ORDER BY COALESCE(t.datum,''), t.id
-            """,
-            (ms_id,),
-        ).fetchall()
-
-
-def _ms_fetch_schema_map(ms_id: int) -> Dict[int, int]:
-    mapping: Dict[int, int] = {}
-    for platz, punkte in fetch_punkteschema(ms_id):
-        mapping[int(platz)] = int(punkte)
-    for p in range(5, 256):
-        mapping.setdefault(p, 5)  # Default 5 Punkte ab Platz 5
-    return mapping
-
-
 def _ensure_turnier_platzierungen_from_ko(turnier_id: int) -> None:
     with _connect() as con:
-        r = con.execute(
-            "SELECT MAX(runde) AS r_final FROM ko_spiele WHERE turnier_id=? AND runde<>?", (turnier_id, BRONZE_ROUND)
-        ).fetchone()
-        if not r or r["r_final"] is None:
-            return
-        final_r = int(r["r_final"])
-        fm = con.execute(
-            "SELECT p1_id,p2_id,s1,s2 FROM ko_spiele WHERE turnier_id=? AND runde=? LIMIT 1", (turnier_id, final_r)
-        ).fetchone()
-        if not fm or fm["s1"] is None or fm["s2"] is None or fm["s1"] == fm["s2"]:
-            return
-        p1 = int(fm["p1_id"]); p2 = int(fm["p2_id"]); s1 = int(fm["s1"]); s2 = int(fm["s2"])
-        champion = p1 if s1 > s2 else p2
-        runnerup = p2 if s1 > s2 else p1
-
-        bron = con.execute(
-            "SELECT p1_id,p2_id,s1,s2 FROM ko_spiele WHERE turnier_id=? AND runde=? LIMIT 1", (turnier_id, BRONZE_ROUND)
-        ).fetchone()
-        bronze_winner = None; bronze_loser = None
-        if bron and bron["s1"] is not None and bron["s2"] is not None and bron["s1"] != bron["s2"]:
-            bp1 = int(bron["p1_id"]); bp2 = int(bron["p2_id"])
-            bs1 = int(bron["s1"]);   bs2 = int(bron["s2"])
-            bronze_winner = bp1 if bs1 > bs2 else bp2
-            bronze_loser  = bp2 if bs1 > bs2 else bp1
-
-        con.execute("DELETE FROM turnier_platzierungen WHERE turnier_id=?", (turnier_id,))
-        con.executemany(
-            "INSERT INTO turnier_platzierungen(turnier_id,teilnehmer_id,platz) VALUES(?,?,?)",
-            [(turnier_id, champion, 1), (turnier_id, runnerup, 2)],
-        )
-        if bronze_winner is not None and bronze_loser is not None:
-            con.executemany(
-                "INSERT INTO turnier_platzierungen(turnier_id,teilnehmer_id,platz) VALUES(?,?,?)",
-                [(turnier_id, bronze_winner, 3), (turnier_id, bronze_loser, 4)],
-            )
+        refresh_for_turnier(con, turnier_id, materialize_platzierungen(con, turnier_id))
         con.commit()
 
 
@@ -868,63 +801,19 @@ def rebuild_rangliste_for_turnier(turnier_id: int) -> None:
 
 
 def compute_meisterschaft_rangliste(ms_id: int) -> List[Dict[str, Any]]:
-    trows = _ms_fetch_turniere(ms_id)
-    if not trows:
-        return []
-    schema = _ms_fetch_schema_map(ms_id)
-    acc: Dict[int, Dict[str, Any]] = {}
-
+    """Rein lesend: liest die beim Speichern gepflegte Tabelle 'meisterschaft_rangliste'."""
     with _connect() as con:
-        for t in trows:
-            tid = int(t["id"])
-            tdatum = (t["datum"] or "").strip()
+        return fetch_rangliste(con, ms_id, display_names(DB_PATH))
 
-            _ensure_turnier_platzierungen_from_ko(tid)
 
-            pl_rows = con.execute("SELECT teilnehmer_id, platz FROM turnier_platzierungen WHERE turnier_id=?", (tid,)).fetchall()
-            platz_map = {int(r["teilnehmer_id"]): int(r["platz"]) for r in pl_rows}
+def rebuild_meisterschaft_rangliste(ms_id: int) -> None:
+    """Baut die materialisierte Rangliste einer Meisterschaft komplett neu auf."""
+    with _connect() as con:
+        refresh_meisterschaft(con, ms_id)
+        con.commit()
 
-            teil_rows = con.execute(
-                """
-                SELECT tt.teilnehmer_id, COALESCE(NULLIF(TRIM(te.spitzname),''), te.name) AS n
-                FROM turnier_teilnehmer tt JOIN teilnehmer te ON te.id=tt.teilnehmer_id
-                WHERE tt.turnier_id=?
-                """,
-                (tid,),
-            ).fetchall()
 
-            for r in teil_rows:
-                pid = int(r["teilnehmer_id"])
-                name = (r["n"] or "").strip()
-                if pid not in acc:
-                    acc[pid] = {"teilnehmer_id": pid, "name": name, "punkte": 0, "turniere": 0,
-                                "beste_platzierung": None, "letztes_datum": ""}
-                acc[pid]["turniere"] += 1
-                if tdatum and (acc[pid]["letztes_datum"] == "" or tdatum > acc[pid]["letztes_datum"]):
-                    acc[pid]["letztes_datum"] = tdatum
-
-                platz = platz_map.get(pid)
-                if platz is not None:
-                    acc[pid]["punkte"] += schema.get(platz, 5 if platz >= 5 else 0)
-                    if acc[pid]["beste_platzierung"] is None or platz < acc[pid]["beste_platzierung"]:
-                        acc[pid]["beste_platzierung"] = platz
-                else:
-                    acc[pid]["punkte"] += schema.get(5, 5)
-
-    rows = list(acc.values())
-
-    def sort_key(d: Dict[str, Any]):
-        best = d["beste_platzierung"] if d["beste_platzierung"] is not None else 10**9
-        return (-int(d["punkte"]), int(best), (d["letztes_datum"] or "")[::-1], d["name"].lower())
-
-    rows.sort(key=sort_key)
-
-    rank = 0
-    last = None
-    for i, d in enumerate(rows, start=1):
-        if last is None or int(d["punkte"]) != int(last):
-            rank = i
-            last = int(d["punkte"])
-        d["rank"] = rank
-
-    return rows
+def check_meisterschaft_rangliste(ms_id: int) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """Konsistenzprüfung gegen eine Vollberechnung; leere Liste = alles stimmt."""
+    with _connect() as con:
+        return check_consistency(con, ms_id, display_names(DB_PATH))
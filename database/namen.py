@@ -0,0 +1,55 @@
+# database/namen.py
+# Teilnehmer-Verzeichnis: id -> Anzeigename (Spitzname, sonst Name), einmal pro DB-Datei geladen.
+# Wird von insert/update/delete_teilnehmer und set_scolia_id invalidiert, nach einem Restore
+# (close_all) über den Initializer-Hook der Verbindung.
+from __future__ import annotations
+import os, sqlite3, threading
+from typing import Dict, Iterable, List, Optional
+
+from .connection import DB_PATH, get_connection, register_initializer
+
+_lock = threading.Lock()
+_names: Dict[str, Dict[int, str]] = {}
+
+
+def _load(con: sqlite3.Connection) -> Dict[int, str]:
+    rows = con.execute("SELECT id, COALESCE(NULLIF(TRIM(spitzname),''), name, '') FROM teilnehmer").fetchall()
+    return {int(r[0]): str(r[1]) for r in rows}
+
+
+def display_names(path: Optional[str] = None) -> Dict[int, str]:
+    """Alle Anzeigenamen (eine Abfrage beim ersten Zugriff, danach aus dem Cache). Nicht verändern!"""
+    con = get_connection(path)  # zuerst: setzt den Cache nach einem Restore zurück
+    key = os.path.abspath(path or DB_PATH)
+    names = _names.get(key)
+    if names is None:
+        with _lock:
+            names = _names.get(key)
+            if names is None:
+                names = _load(con)
+                _names[key] = names
+    return names
+
+
+def display_name(pid: Optional[int], path: Optional[str] = None) -> str:
+    if pid is None:
+        return ""
+    return display_names(path).get(int(pid), "")
+
+
+def sort_by_name(pids: Iterable[int], path: Optional[str] = None) -> List[int]:
+    """Sortiert Teilnehmer-IDs nach Anzeigenamen (wie ORDER BY name)."""
+    names = display_names(path)
+    return sorted(pids, key=lambda pid: names.get(pid, ""))
+
+
+def invalidate_names(path: Optional[str] = None) -> None:
+    """Verwirft den Cache (path=None: für alle DB-Dateien)."""
+    with _lock:
+        if path is None:
+            _names.clear()
+        else:
+            _names.pop(os.path.abspath(path), None)
+
+
+register_initializer(lambda path, _con: invalidate_names(path))
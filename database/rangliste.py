@@ -0,0 +1,251 @@
+# database/rangliste.py
+# Platzierungen (beim Speichern abgeleitet) & Meisterschafts-Rangliste.
+# Die Rangliste liegt materialisiert in 'meisterschaft_rangliste' und wird nur für die
+# betroffenen Spieler neu aggregiert; lesen = ein SELECT über den Primärschlüssel.
+# Nur sqlite3 – wird von models.py und der Schema-Migration (schema.py) benutzt.
+from __future__ import annotations
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+BRONZE_ROUND = 99  # internes Kennzeichen für „Kleines Finale“
+DEFAULT_PUNKTE_AB_5 = 5  # Default-Punkte ab Platz 5 bzw. ohne Platzierung
+
+
+def _winner_loser(m: Optional[sqlite3.Row]) -> Optional[Tuple[int, int]]:
+    if not m or m["s1"] is None or m["s2"] is None or m["s1"] == m["s2"]:
+        return None
+    if m["p1_id"] is None or m["p2_id"] is None:
+        return None
+    p1 = int(m["p1_id"]); p2 = int(m["p2_id"])
+    return (p1, p2) if int(m["s1"]) > int(m["s2"]) else (p2, p1)
+
+
+def derive_bronze(con: sqlite3.Connection, turnier_id: int) -> bool:
+    """Legt/aktualisiert das Bronze-Match (runde=99), sobald beide Halbfinals entschieden sind (ohne Commit).
+
+    Schreibt nur, wenn sich die Paarung ändert; liefert True bei Änderung.
+    """
+    r = con.execute(
+        "SELECT MAX(runde) AS r FROM ko_spiele WHERE turnier_id=? AND runde<>?", (turnier_id, BRONZE_ROUND)
+    ).fetchone()
+    if not r or r["r"] is None or int(r["r"]) < 2:
+        return False
+    rows = con.execute(
+        "SELECT p1_id,p2_id,s1,s2 FROM ko_spiele WHERE turnier_id=? AND runde=? ORDER BY match_no",
+        (turnier_id, int(r["r"]) - 1),
+    ).fetchall()
+    if len(rows) < 2:
+        return False
+    losers: List[int] = []
+    for m in rows[:2]:
+        wl = _winner_loser(m)
+        if wl is None:
+            return False
+        losers.append(wl[1])
+
+    bron = con.execute(
+        "SELECT id,p1_id,p2_id FROM ko_spiele WHERE turnier_id=? AND runde=? LIMIT 1", (turnier_id, BRONZE_ROUND)
+    ).fetchone()
+    if bron is None:
+        con.execute(
+            "INSERT INTO ko_spiele(turnier_id,runde,match_no,p1_id,p2_id,s1,s2) VALUES(?,?,?,?,?,NULL,NULL)",
+            (turnier_id, BRONZE_ROUND, 1, losers[0], losers[1]),
+        )
+        return True
+    if (bron["p1_id"], bron["p2_id"]) == (losers[0], losers[1]):
+        return False
+    con.execute("UPDATE ko_spiele SET p1_id=?, p2_id=? WHERE id=?", (losers[0], losers[1], int(bron["id"])))
+    return True
+
+
+def materialize_platzierungen(con: sqlite3.Connection, turnier_id: int) -> Set[int]:
+    """Leitet Platz 1–4 aus Finale/Bronze ab und schreibt 'turnier_platzierungen' (ohne Commit).
+
+    Ist das Finale (noch) nicht entschieden, werden vorhandene Platzierungen entfernt.
+    Liefert die Spieler, deren Platzierung sich geändert hat.
+    """
+    r = con.execute(
+        "SELECT MAX(runde) AS r_final FROM ko_spiele WHERE turnier_id=? AND runde<>?", (turnier_id, BRONZE_ROUND)
+    ).fetchone()
+    final = None
+    if r and r["r_final"] is not None:
+        fm = con.execute(
+            "SELECT p1_id,p2_id,s1,s2 FROM ko_spiele WHERE turnier_id=? AND runde=? LIMIT 1",
+            (turnier_id, int(r["r_final"])),
+        ).fetchone()
+        final = _winner_loser(fm)
+
+    after: Dict[int, int] = {}
+    if final is not None:
+        after[final[0]] = 1
+        after[final[1]] = 2
+        bm = con.execute(
+            "SELECT p1_id,p2_id,s1,s2 FROM ko_spiele WHERE turnier_id=? AND runde=? LIMIT 1", (turnier_id, BRONZE_ROUND)
+        ).fetchone()
+        bronze = _winner_loser(bm)
+        if bronze is not None:
+            after[bronze[0]] = 3
+            after[bronze[1]] = 4
+    return write_platzierungen(con, turnier_id, after)
+
+
+def write_platzierungen(con: sqlite3.Connection, turnier_id: int, after: Dict[int, int]) -> Set[int]:
+    """Schreibt Platzierungen (teilnehmer_id -> platz) nur bei Abweichung (ohne Commit); liefert die geänderten Spieler."""
+    before = {
+        int(r[0]): int(r[1])
+        for r in con.execute(
+            "SELECT teilnehmer_id, platz FROM turnier_platzierungen WHERE turnier_id=?", (turnier_id,)
+        ).fetchall()
+    }
+    if after == before:
+        return set()
+    con.execute("DELETE FROM turnier_platzierungen WHERE turnier_id=?", (turnier_id,))
+    con.executemany(
+        "INSERT OR REPLACE INTO turnier_platzierungen(turnier_id,teilnehmer_id,platz) VALUES(?,?,?)",
+        [(turnier_id, pid, platz) for pid, platz in after.items()],
+    )
+    return {pid for pid in set(before) | set(after) if before.get(pid) != after.get(pid)}
+
+
+def _pid_filter(column: str, pids: Optional[List[int]]) -> Tuple[str, List[int]]:
+    if pids is None:
+        return "", []
+    return f" AND {column} IN ({','.join('?' * len(pids))})", list(pids)
+
+
+# Eine Zeile je Spieler: Punkte, Turniere, beste Platzierung, letztes Datum.
+# Punkte je Turnier: Schema-Punkte des Platzes; Plätze ohne Schema-Eintrag ab 5 -> 5, darunter 0;
+# ohne Platzierung -> Punkte für Platz 5 (Default 5).
+def _aggregate_sql(pid_clause: str) -> str:
+    return f"""
+    WITH ms_t AS (
+        SELECT t.id AS tid, TRIM(COALESCE(t.datum,'')) AS datum
+        FROM meisterschaft_turniere mt JOIN turniere t ON t.id=mt.turnier_id
+        WHERE mt.meisterschaft_id=?
+    ),
+    teilnahmen AS (
+        SELECT tt.teilnehmer_id AS pid, ms_t.datum, tp.platz,
+               CASE
+                 WHEN tp.platz IS NULL THEN COALESCE(p5.punkte, {DEFAULT_PUNKTE_AB_5})
+                 ELSE COALESCE(ps.punkte, CASE WHEN tp.platz >= 5 THEN {DEFAULT_PUNKTE_AB_5} ELSE 0 END)
+               END AS punkte
+        FROM ms_t
+        JOIN turnier_teilnehmer tt ON tt.turnier_id=ms_t.tid
+        LEFT JOIN turnier_platzierungen tp ON tp.turnier_id=ms_t.tid AND tp.teilnehmer_id=tt.teilnehmer_id
+        LEFT JOIN meisterschaft_punkteschema ps ON ps.meisterschaft_id=?1 AND ps.platz=tp.platz
+        LEFT JOIN meisterschaft_punkteschema p5 ON p5.meisterschaft_id=?1 AND p5.platz=5
+        WHERE 1=1{pid_clause}
+    )
+    SELECT te.id AS pid,
+           SUM(x.punkte) AS punkte,
+           COUNT(*) AS turniere,
+           MIN(x.platz) AS beste,
+           MAX(x.datum) AS letztes
+    FROM teilnahmen x JOIN teilnehmer te ON te.id=x.pid
+    GROUP BY te.id
+    """
+
+
+def _row_dict(r: sqlite3.Row, names: Dict[int, str]) -> Dict[str, Any]:
+    return {
+        "teilnehmer_id": int(r["pid"]),
+        "name": names.get(int(r["pid"]), "").strip(),
+        "punkte": int(r["punkte"] or 0),
+        "turniere": int(r["turniere"] or 0),
+        "beste_platzierung": None if r["beste"] is None else int(r["beste"]),
+        "letztes_datum": str(r["letztes"] or ""),
+    }
+
+
+def _sort_and_rank(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def sort_key(d: Dict[str, Any]):
+        best = d["beste_platzierung"] if d["beste_platzierung"] is not None else 10**9
+        return (-int(d["punkte"]), int(best), (d["letztes_datum"] or "")[::-1], d["name"].lower())
+
+    rows.sort(key=sort_key)
+
+    rank = 0
+    last = None
+    for i, d in enumerate(rows, start=1):
+        if last is None or int(d["punkte"]) != int(last):
+            rank = i
+            last = int(d["punkte"])
+        d["rank"] = rank
+    return rows
+
+
+def compute_rangliste_full(con: sqlite3.Connection, ms_id: int, names: Dict[int, str]) -> List[Dict[str, Any]]:
+    """Vollständige Neuberechnung (eine Abfrage) – Referenz für die materialisierte Tabelle.
+
+    names: Anzeigenamen je Teilnehmer (siehe namen.display_names).
+    """
+    rows = con.execute(_aggregate_sql(""), (int(ms_id),)).fetchall()
+    return _sort_and_rank([_row_dict(r, names) for r in rows])
+
+
+def fetch_rangliste(con: sqlite3.Connection, ms_id: int, names: Dict[int, str]) -> List[Dict[str, Any]]:
+    """Rangliste aus 'meisterschaft_rangliste' (reiner Lesezugriff, ein SELECT) inkl. 'rank'."""
+    rows = con.execute(
+        """
+        SELECT teilnehmer_id AS pid, punkte, turniere, beste_platzierung AS beste, letztes_datum AS letztes
+        FROM meisterschaft_rangliste
+        WHERE meisterschaft_id=?
+        """,
+        (int(ms_id),),
+    ).fetchall()
+    return _sort_and_rank([_row_dict(r, names) for r in rows if int(r["pid"]) in names])
+
+
+# ------------------------------------------------------------
+# Inkrementelle Pflege von 'meisterschaft_rangliste' (ohne Commit)
+# ------------------------------------------------------------
+def refresh_meisterschaft(con: sqlite3.Connection, ms_id: int, pids: Optional[Iterable[int]] = None) -> None:
+    """Aggregiert die Zeilen der angegebenen Spieler (None = alle) neu."""
+    pid_list = None if pids is None else sorted({int(p) for p in pids})
+    if pid_list is not None and not pid_list:
+        return
+    clause, args = _pid_filter("tt.teilnehmer_id", pid_list)
+    rows = con.execute(_aggregate_sql(clause), [int(ms_id)] + args).fetchall()
+    del_clause, del_args = _pid_filter("teilnehmer_id", pid_list)
+    con.execute(f"DELETE FROM meisterschaft_rangliste WHERE meisterschaft_id=?{del_clause}", [int(ms_id)] + del_args)
+    con.executemany(
+        "INSERT INTO meisterschaft_rangliste(meisterschaft_id,teilnehmer_id,punkte,turniere,beste_platzierung,letztes_datum) "
+        "VALUES(?,?,?,?,?,?)",
+        [(int(ms_id), int(r["pid"]), int(r["punkte"] or 0), int(r["turniere"] or 0), r["beste"], str(r["letztes"] or ""))
+         for r in rows],
+    )
+
+
+def meisterschaften_of_turnier(con: sqlite3.Connection, turnier_id: int) -> List[int]:
+    rows = con.execute("SELECT meisterschaft_id FROM meisterschaft_turniere WHERE turnier_id=?", (turnier_id,)).fetchall()
+    return [int(r[0]) for r in rows]
+
+
+def turnier_player_ids(con: sqlite3.Connection, turnier_id: int) -> Set[int]:
+    rows = con.execute("SELECT teilnehmer_id FROM turnier_teilnehmer WHERE turnier_id=?", (turnier_id,)).fetchall()
+    return {int(r[0]) for r in rows}
+
+
+def refresh_for_turnier(con: sqlite3.Connection, turnier_id: int, pids: Optional[Iterable[int]] = None) -> None:
+    """Delta eines Turniers in alle Meisterschaften übernehmen, denen es zugeordnet ist."""
+    pid_set = None if pids is None else set(pids)
+    if pid_set is not None and not pid_set:
+        return
+    for ms_id in meisterschaften_of_turnier(con, turnier_id):
+        refresh_meisterschaft(con, ms_id, pid_set)
+
+
+def check_consistency(con: sqlite3.Connection, ms_id: int, names: Dict[int, str]) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    """Vergleicht die materialisierte Rangliste mit einer Vollberechnung.
+
+    Liefert Abweichungen als (teilnehmer_id, materialisiert, neu berechnet); leer = konsistent.
+    """
+    fields = ("punkte", "turniere", "beste_platzierung", "letztes_datum")
+    stored = {d["teilnehmer_id"]: d for d in fetch_rangliste(con, ms_id, names)}
+    full = {d["teilnehmer_id"]: d for d in compute_rangliste_full(con, ms_id, names)}
+    diffs = []
+    for pid in sorted(set(stored) | set(full)):
+        a = stored.get(pid); b = full.get(pid)
+        if a is None or b is None or any(a[f] != b[f] for f in fields):
+            diffs.append((pid, a, b))
+    return diffs
@@ -0,0 +1,399 @@
+# database/scheduler.py
+# Scheiben-Zuweisung: Historie eines Turniers einmal lesen, jede Runde als Zuordnungsproblem
+# (Ungarische Methode) lösen, alles mit einem executemany schreiben.
+# Bereits zugewiesene Spiele bleiben unverändert und zählen in der Historie mit.
+# Zeitplan: offene Spiele in Slots (Wellen) packen – je Slot höchstens eine Partie pro Spieler
+# und aktive Scheibe; Slot und Scheibe werden in 'spiele'/'ko_spiele' gespeichert.
+from __future__ import annotations
+import sqlite3
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .boards import fetch_boards
+from .rangliste import BRONZE_ROUND
+from .connection import get_connection
+from .schema import column_map
+
+
+def min_cost_assignment(cost: Sequence[Sequence[int]]) -> List[int]:
+    """Ungarische Methode (Kuhn-Munkres, O(n²·m)) für n Zeilen <= m Spalten; liefert Spalte je Zeile."""
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    inf = float("inf")
+    u = [0] * (n + 1); v = [0] * (m + 1)
+    p = [0] * (m + 1); way = [0] * (m + 1)  # p[j]: Zeile in Spalte j (1-basiert, 0 = frei)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]; row = cost[i0 - 1]; ui = u[i0]
+            delta = inf; j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - ui - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur; way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]; j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta; v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]; p[j0] = p[j1]; j0 = j1
+    out = [-1] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            out[p[j] - 1] = j - 1
+    return out
+
+
+class _History:
+    """Einsätze je (Spieler, Scheibe) und je Scheibe im Turnier (Gruppen + KO)."""
+
+    def __init__(self, con: sqlite3.Connection, turnier_id: int):
+        self.sb: Dict[Tuple[int, int], int] = {}
+        self.b: Dict[int, int] = {}
+        for table in ("spiele", "ko_spiele"):
+            for p1, p2, bid in con.execute(
+                f"SELECT p1_id, p2_id, board_id FROM {table} WHERE turnier_id=? AND board_id IS NOT NULL", (turnier_id,)
+            ).fetchall():
+                self.add(p1, p2, int(bid))
+
+    def add(self, p1: Optional[int], p2: Optional[int], bid: int) -> None:
+        self.b[bid] = self.b.get(bid, 0) + 1
+        for pid in (p1, p2):
+            if pid is not None:
+                self.sb[(pid, bid)] = self.sb.get((pid, bid), 0) + 1
+
+
+def _assign_round(todo: Sequence[sqlite3.Row], belegt: Dict[int, int], gesamt: int, boards: Sequence[sqlite3.Row],
+                  hist: _History) -> List[Tuple[int, int]]:
+    """(board_id, match_id) für die Spiele todo einer Runde; belegt: Scheibe -> schon zugewiesene Spiele
+    derselben Runde im ganzen Turnier (auch anderer Gruppen), gesamt: alle Spiele dieser Runde.
+
+    Je Scheibe höchstens ceil(gesamt / Scheiben) (Spalten-Kopien k); innerhalb dieser Grenze
+    Kosten lexikographisch: Spieler×Scheibe-Wiederholungen > Belegung in der Runde (k) >
+    Gesamtlast der Scheibe > Scheibennummer.
+    """
+    if not todo:
+        return []
+    ids = [int(b["id"]) for b in boards]
+    k_max = -(-max(gesamt, len(todo) + sum(belegt.get(b, 0) for b in ids)) // len(ids))
+    cols = [(bid, rank, k) for rank, bid in enumerate(ids) for k in range(belegt.get(bid, 0), k_max)]
+
+    w_load = len(ids)
+    w_k = w_load * (max(hist.b.values(), default=0) + 1)
+    w_rep = w_k * (k_max + 1)
+    cost = [
+        [(hist.sb.get((m["p1_id"], bid), 0) + hist.sb.get((m["p2_id"], bid), 0)) * w_rep
+         + k * w_k + hist.b.get(bid, 0) * w_load + rank
+         for bid, rank, k in cols]
+        for m in todo
+    ]
+    out: List[Tuple[int, int]] = []
+    for m, c in zip(todo, min_cost_assignment(cost)):
+        bid = cols[c][0]
+        out.append((bid, int(m["id"])))
+        belegt[bid] = belegt.get(bid, 0) + 1
+        hist.add(m["p1_id"], m["p2_id"], bid)
+    return out
+
+
+def _assign(con: sqlite3.Connection, table: str, turnier_id: int, matches: Sequence[sqlite3.Row],
+            boards: Sequence[sqlite3.Row], todo: Callable[[sqlite3.Row], bool]) -> int:
+    """matches: alle Spiele der betroffenen Runden (Spalte 'runde'); zugewiesen werden die offenen mit todo(m)."""
+    hist = _History(con, turnier_id)
+    belegt: Dict[object, Dict[int, int]] = {}
+    offen: Dict[object, List[sqlite3.Row]] = {}
+    gesamt: Dict[object, int] = {}
+    for m in matches:
+        r = m["runde"] or 0
+        gesamt[r] = gesamt.get(r, 0) + 1
+        if m["board_id"]:
+            rb = belegt.setdefault(r, {})
+            rb[int(m["board_id"])] = rb.get(int(m["board_id"]), 0) + 1
+        elif todo(m):
+            offen.setdefault(r, []).append(m)
+    updates: List[Tuple[int, int]] = []
+    for r in sorted(offen):
+        updates.extend(_assign_round(offen[r], belegt.setdefault(r, {}), gesamt[r], boards, hist))
+    con.executemany(f"UPDATE {table} SET board_id=? WHERE id=?", updates)
+    return len(updates)
+
+
+def assign_group_boards(turnier_id: int, gruppe_id: int, path: Optional[str] = None) -> int:
+    """Scheiben für alle noch offenen Spiele einer Gruppe (je Spieltag gelöst, Belegung durch
+    andere Gruppen am selben Spieltag zählt mit); liefert die Anzahl."""
+    boards = fetch_boards(True, path)
+    if not boards:
+        return 0
+    rc = column_map(path).group_round or "runde"
+    con = get_connection(path)
+    own = not con.in_transaction  # in einer Transaktion des Aufrufers: Commit/Rollback bleibt bei ihm
+    if own:
+        con.execute("BEGIN IMMEDIATE")
+    try:
+        matches = con.execute(
+            f"SELECT id, gruppe_id, {rc} AS runde, p1_id, p2_id, board_id FROM spiele "
+            f"WHERE turnier_id=? ORDER BY {rc}, gruppe_id, match_no, id",
+            (turnier_id,),
+        ).fetchall()
+        n = _assign(con, "spiele", turnier_id, matches, boards, lambda m: m["gruppe_id"] == gruppe_id)
+    except BaseException:
+        if own:
+            con.rollback()
+        raise
+    if own:
+        con.commit()
+    return n
+
+
+def assign_round_boards(turnier_id: int, runde: int, path: Optional[str] = None) -> int:
+    """Scheiben für alle noch offenen Spiele einer KO-Runde; liefert die Anzahl."""
+    boards = fetch_boards(True, path)
+    if not boards:
+        return 0
+    con = get_connection(path)
+    own = not con.in_transaction  # in einer Transaktion des Aufrufers: Commit/Rollback bleibt bei ihm
+    if own:
+        con.execute("BEGIN IMMEDIATE")
+    try:
+        matches = con.execute(
+            "SELECT id, runde, p1_id, p2_id, board_id FROM ko_spiele WHERE turnier_id=? AND runde=? ORDER BY match_no, id",
+            (turnier_id, runde),
+        ).fetchall()
+        n = _assign(con, "ko_spiele", turnier_id, matches, boards, lambda _m: True)
+    except BaseException:
+        if own:
+            con.rollback()
+        raise
+    if own:
+        con.commit()
+    return n
+
+
+# ------------------------------------------------------------
+# Fairness-Kennzahlen
+# ------------------------------------------------------------
+class BoardFairness(NamedTuple):
+    spiele: int                # Spiele mit Scheibe
+    wiederholungen: int        # Σ über Spieler×Scheibe: Einsätze - 1 (0 = niemand spielt zweimal auf derselben)
+    max_gleiche_scheibe: int   # höchste Einsatzzahl eines Spielers auf einer Scheibe
+    last_min: int              # Spiele auf der am wenigsten genutzten aktiven Scheibe
+    last_max: int              # … auf der meistgenutzten
+
+
+def board_fairness(turnier_id: int, path: Optional[str] = None) -> BoardFairness:
+    con = get_connection(path)
+    hist = _History(con, turnier_id)
+    loads = [hist.b.get(int(b["id"]), 0) for b in fetch_boards(True, path)] or [0]
+    return BoardFairness(
+        sum(hist.b.values()),
+        sum(c - 1 for c in hist.sb.values() if c > 1),
+        max(hist.sb.values(), default=0),
+        min(loads),
+        max(loads),
+    )
+
+
+# ------------------------------------------------------------
+# Zeitplan (Slots)
+# ------------------------------------------------------------
+class Zeitplan(NamedTuple):
+    spiele: int        # neu eingeplante Spiele
+    slots: int         # letzter belegter Slot
+    untergrenze: int   # max(⌈Spiele/Scheiben⌉, meiste Spiele eines Spielers, längste KO-Kette) – ohne Gespieltes
+    leerlauf: int      # Σ über Spieler: Slots zwischen erstem und letztem Spiel ohne eigenes Spiel
+    max_leerlauf: int  # … des am längsten wartenden Spielers
+
+
+class _Job(NamedTuple):
+    id: int
+    p1: Optional[int]
+    p2: Optional[int]
+    kette: int                    # Spiele, die nach diesem noch zwingend folgen (KO-Pfad zum Finale)
+    nach: Tuple[int, ...]         # IDs der Spiele, die vorher fertig sein müssen
+    order: Tuple[int, int, int]   # Anzeige-Reihenfolge (Spieltag/Runde, Gruppe, match_no)
+
+
+def _pack(jobs: Sequence[_Job], capacity: int, start: int) -> Dict[int, int]:
+    """Listen-Scheduling: Slot für Slot die bereiten Spiele nach Dringlichkeit füllen.
+
+    Ziel ist die Untergrenze an Slots. Kritisch ist ein Spiel, dessen längste offene Kette
+    (Restspiele eines Spielers bzw. KO-Pfad) die verbleibenden Slots bis zum Ziel füllt – das kommt
+    zuerst. Sonst zuerst Spieler, die schon angefangen haben und am längsten warten (wer noch nicht
+    gespielt hat, sammelt keinen Leerlauf): so spielt eine Gruppe möglichst am Stück.
+    """
+    rest: Dict[int, int] = {}
+    for j in jobs:
+        for pid in (j.p1, j.p2):
+            if pid is not None:
+                rest[pid] = rest.get(pid, 0) + 1
+    if not jobs:
+        return {}
+    ende = start - 1 + max(-(-len(jobs) // capacity), max(rest.values(), default=0), max(j.kette + 1 for j in jobs))
+    offen = sorted(jobs, key=lambda j: j.order)
+    fertig: Dict[int, int] = {}   # Job -> Slot
+    zuletzt: Dict[int, int] = {}  # Spieler -> letzter Slot
+    slot = start
+    while offen:
+        frei = ende - slot + 1
+
+        def key(j: _Job) -> Tuple[bool, int, int, int, Tuple[int, int, int]]:
+            chain = max(j.kette + 1, rest.get(j.p1, 0), rest.get(j.p2, 0))
+            ps = [pid for pid in (j.p1, j.p2) if pid in zuletzt]
+            wait = max((slot - zuletzt[pid] for pid in ps), default=0)
+            return (chain < frei, -len(ps), -wait, -chain, j.order)
+
+        bereit = [j for j in offen if all(fertig.get(v, slot) < slot for v in j.nach)]
+        if not bereit:
+            raise ValueError("Zeitplan: zyklische Abhängigkeit zwischen Spielen.")
+        belegt: set = set()
+        n = 0
+        for j in sorted(bereit, key=key):
+            if (j.p1 is not None and j.p1 in belegt) or (j.p2 is not None and j.p2 in belegt):
+                continue
+            fertig[j.id] = slot
+            for pid in (j.p1, j.p2):
+                if pid is not None:
+                    belegt.add(pid); rest[pid] -= 1; zuletzt[pid] = slot
+            n += 1
+            if n == capacity:
+                break
+        offen = [j for j in offen if j.id not in fertig]
+        slot += 1
+        ende = max(ende, slot)  # Ziel verfehlt -> ab jetzt ist alles kritisch
+    return fertig
+
+
+def _leerlauf(spiele: Iterable[Tuple[Optional[int], Optional[int], Optional[int]]]) -> Tuple[int, int]:
+    """(Σ, max) Leerlauf über (slot, p1, p2)."""
+    per: Dict[int, List[int]] = {}
+    for slot, p1, p2 in spiele:
+        if slot is None:
+            continue
+        for pid in (p1, p2):
+            if pid is not None:
+                per.setdefault(pid, []).append(slot)
+    idle = [max(sl) - min(sl) + 1 - len(sl) for sl in per.values()]
+    return sum(idle), max(idle, default=0)
+
+
+def _schedule(con: sqlite3.Connection, table: str, turnier_id: int, rows: Sequence[sqlite3.Row],
+              jobs: Sequence[_Job], boards: Sequence[sqlite3.Row]) -> Zeitplan:
+    """Packt jobs hinter die gespielten Slots, verteilt je Slot die Scheiben (ohne Doppelbelegung)
+    und schreibt Slot + Scheibe mit einem executemany; rows: alle Spiele der Phase."""
+    ids = {j.id for j in jobs}
+    start = max((r["slot"] or 0 for r in rows if r["id"] not in ids), default=0) + 1
+    fertig = _pack(jobs, len(boards), start)
+
+    # alte Scheiben der neu geplanten Spiele zählen nicht zur Historie
+    con.executemany(f"UPDATE {table} SET board_id=NULL WHERE id=?", [(i,) for i in ids])
+    hist = _History(con, turnier_id)
+    by_slot: Dict[int, List[sqlite3.Row]] = {}
+    for r in rows:
+        if r["id"] in fertig:
+            by_slot.setdefault(fertig[r["id"]], []).append(r)
+    updates: List[Tuple[int, int, int]] = []
+    for slot in sorted(by_slot):
+        todo = by_slot[slot]
+        for bid, mid in _assign_round(todo, {}, len(todo), boards, hist):
+            updates.append((slot, bid, mid))
+    con.executemany(f"UPDATE {table} SET slot=?, board_id=? WHERE id=?", updates)
+
+    slots = {r["id"]: (fertig.get(r["id"]) or r["slot"]) for r in rows}
+    leer, leer_max = _leerlauf((slots[r["id"]], r["p1_id"], r["p2_id"]) for r in rows)
+    per_player: Dict[int, int] = {}
+    for j in jobs:
+        for pid in (j.p1, j.p2):
+            if pid is not None:
+                per_player[pid] = per_player.get(pid, 0) + 1
+    lower = max(-(-len(jobs) // len(boards)), max(per_player.values(), default=0), max(j.kette + 1 for j in jobs)) if jobs else 0
+    return Zeitplan(len(jobs), max((v for v in slots.values() if v), default=0), lower, leer, leer_max)
+
+
+def schedule_group_slots(turnier_id: int, path: Optional[str] = None) -> Zeitplan:
+    """Zeitplan der Gruppenphase (alle Gruppen gemeinsam); gespielte Spiele behalten Slot und Scheibe."""
+    boards = fetch_boards(True, path)
+    if not boards:
+        raise ValueError("Keine aktive Dartscheibe – Zeitplan nicht möglich.")
+    cmap = column_map(path)
+    rc = cmap.group_round or "match_no"
+    con = get_connection(path)
+    own = not con.in_transaction  # in einer Transaktion des Aufrufers: Commit/Rollback bleibt bei ihm
+    if own:
+        con.execute("BEGIN IMMEDIATE")
+    try:
+        rows = con.execute(
+            f"SELECT id, gruppe_id, COALESCE({rc}, 0) AS runde, COALESCE(match_no, 0) AS match_no, p1_id, p2_id, "
+            f"{cmap.group_s1} AS s1, {cmap.group_s2} AS s2, board_id, slot FROM spiele WHERE turnier_id=?",
+            (turnier_id,),
+        ).fetchall()
+        # je Spieler die Spieltag-Reihenfolge einhalten: ein Spiel erst nach dem vorigen offenen Spiel beider Spieler
+        offen = sorted((r for r in rows if r["s1"] is None or r["s2"] is None),
+                       key=lambda r: (int(r["runde"]), int(r["gruppe_id"]), int(r["match_no"])))
+        vorher: Dict[int, int] = {}
+        jobs: List[_Job] = []
+        for r in offen:
+            nach = tuple(vorher[pid] for pid in (r["p1_id"], r["p2_id"]) if pid in vorher)
+            jobs.append(_Job(int(r["id"]), r["p1_id"], r["p2_id"], 0, nach, (int(r["runde"]), int(r["gruppe_id"]), int(r["match_no"]))))
+            for pid in (r["p1_id"], r["p2_id"]):
+                if pid is not None:
+                    vorher[pid] = int(r["id"])
+        plan = _schedule(con, "spiele", turnier_id, rows, jobs, boards)
+    except BaseException:
+        if own:
+            con.rollback()
+        raise
+    if own:
+        con.commit()
+    return plan
+
+
+def schedule_ko_slots(turnier_id: int, path: Optional[str] = None) -> Zeitplan:
+    """Zeitplan der KO-Phase: ein Spiel erst nach seinen Zubringerspielen, Bronze nach den Halbfinals.
+    Spiele späterer Runden werden eingeplant, auch wenn die Paarung noch offen ist."""
+    boards = fetch_boards(True, path)
+    if not boards:
+        raise ValueError("Keine aktive Dartscheibe – Zeitplan nicht möglich.")
+    con = get_connection(path)
+    own = not con.in_transaction  # in einer Transaktion des Aufrufers: Commit/Rollback bleibt bei ihm
+    if own:
+        con.execute("BEGIN IMMEDIATE")
+    try:
+        rows = con.execute(
+            "SELECT id, runde, match_no, p1_id, p2_id, s1, s2, board_id, slot FROM ko_spiele WHERE turnier_id=?",
+            (turnier_id,),
+        ).fetchall()
+        grid = {(int(r["runde"]), int(r["match_no"])): int(r["id"]) for r in rows if r["s1"] is None or r["s2"] is None}
+        final_round = max((int(r["runde"]) for r in rows if r["runde"] != BRONZE_ROUND), default=0)
+        jobs: List[_Job] = []
+        for r in rows:
+            if r["s1"] is not None and r["s2"] is not None:
+                continue
+            runde, no = int(r["runde"]), int(r["match_no"])
+            if runde == BRONZE_ROUND:
+                feeders = [(final_round - 1, 1), (final_round - 1, 2)]
+                chain, order = 0, (final_round, 0, no)
+            else:
+                feeders = [(runde - 1, 2 * no - 1), (runde - 1, 2 * no)]
+                chain, order = final_round - runde, (runde, 0, no)
+            nach = tuple(grid[f] for f in feeders if f in grid)  # nur noch offene Zubringer
+            jobs.append(_Job(int(r["id"]), r["p1_id"], r["p2_id"], chain, nach, order))
+        plan = _schedule(con, "ko_spiele", turnier_id, rows, jobs, boards)
+    except BaseException:
+        if own:
+            con.rollback()
+        raise
+    if own:
+        con.commit()
+    return plan
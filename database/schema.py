@@ -0,0 +1,263 @@
+# database/schema.py
+# Zentrale, geordnete Schema-Migrationen (PRAGMA user_version) + gecachte Spaltenzuordnung.
+# Läuft einmal pro Prozess und DB-Datei beim ersten Öffnen einer Verbindung
+# (nach einem Restore erneut, siehe connection.close_all()).
+from __future__ import annotations
+import os, sqlite3, threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .connection import DB_PATH, get_connection, register_initializer
+from .rangliste import derive_bronze, materialize_platzierungen, refresh_for_turnier, refresh_meisterschaft
+
+
+@dataclass(frozen=True)
+class ColumnMap:
+    """Spaltennamen, die zwischen alten und neuen DB-Ständen variieren."""
+    group_round: Optional[str]  # spiele: 'spieltag' (neu) oder 'runde' (alt)
+    group_s1: str               # spiele: 'sets1' oder 's1'
+    group_s2: str               # spiele: 'sets2' oder 's2'
+
+
+_column_maps: Dict[str, ColumnMap] = {}
+_maps_lock = threading.Lock()
+
+
+def _col_exists(con: sqlite3.Connection, table: str, col: str) -> bool:
+    try:
+        rows = con.execute(f"PRAGMA table_info({table})").fetchall()
+        return any(str(r[1]).lower() == col.lower() for r in rows)
+    except Exception:
+        return False
+
+
+# ------------------------------------------------------------
+# Basistabellen (idempotent, unversioniert)
+# ------------------------------------------------------------
+def _create_base_tables(con: sqlite3.Connection) -> None:
+    c = con.cursor()
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS turniere(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        datum TEXT,
+        modus TEXT,
+        meisterschaft INTEGER DEFAULT 0
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS teilnehmer(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        spitzname TEXT
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS turnier_teilnehmer(
+        turnier_id INTEGER NOT NULL,
+        teilnehmer_id INTEGER NOT NULL,
+        UNIQUE(turnier_id, teilnehmer_id)
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS gruppen(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        turnier_id INTEGER NOT NULL,
+        name TEXT NOT NULL
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS gruppen_teilnehmer(
+        gruppe_id INTEGER NOT NULL,
+        teilnehmer_id INTEGER NOT NULL,
+        UNIQUE(gruppe_id, teilnehmer_id)
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS spiele(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        turnier_id INTEGER NOT NULL,
+        gruppe_id INTEGER NOT NULL,
+        spieltag INTEGER,            -- frühere Version: 'runde'
+        match_no INTEGER,
+        p1_id INTEGER,
+        p2_id INTEGER,
+        s1 INTEGER,
+        s2 INTEGER
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS ko_spiele(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        turnier_id INTEGER NOT NULL,
+        runde INTEGER,
+        match_no INTEGER,
+        p1_id INTEGER,
+        p2_id INTEGER,
+        s1 INTEGER,
+        s2 INTEGER
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS turnier_platzierungen(
+        turnier_id INTEGER NOT NULL,
+        teilnehmer_id INTEGER NOT NULL,
+        platz INTEGER NOT NULL,
+        UNIQUE(turnier_id, teilnehmer_id)
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS meisterschaften(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        saison TEXT,
+        punkteschema TEXT
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS meisterschaft_turniere(
+        meisterschaft_id INTEGER NOT NULL,
+        turnier_id INTEGER NOT NULL,
+        UNIQUE(meisterschaft_id, turnier_id)
+    )""")
+    c.execute("""
+    CREATE TABLE IF NOT EXISTS meisterschaft_punkteschema(
+        meisterschaft_id INTEGER NOT NULL,
+        platz INTEGER NOT NULL,
+        punkte INTEGER NOT NULL,
+        UNIQUE(meisterschaft_id, platz)
+    )""")
+    con.commit()
+
+
+# ------------------------------------------------------------
+# Versionierte Schritte – neue Schritte nur hinten anhängen
+# ------------------------------------------------------------
+def _m001_indexes(con: sqlite3.Connection) -> None:
+    """Sekundärindizes für die Zugriffspfade der Spiel-/Zuordnungstabellen."""
+    rcol = "spieltag" if _col_exists(con, "spiele", "spieltag") else "runde"
+    for sql in (
+        # fetch_group_matches / compute_group_table / Board-Zuweisung
+        f"CREATE INDEX IF NOT EXISTS idx_spiele_turnier_gruppe ON spiele(turnier_id, gruppe_id, {rcol}, match_no)",
+        # fetch_ko_matches / save_ko_result_and_propagate / MAX(runde)
+        "CREATE INDEX IF NOT EXISTS idx_ko_spiele_turnier_runde ON ko_spiele(turnier_id, runde, match_no)",
+        "CREATE INDEX IF NOT EXISTS idx_gruppen_turnier ON gruppen(turnier_id, name)",
+        # Löschen/Auswerten pro Teilnehmer bzw. Turnier (UNIQUE deckt nur die erste Spalte ab)
+        "CREATE INDEX IF NOT EXISTS idx_gruppen_teilnehmer_tn ON gruppen_teilnehmer(teilnehmer_id)",
+        "CREATE INDEX IF NOT EXISTS idx_turnier_teilnehmer_tn ON turnier_teilnehmer(teilnehmer_id)",
+        "CREATE INDEX IF NOT EXISTS idx_turnier_platzierungen_tn ON turnier_platzierungen(teilnehmer_id)",
+        "CREATE INDEX IF NOT EXISTS idx_meisterschaft_turniere_turnier ON meisterschaft_turniere(turnier_id)",
+    ):
+        con.execute(sql)
+
+
+def _m002_v094_boards_rankmode(con: sqlite3.Connection) -> None:
+    """v0.9.4: Ranglisten-Modus je Turnier, Dartscheiben und Board-Zuordnung (Gruppe + KO)."""
+    if not _col_exists(con, "turniere", "group_rank_mode"):
+        con.execute("ALTER TABLE turniere ADD COLUMN group_rank_mode TEXT NOT NULL DEFAULT 'punkte'")
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS dartscheiben (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nummer INTEGER NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            aktiv INTEGER NOT NULL DEFAULT 1
+        )
+        """
+    )
+    if not _col_exists(con, "spiele", "board_id"):
+        con.execute("ALTER TABLE spiele ADD COLUMN board_id INTEGER NULL REFERENCES dartscheiben(id)")
+    if not _col_exists(con, "ko_spiele", "board_id"):
+        con.execute("ALTER TABLE ko_spiele ADD COLUMN board_id INTEGER NULL REFERENCES dartscheiben(id)")
+
+
+def _m003_v096_scolia(con: sqlite3.Connection) -> None:
+    """v0.9.6: Scolia-ID je Teilnehmer."""
+    if not _col_exists(con, "teilnehmer", "scolia_id"):
+        con.execute("ALTER TABLE teilnehmer ADD COLUMN scolia_id TEXT")
+
+
+def _m004_platzierungen_backfill(con: sqlite3.Connection) -> None:
+    """Platzierungen werden ab jetzt beim Speichern geschrieben – einmalig für alle Turniere nachziehen."""
+    for (tid,) in con.execute("SELECT DISTINCT turnier_id FROM ko_spiele").fetchall():
+        materialize_platzierungen(con, int(tid))
+
+
+def _m005_meisterschaft_rangliste(con: sqlite3.Connection) -> None:
+    """Materialisierte Meisterschafts-Rangliste (wird beim Speichern inkrementell gepflegt)."""
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS meisterschaft_rangliste(
+            meisterschaft_id INTEGER NOT NULL,
+            teilnehmer_id INTEGER NOT NULL,
+            punkte INTEGER NOT NULL DEFAULT 0,
+            turniere INTEGER NOT NULL DEFAULT 0,
+            beste_platzierung INTEGER,
+            letztes_datum TEXT NOT NULL DEFAULT '',
+            PRIMARY KEY(meisterschaft_id, teilnehmer_id)
+        )
+        """
+    )
+    con.execute("CREATE INDEX IF NOT EXISTS idx_meisterschaft_rangliste_teilnehmer ON meisterschaft_rangliste(teilnehmer_id)")
+    for (ms_id,) in con.execute("SELECT id FROM meisterschaften").fetchall():
+        refresh_meisterschaft(con, int(ms_id))
+
+
+def _m006_bronze_backfill(con: sqlite3.Connection) -> None:
+    """Bronze wird ab jetzt beim Speichern angelegt (nicht mehr beim Anzeigen/Export) – einmalig nachziehen."""
+    for (tid,) in con.execute("SELECT DISTINCT turnier_id FROM ko_spiele").fetchall():
+        if derive_bronze(con, int(tid)):
+            refresh_for_turnier(con, int(tid), materialize_platzierungen(con, int(tid)))
+
+
+def _m007_slots(con: sqlite3.Connection) -> None:
+    """Zeitplan: Slot-Nummer (Welle) je Gruppen- und KO-Spiel, siehe database/scheduler.py."""
+    for table in ("spiele", "ko_spiele"):
+        if not _col_exists(con, table, "slot"):
+            con.execute(f"ALTER TABLE {table} ADD COLUMN slot INTEGER NULL")
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "indizes", _m001_indexes),
+    (2, "v0.9.4 dartscheiben/ranglisten-modus", _m002_v094_boards_rankmode),
+    (3, "v0.9.6 scolia-id", _m003_v096_scolia),
+    (4, "platzierungen beim speichern", _m004_platzierungen_backfill),
+    (5, "materialisierte meisterschafts-rangliste", _m005_meisterschaft_rangliste),
+    (6, "bronze beim speichern", _m006_bronze_backfill),
+    (7, "zeitplan-slots", _m007_slots),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def migrate(con: sqlite3.Connection) -> int:
+    """Legt Basistabellen an und führt alle noch offenen Schritte aus. Liefert die neue Version."""
+    _create_base_tables(con)
+    current = int(con.execute("PRAGMA user_version").fetchone()[0])
+    for version, _name, step in MIGRATIONS:
+        if version <= current:
+            continue
+        step(con)
+        con.execute(f"PRAGMA user_version={int(version)}")
+        con.commit()
+        current = version
+    return current
+
+
+def _probe_columns(con: sqlite3.Connection) -> ColumnMap:
+    cols = {str(r[1]).lower() for r in con.execute("PRAGMA table_info(spiele)").fetchall()}
+    group_round = "spieltag" if "spieltag" in cols else ("runde" if "runde" in cols else None)
+    s1 = "sets1" if "sets1" in cols else "s1"
+    s2 = "sets2" if "sets2" in cols else "s2"
+    return ColumnMap(group_round=group_round, group_s1=s1, group_s2=s2)
+
+
+def _initialize(path: str, con: sqlite3.Connection) -> None:
+    migrate(con)
+    cmap = _probe_columns(con)
+    with _maps_lock:
+        _column_maps[path] = cmap
+
+
+register_initializer(_initialize)
+
+
+def ensure_schema(path: Optional[str] = None) -> None:
+    """Stellt sicher, dass die DB migriert ist (öffnet ggf. die Thread-Verbindung)."""
+    get_connection(path)
+
+
+def column_map(path: Optional[str] = None) -> ColumnMap:
+    """Gecachte Spaltenzuordnung der DB – ohne erneute Schema-Introspektion."""
+    get_connection(path)  # initialisiert (erneut) nach Öffnen/Restore
+    return _column_maps[os.path.abspath(path or DB_PATH)]
@@ -4,20 +4,18 @@ import sqlite3
 from typing import List, Tuple, Optional
 
 # Wir nutzen die bestehenden DB-Helfer aus models.py
-from .models import _connect, _col_exists
+from .models import _connect, DB_PATH
+from .schema import ensure_schema
+from .namen import invalidate_names
 
 
 def ensure_scolia_schema() -> None:
-    """Fügt die Spalte 'scolia_id' zu 'teilnehmer' hinzu (idempotent)."""
-    with _connect() as con:
-        if not _col_exists(con, "teilnehmer", "scolia_id"):
-            con.execute("ALTER TABLE teilnehmer ADD COLUMN scolia_id TEXT")
-            con.commit()
+    """Spalte 'scolia_id' wird von der Migration v3 angelegt (database/schema.py); hier nur sicherstellen."""
+    ensure_schema(DB_PATH)
 
 
 def fetch_teilnehmer_full() -> List[Tuple[int, str, str, str]]:
     """Alle Teilnehmer inkl. Scolia-ID (leere Strings wenn NULL)."""
-    ensure_scolia_schema()
     with _connect() as con:
         rows = con.execute(
             "SELECT id, name, COALESCE(spitzname,''), COALESCE(scolia_id,'') "
@@ -28,10 +26,10 @@ def fetch_teilnehmer_full() -> List[Tuple[int, str, str, str]]:
 
 def set_scolia_id(teilnehmer_id: int, scolia_id: Optional[str]) -> None:
     """Setzt/aktualisiert die Scolia-ID für einen Teilnehmer."""
-    ensure_scolia_schema()
     with _connect() as con:
         con.execute(
             "UPDATE teilnehmer SET scolia_id=? WHERE id=?",
             (None if (scolia_id or "").strip() == "" else scolia_id.strip(), int(teilnehmer_id))
         )
         con.commit()
+    invalidate_names(DB_PATH)
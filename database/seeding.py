@@ -0,0 +1,169 @@
+# database/seeding.py
+# Setzverfahren für den KO-Plan: aus den Gruppentabellen wird die Startaufstellung
+# (Länge 2^k, None = Freilos) berechnet. Verfahren sind über register_seeding erweiterbar;
+# optional wird verhindert, dass Spieler derselben Gruppe vor Runde N aufeinandertreffen.
+from __future__ import annotations
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .bracket import bracket_size, seed_order
+from .tabellen import TabellenZeile
+
+Gruppen = Sequence[Tuple[int, str]]          # (gruppe_id, name) in Anzeige-Reihenfolge
+Ranking = Dict[int, List[TabellenZeile]]     # gruppe_id -> Tabelle (Platz 1..n)
+Slots = List[Optional[int]]
+SeedingFn = Callable[[Gruppen, Ranking, int], Slots]
+
+SEEDINGS: Dict[str, Tuple[str, SeedingFn]] = {}  # key -> (Anzeige, Funktion)
+
+
+def register_seeding(key: str, label: str, fn: SeedingFn) -> None:
+    SEEDINGS[key] = (label, fn)
+
+
+def _seed_key(z: TabellenZeile) -> Tuple[float, float, float, str, int]:
+    # gruppenübergreifender Vergleich gleicher Tabellenplätze; je Spiel, da Gruppen verschieden groß sein können
+    n = max(z.spiele, 1)
+    return (-z.pkt / n, -z.diff / n, -z.lf / n, z.spieler, z.pid)
+
+
+def _levels(groups: Gruppen, ranking: Ranking, total: int, order: Callable[[int, List[TabellenZeile]], List[TabellenZeile]]) -> List[int]:
+    """Setzliste Tabellenplatz für Tabellenplatz (erst alle Ersten, dann alle Zweiten, …)."""
+    seeds: List[int] = []
+    depth = max((len(z) for z in ranking.values()), default=0)
+    for rank in range(depth):
+        level = order(rank, [ranking[gid][rank] for gid, _ in groups if rank < len(ranking[gid])])
+        seeds.extend(z.pid for z in level)
+        if len(seeds) >= total:
+            return seeds[:total]
+    raise ValueError("Nicht genug Spieler in den Gruppen für so viele Qualifikanten.")
+
+
+def _place(seeds: Sequence[int], total: int) -> Slots:
+    return [seeds[s - 1] if s <= total else None for s in seed_order(bracket_size(total))]
+
+
+def standard(groups: Gruppen, ranking: Ranking, total: int) -> Slots:
+    """Standard-Seeding; innerhalb eines Tabellenplatzes nach Punkten/Differenz/Legs je Spiel."""
+    return _place(_levels(groups, ranking, total, lambda _r, lv: sorted(lv, key=_seed_key)), total)
+
+
+def _schlange_order(rank: int, level: List[TabellenZeile]) -> List[TabellenZeile]:
+    return level if rank % 2 == 0 else level[::-1]
+
+
+def schlange(groups: Gruppen, ranking: Ranking, total: int) -> Slots:
+    """Schlangen-Seeding über alle Gruppen: Erste A, B, C, …, Zweite …, C, B, A, Dritte A, B, …
+
+    Bei 2 je Gruppe hieße das A1–A2 in Runde 1; Gruppenkameraden werden daher bis Runde 2 getrennt,
+    soweit es die Gruppen hergeben (bei nur einer Gruppe z. B. gar nicht).
+    """
+    slots = _place(_levels(groups, ranking, total, _schlange_order), total)
+    return separate_groups(slots, ranking, 2, strict=False)
+
+
+def klassisch(groups: Gruppen, ranking: Ranking, total: int) -> Slots:
+    """Gruppen paarweise (A/B, C/D, …): A1–B{n}, A2–B{n-1}, … – nur gerade Gruppenzahl & 2er-Potenz."""
+    if len(groups) % 2 != 0 or total != bracket_size(total) or total % len(groups) != 0:
+        raise ValueError("Paarweise Setzung braucht eine gerade Gruppenzahl und gleich viele Qualifikanten je Gruppe (2er-Potenz).")
+    per_group = total // len(groups)
+    for gid, _ in groups:
+        if len(ranking[gid]) < per_group:
+            raise ValueError("Nicht jede Gruppe hat genug Qualifikanten.")
+    slots: Slots = []
+    for i in range(0, len(groups), 2):
+        top_a = ranking[groups[i][0]][:per_group]
+        top_b = ranking[groups[i + 1][0]][:per_group]
+        for k in range(per_group):
+            slots += [top_a[k].pid, top_b[per_group - k - 1].pid]
+    return slots
+
+
+def auto(groups: Gruppen, ranking: Ranking, total: int) -> Slots:
+    """Paarweise, wo möglich – sonst Standard-Seeding mit Freilosen.
+
+    Beim Standard-Seeding können sich Gruppenkameraden schon in Runde 1 treffen (z. B. 3 Gruppen,
+    6 Qualifikanten); sie werden deshalb, soweit es die Gruppen hergeben, bis Runde 2 getrennt.
+    """
+    if len(groups) % 2 == 0 and total == bracket_size(total) and total % len(groups) == 0:
+        return klassisch(groups, ranking, total)
+    return separate_groups(standard(groups, ranking, total), ranking, 2, strict=False)
+
+
+register_seeding("auto", "Automatisch", auto)
+register_seeding("klassisch", "Gruppen paarweise (A–B)", klassisch)
+register_seeding("standard", "Standard-Setzliste", standard)
+register_seeding("schlange", "Schlange über alle Gruppen", schlange)
+
+
+# ------------------------------------------------------------
+# Gruppen-Trennung
+# ------------------------------------------------------------
+def separate_groups(slots: Slots, ranking: Ranking, from_round: int, strict: bool = True) -> Slots:
+    """Tauscht Spieler so, dass zwei derselben Gruppe frühestens in Runde from_round aufeinandertreffen.
+
+    Positionen i, j treffen sich frühestens in Runde (i ^ j).bit_length(); die Bedingung heißt also:
+    je Block von 2^(from_round-1) Positionen höchstens ein Spieler pro Gruppe. Für jeden Konflikt
+    wird der schwächer Gesetzte getauscht – mit dem Spieler, bei dem die Zahl der Konflikte am
+    stärksten sinkt, bei Gleichstand dem im Setzplatz nächstgelegenen. Freilose und ihre Inhaber
+    (die Topgesetzten) bleiben, wo sie sind.
+    Verringert kein Tausch die Konflikte mehr: ValueError (strict) bzw. die bis dahin beste Aufstellung.
+    """
+    if from_round <= 1:
+        return list(slots)
+    shift = from_round - 1
+    group = {z.pid: gid for gid, zeilen in ranking.items() for z in zeilen}
+    seed_at = seed_order(len(slots))  # Setzplatz je Position
+    out: Slots = list(slots)
+    count: Dict[Tuple[int, int], int] = {}  # (Block, Gruppe) -> Anzahl
+    for pos, pid in enumerate(out):
+        if pid is not None:
+            key = (pos >> shift, group[pid])
+            count[key] = count.get(key, 0) + 1
+    # Inhaber eines Freiloses werden nie getauscht, sonst wanderte das Freilos zu einem Schwächeren
+    by_seed = sorted((pos for pos, pid in enumerate(out) if pid is not None and out[pos ^ 1] is not None),
+                     key=lambda pos: seed_at[pos])
+
+    def delta(i: int, j: int) -> int:
+        """Änderung der Konfliktzahl beim Tausch i <-> j."""
+        bi, bj, gi, gj = i >> shift, j >> shift, group[out[i]], group[out[j]]
+        return ((count.get((bj, gi), 0) >= 1) - (count[(bi, gi)] >= 2)
+                + (count.get((bi, gj), 0) >= 1) - (count[(bj, gj)] >= 2))
+
+    while True:
+        # schwächster Spieler mit Konflikt zuerst – Topgesetzte bleiben möglichst stehen
+        i = next((p for p in reversed(by_seed) if count[(p >> shift, group[out[p]])] >= 2), None)
+        if i is None and all(v < 2 for v in count.values()):
+            return out
+        best: Optional[Tuple[int, int, int]] = None  # (delta, Abstand, j)
+        if i is not None:  # sonst betrifft der Konflikt nur Freilos-Inhaber
+            gi = group[out[i]]
+            for j in by_seed:
+                if (j >> shift) == (i >> shift) or group[out[j]] == gi:
+                    continue
+                cand = (delta(i, j), abs(seed_at[j] - seed_at[i]), j)
+                if cand[0] < 0 and (best is None or cand < best):
+                    best = cand
+        if best is None:
+            if not strict:
+                return out
+            raise ValueError(f"Spieler derselben Gruppe lassen sich nicht bis Runde {from_round} trennen.")
+        j = best[2]
+        gj = group[out[j]]
+        for pos, g, d in ((i, gi, -1), (j, gj, -1), (i, gj, 1), (j, gi, 1)):
+            count[(pos >> shift, g)] = count.get((pos >> shift, g), 0) + d
+        out[i], out[j] = out[j], out[i]
+
+
+def build_slots(groups: Gruppen, ranking: Ranking, total: int, seeding: str = "auto",
+                same_group_from: Optional[int] = None) -> Slots:
+    """Startaufstellung nach Verfahren 'seeding'.
+
+    same_group_from: Runde, ab der sich Gruppenkameraden treffen dürfen (1 = egal; ValueError, wenn
+    unmöglich). None: bis Runde 2 trennen, soweit es die Gruppen hergeben (z. B. nicht bei nur einer Gruppe).
+    """
+    if seeding not in SEEDINGS:
+        raise ValueError(f"Unbekanntes Setzverfahren: {seeding}")
+    slots = SEEDINGS[seeding][1](groups, ranking, total)
+    if same_group_from is None:
+        return separate_groups(slots, ranking, 2, strict=False)
+    return separate_groups(slots, ranking, same_group_from)
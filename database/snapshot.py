@@ -0,0 +1,97 @@
+# database/snapshot.py
+# Unveränderlicher Stand eines Turniers für Exporte: Stammdaten, Teilnehmer, Gruppen, Spiele,
+# Tabellen und KO-Plan aus EINER Lesetransaktion. Renderer arbeiten nur noch auf diesem Objekt
+# und öffnen selbst keine Verbindung. Nur sqlite3 – benutzt von models.py.
+from __future__ import annotations
+import sqlite3
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .rangliste import BRONZE_ROUND
+from .tabellen import GruppenTabelle, compute_tables
+
+GruppenSpiel = Tuple[int, int, int, str, str, Optional[int], Optional[int]]  # wie fetch_group_matches
+KoZeile = Tuple[int, int, str, str, Optional[int], Optional[int]]            # wie fetch_ko_matches
+
+
+@dataclass(frozen=True)
+class TurnierSnapshot:
+    id: int
+    name: str
+    datum: str
+    teilnehmer: Tuple[Tuple[int, str], ...]            # nach Anzeigename
+    gruppen: Tuple[Tuple[int, str], ...]               # nach Gruppenname
+    spiele: Mapping[int, Tuple[GruppenSpiel, ...]]     # gruppe_id -> Spiele (Runde, Match)
+    tabellen: Mapping[int, GruppenTabelle]             # gruppe_id -> Tabelle (Ranglisten-Modus des Turniers)
+    ko: Tuple[Tuple[int, Tuple[KoZeile, ...]], ...]    # (runde, Spiele) aufsteigend, Bronze zuletzt
+    champion: Optional[Tuple[int, str]]                # nur aus dem Finale
+    dritter: Optional[str]                             # Sieger des Bronze-Spiels
+
+    def gruppen_spiele(self, gruppe_id: int) -> Tuple[GruppenSpiel, ...]:
+        return self.spiele.get(gruppe_id, ())
+
+    def ko_runde(self, runde: int) -> Tuple[KoZeile, ...]:
+        return next((ms for r, ms in self.ko if r == runde), ())
+
+
+def load_snapshot(con: sqlite3.Connection, turnier_id: int, names: Dict[int, str], round_col: Optional[str],
+                  s1_col: str = "s1", s2_col: str = "s2",
+                  tabellen: Optional[Mapping[int, GruppenTabelle]] = None) -> TurnierSnapshot:
+    """Liest alles auf con (der Aufrufer hält die Lesetransaktion offen); tabellen=None -> hier berechnen."""
+    t = con.execute("SELECT name, COALESCE(datum,'') FROM turniere WHERE id=?", (turnier_id,)).fetchone()
+    name, datum = (str(t[0] or ""), str(t[1] or "")) if t else (f"Turnier-{turnier_id}", "")
+
+    pids = [int(r[0]) for r in con.execute(
+        "SELECT teilnehmer_id FROM turnier_teilnehmer WHERE turnier_id=?", (turnier_id,)
+    ).fetchall()]
+    teilnehmer = tuple((pid, names[pid]) for pid in sorted(
+        (p for p in pids if p in names), key=lambda p: (names[p] or "").lower()
+    ))
+
+    gruppen = tuple((int(r[0]), str(r[1])) for r in con.execute(
+        "SELECT id,name FROM gruppen WHERE turnier_id=? ORDER BY name ASC", (turnier_id,)
+    ).fetchall())
+
+    runde = f"COALESCE({round_col},1)" if round_col else "1"
+    spiele: Dict[int, List[GruppenSpiel]] = {}
+    for r in con.execute(
+        f"SELECT gruppe_id, id, {runde} AS runde, COALESCE(match_no,1) AS match_no, p1_id, p2_id, {s1_col}, {s2_col} "
+        f"FROM spiele WHERE turnier_id=? ORDER BY gruppe_id, runde ASC, match_no ASC, id",
+        (turnier_id,),
+    ).fetchall():
+        spiele.setdefault(int(r[0]), []).append(
+            (int(r[1]), int(r[2]), int(r[3]), names.get(r[4], ""), names.get(r[5], ""), r[6], r[7])
+        )
+
+    if tabellen is None:
+        tabellen = compute_tables(con, turnier_id, names, s1_col, s2_col)
+
+    ko_rows = [r for r in con.execute(
+        "SELECT runde, id, match_no, p1_id, p2_id, s1, s2 FROM ko_spiele WHERE turnier_id=? ORDER BY runde, match_no, id",
+        (turnier_id,),
+    ).fetchall() if r[0] is not None]
+    ko: Dict[int, List[KoZeile]] = {}
+    for r in ko_rows:
+        ko.setdefault(int(r[0]), []).append((int(r[1]), int(r[2]), names.get(r[3], ""), names.get(r[4], ""), r[5], r[6]))
+    order = sorted(r for r in ko if r != BRONZE_ROUND) + ([BRONZE_ROUND] if BRONZE_ROUND in ko else [])
+
+    champion: Optional[Tuple[int, str]] = None
+    final_round = max((int(r[0]) for r in ko_rows if int(r[0]) != BRONZE_ROUND), default=None)
+    fin = next((r for r in ko_rows if final_round is not None and int(r[0]) == final_round), None)
+    if fin is not None and fin[5] is not None and fin[6] is not None and fin[5] != fin[6]:
+        winner = int(fin[3]) if int(fin[5]) > int(fin[6]) else int(fin[4])
+        champion = (winner, names.get(winner, ""))
+
+    dritter: Optional[str] = None
+    bron = ko.get(BRONZE_ROUND)
+    if bron and bron[0][4] is not None and bron[0][5] is not None and bron[0][4] != bron[0][5]:
+        dritter = bron[0][2] if int(bron[0][4]) > int(bron[0][5]) else bron[0][3]
+
+    return TurnierSnapshot(
+        id=int(turnier_id), name=name, datum=datum, teilnehmer=teilnehmer, gruppen=gruppen,
+        spiele=MappingProxyType({gid: tuple(ms) for gid, ms in spiele.items()}),
+        tabellen=MappingProxyType(dict(tabellen)),
+        ko=tuple((r, tuple(ko[r])) for r in order),
+        champion=champion, dritter=dritter,
+    )
@@ -0,0 +1,273 @@
+# database/tabellen.py
+# Gruppentabellen: alle Gruppen eines Turniers aus EINEM Durchlauf über 'spiele'.
+# Wertung je turniere.group_rank_mode (punkte/differenz/siege), Sieg = 3 Punkte,
+# Gleichstände werden über die Direktbegegnungen (Subtabelle) aufgelöst.
+# TabellenCache hält berechnete Gruppen (LRU) und wird von save_match_result inkrementell fortgeschrieben.
+from __future__ import annotations
+import bisect, sqlite3, threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+RANK_MODES = ("punkte", "differenz", "siege")
+PUNKTE_SIEG = 3
+
+# Indizes der Statistik-Arrays
+_SP, _S, _N, _LF, _LA, _PKT = range(6)
+
+Ergebnis = Tuple[int, int, int, int]  # (p1, p2, s1, s2)
+
+
+class TabellenZeile(NamedTuple):
+    pid: int
+    spieler: str
+    spiele: int
+    siege: int
+    niederlagen: int
+    lf: int
+    la: int
+    diff: int
+    pkt: int
+    rang: int  # Spieler einer Stichmatch-Gruppe teilen sich den Rang
+
+
+class GruppenTabelle(NamedTuple):
+    gruppe_id: int
+    zeilen: Tuple[TabellenZeile, ...]
+    stichmatch: Tuple[Tuple[int, ...], ...]  # weiterhin voll gleichauf -> Stichmatch nötig
+
+
+def rank_mode(con: sqlite3.Connection, turnier_id: int) -> str:
+    row = con.execute("SELECT group_rank_mode FROM turniere WHERE id=?", (turnier_id,)).fetchone()
+    mode = (row[0] if row else None) or "punkte"
+    return mode if mode in RANK_MODES else "punkte"
+
+
+def _tally(stats: Dict[int, List[int]], p1: int, p2: int, s1: int, s2: int, sign: int = 1) -> None:
+    a = stats[p1]; b = stats[p2]
+    a[_SP] += sign; b[_SP] += sign
+    a[_LF] += sign * s1; a[_LA] += sign * s2
+    b[_LF] += sign * s2; b[_LA] += sign * s1
+    if s1 > s2:
+        a[_S] += sign; b[_N] += sign; a[_PKT] += sign * PUNKTE_SIEG
+    elif s2 > s1:
+        b[_S] += sign; a[_N] += sign; b[_PKT] += sign * PUNKTE_SIEG
+
+
+class _Gruppe:
+    """Statistik einer Gruppe + je Wertungsmodus die sortierte Reihenfolge.
+
+    Nach einem geänderten Ergebnis werden nur die beiden Spieler neu einsortiert und nur
+    die Gleichstands-Blöcke neu aufgelöst, in denen einer von beiden steht.
+    """
+
+    def __init__(self, gid: int, pids: Iterable[int], results: Dict[int, Ergebnis], names: Dict[int, str]):
+        self.gid = gid
+        self.names = names
+        self.stats: Dict[int, List[int]] = {pid: [0] * 6 for pid in pids}
+        self.results = results  # match_id -> Ergebnis (nur entschiedene/eingetragene)
+        for p1, p2, s1, s2 in results.values():
+            _tally(self.stats, p1, p2, s1, s2)
+        # mode -> (pids sortiert, zugehörige Sortierschlüssel, aufgelöste Blöcke)
+        self._orders: Dict[str, Tuple[List[int], List[Tuple], Dict[Tuple[int, ...], Tuple[List[int], bool]]]] = {}
+
+    # -- Sortierschlüssel ------------------------------------------------
+    def _diff(self, pid: int) -> int:
+        return self.stats[pid][_LF] - self.stats[pid][_LA]
+
+    def _sort_key(self, pid: int, mode: str) -> Tuple:
+        # pid zuletzt: Schlüssel eindeutig (für das Neu-Einsortieren per bisect)
+        s = self.stats[pid]; d = self._diff(pid); n = self.names[pid]
+        if mode == "punkte":
+            return (-s[_PKT], -d, -s[_S], -s[_LF], s[_LA], n, pid)
+        elif mode == "differenz":
+            return (-d, -s[_PKT], -s[_S], -s[_LF], s[_LA], n, pid)
+        return (-s[_S], -s[_PKT], -d, -s[_LF], s[_LA], n, pid)
+
+    def _primary(self, pid: int, mode: str) -> Tuple:
+        s = self.stats[pid]
+        if mode == "punkte":
+            return (s[_PKT], self._diff(pid))
+        elif mode == "differenz":
+            return (self._diff(pid),)
+        return (s[_S], s[_PKT], self._diff(pid))
+
+    def _full(self, pid: int, mode: str) -> Tuple:
+        s = self.stats[pid]
+        if mode == "punkte":
+            return (s[_PKT], self._diff(pid), s[_S])
+        elif mode == "differenz":
+            return (self._diff(pid), s[_PKT], s[_S])
+        return (s[_S], s[_PKT], self._diff(pid))
+
+    def _resolve_ties(self, group: List[int], mode: str) -> List[int]:
+        """Ordnet gleichauf liegende Spieler nach der Subtabelle ihrer Direktbegegnungen."""
+        sub = {pid: [0] * 6 for pid in group}
+        for p1, p2, s1, s2 in self.results.values():
+            if p1 in sub and p2 in sub:
+                _tally(sub, p1, p2, s1, s2)
+
+        def key(pid: int) -> Tuple:
+            s = sub[pid]; diff = s[_LF] - s[_LA]
+            if mode == "punkte":
+                return (-s[_PKT], -diff, self.names[pid])  # Punkte -> Diff -> Direktbegegnung steckt in Subtabelle
+            elif mode == "differenz":
+                return (-diff, self.names[pid])
+            return (-s[_S], -s[_PKT], -diff, self.names[pid])  # Siege -> Punkte -> Diff
+
+        return sorted(group, key=key)
+
+    # -- Tabelle -----------------------------------------------------------
+    def _order(self, mode: str):
+        order = self._orders.get(mode)
+        if order is None:
+            pids = sorted(self.stats, key=lambda pid: self._sort_key(pid, mode))
+            order = (pids, [self._sort_key(pid, mode) for pid in pids], {})
+            self._orders[mode] = order
+        return order
+
+    def table(self, mode: str) -> GruppenTabelle:
+        pids, _keys, resolved = self._order(mode)
+        ordered: List[int] = []
+        rang: Dict[int, int] = {}
+        ties: List[Tuple[int, ...]] = []
+        i = 0; n = len(pids)
+        while i < n:
+            j = i + 1
+            base = self._primary(pids[i], mode)
+            while j < n and self._primary(pids[j], mode) == base:
+                j += 1
+            block = tuple(pids[i:j])
+            if len(block) == 1:
+                ordered.append(block[0]); rang[block[0]] = i + 1
+            else:
+                hit = resolved.get(block)
+                if hit is None:
+                    res = self._resolve_ties(list(block), mode)
+                    hit = (res, all(self._full(x, mode) == self._full(res[0], mode) for x in res))
+                    resolved[block] = hit
+                res, tie = hit
+                ordered.extend(res)
+                for k, pid in enumerate(res):
+                    rang[pid] = i + 1 if tie else i + 1 + k
+                if tie:
+                    ties.append(tuple(res))
+            i = j
+        zeilen = tuple(
+            TabellenZeile(pid, self.names[pid], *(self.stats[pid][_SP:_LA + 1]), self._diff(pid),
+                          self.stats[pid][_PKT], rang[pid])
+            for pid in ordered
+        )
+        return GruppenTabelle(self.gid, zeilen, tuple(ties))
+
+    # -- Inkrementelle Änderung -------------------------------------------
+    def apply(self, match_id: int, new: Optional[Ergebnis]) -> bool:
+        """Ergebnis eines Spiels ersetzen (None = gelöscht). False -> Gruppe neu laden."""
+        old = self.results.get(match_id)
+        touched = {p for r in (old, new) if r for p in r[:2]}
+        if any(p not in self.stats for p in touched):
+            return False
+        keys_before = {mode: {p: self._sort_key(p, mode) for p in touched} for mode in self._orders}
+        if old:
+            _tally(self.stats, *old, sign=-1)
+            del self.results[match_id]
+        if new:
+            _tally(self.stats, *new)
+            self.results[match_id] = new
+        for mode, (pids, keys, resolved) in self._orders.items():
+            for p in touched:  # nur die betroffenen Spieler neu einsortieren
+                idx = bisect.bisect_left(keys, keys_before[mode][p])
+                del pids[idx]; del keys[idx]
+                k = self._sort_key(p, mode)
+                idx = bisect.bisect_left(keys, k)
+                pids.insert(idx, p); keys.insert(idx, k)
+            for block in [b for b in resolved if touched.intersection(b)]:
+                del resolved[block]
+        return True
+
+
+def _load(con: sqlite3.Connection, turnier_id: int, names: Dict[int, str], s1_col: str, s2_col: str) -> Dict[int, _Gruppe]:
+    """Spieler = Gruppenmitglieder plus alle (noch existierenden) Spieler aus den Gruppenspielen."""
+    players: Dict[int, Dict[int, None]] = {}
+    for gid, pid in con.execute(
+        "SELECT g.id, gt.teilnehmer_id FROM gruppen g LEFT JOIN gruppen_teilnehmer gt ON gt.gruppe_id=g.id "
+        "WHERE g.turnier_id=?",
+        (turnier_id,),
+    ).fetchall():
+        members = players.setdefault(int(gid), {})
+        if pid is not None and int(pid) in names:
+            members[int(pid)] = None
+
+    results: Dict[int, Dict[int, Ergebnis]] = {}
+    for mid, gid, p1, p2, s1, s2 in con.execute(
+        f"SELECT id, gruppe_id, p1_id, p2_id, {s1_col}, {s2_col} FROM spiele "
+        f"WHERE turnier_id=? AND {s1_col} IS NOT NULL AND {s2_col} IS NOT NULL",
+        (turnier_id,),
+    ).fetchall():
+        if gid is None or p1 is None or p2 is None or int(p1) not in names or int(p2) not in names:
+            continue
+        members = players.setdefault(int(gid), {})
+        members[int(p1)] = None; members[int(p2)] = None
+        results.setdefault(int(gid), {})[int(mid)] = (int(p1), int(p2), int(s1), int(s2))
+
+    return {gid: _Gruppe(gid, members, results.get(gid, {}), names) for gid, members in players.items()}
+
+
+def compute_tables(con: sqlite3.Connection, turnier_id: int, names: Dict[int, str],
+                   s1_col: str = "s1", s2_col: str = "s2", mode: Optional[str] = None) -> Dict[int, GruppenTabelle]:
+    """Tabellen aller Gruppen eines Turniers (gruppe_id -> GruppenTabelle), ohne Cache."""
+    mode = mode if mode in RANK_MODES else rank_mode(con, turnier_id)
+    return {gid: g.table(mode) for gid, g in _load(con, turnier_id, names, s1_col, s2_col).items()}
+
+
+class TabellenCache:
+    """LRU-Cache berechneter Gruppen, Schlüssel (db, turnier_id, gruppe_id)."""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._lock = threading.RLock()
+        self._groups: "OrderedDict[Tuple[str, int, int], _Gruppe]" = OrderedDict()
+        self._complete: Dict[Tuple[str, int], bool] = {}  # alle Gruppen des Turniers geladen?
+
+    def _put(self, key: Tuple[str, int, int], grp: _Gruppe) -> None:
+        self._groups[key] = grp
+        self._groups.move_to_end(key)
+        while len(self._groups) > self.maxsize:
+            (db, tid, _gid), _ = self._groups.popitem(last=False)
+            self._complete.pop((db, tid), None)
+
+    def tables(self, con: sqlite3.Connection, db: str, turnier_id: int, names: Dict[int, str],
+               s1_col: str, s2_col: str, mode: Optional[str] = None) -> Dict[int, GruppenTabelle]:
+        mode = mode if mode in RANK_MODES else rank_mode(con, turnier_id)
+        with self._lock:
+            keys = [k for k in self._groups if k[0] == db and k[1] == turnier_id]
+            if (self._complete.get((db, turnier_id))
+                    and all(self._groups[k].names is names for k in keys)):
+                groups = {}
+                for k in keys:
+                    self._groups.move_to_end(k)
+                    groups[k[2]] = self._groups[k]
+            else:
+                for k in keys:
+                    del self._groups[k]
+                groups = _load(con, turnier_id, names, s1_col, s2_col)
+                for gid, grp in groups.items():
+                    self._put((db, turnier_id, gid), grp)
+                self._complete[(db, turnier_id)] = all((db, turnier_id, gid) in self._groups for gid in groups)
+            return {gid: grp.table(mode) for gid, grp in groups.items()}
+
+    def apply_result(self, db: str, turnier_id: int, gruppe_id: int, match_id: int, new: Optional[Ergebnis]) -> None:
+        """Geändertes Ergebnis einspielen (nur falls die Gruppe im Cache liegt)."""
+        with self._lock:
+            grp = self._groups.get((db, turnier_id, gruppe_id))
+            if grp is not None and not grp.apply(match_id, new):
+                self.invalidate(db, turnier_id)
+
+    def invalidate(self, db: Optional[str] = None, turnier_id: Optional[int] = None) -> None:
+        """Verwirft Einträge: alle (db=None), einer DB-Datei oder eines Turniers."""
+        with self._lock:
+            for k in [k for k in self._groups
+                      if (db is None or k[0] == db) and (turnier_id is None or k[1] == turnier_id)]:
+                del self._groups[k]
+            for k in [k for k in self._complete
+                      if (db is None or k[0] == db) and (turnier_id is None or k[1] == turnier_id)]:
+                del self._complete[k]
@@ -0,0 +1,78 @@
+# tests/conftest.py
+# Gemeinsame Fixtures: jede Testfunktion bekommt eine eigene, frisch migrierte DB.
+from __future__ import annotations
+
+import os
+import sys
+from typing import List, Optional
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """database.models, umgestellt auf eine leere DB in tmp_path."""
+    import database.models as m
+    from database.connection import close_all
+
+    old = m.DB_PATH
+    m.DB_PATH = str(tmp_path / "ibu.sqlite")
+    m._init_db()
+    try:
+        yield m
+    finally:
+        close_all()
+        m.DB_PATH = old
+
+
+def fill_turnier(m, groups: int = 4, per_group: int = 4, qualifiers: int = 8,
+                 ids: Optional[List[int]] = None, datum: str = "2026-01-01") -> int:
+    """Turnier mit Gruppen, vollständig gespielter Gruppenphase und KO-Plan; liefert die Turnier-ID.
+
+    ids: vorhandene Teilnehmer (gemischt auf die Gruppen verteilt), sonst werden neue angelegt.
+    """
+    tid = m.insert_turnier("Test", datum, "Gruppen+KO")
+    if ids is None:
+        ids = [m.insert_teilnehmer(f"Spieler {i:03d}") for i in range(groups * per_group)]
+    m.set_turnier_teilnehmer(tid, ids)
+    m.save_grouping(tid, [(chr(65 + g), ids[g * per_group:(g + 1) * per_group]) for g in range(groups)])
+    m.generate_group_round_robin(tid)
+    rows = []
+    for gid, _name in m.fetch_groups(tid):
+        for k, match in enumerate(m.fetch_group_matches(tid, gid)):
+            rows.append((match[0], 2 + k % 2, k % 2))
+    m.save_results_batch(rows)
+    m.generate_ko_bracket_total(tid, qualifiers)
+    return tid
+
+
+def play_ko(m, turnier_id: int) -> None:
+    """Spielt alle offenen KO-Spiele Runde für Runde aus (p1 gewinnt; Bronze entsteht beim Speichern)."""
+    while True:
+        offen = [
+            (mid, 3, 1)
+            for runde in m.fetch_ko_rounds(turnier_id)
+            for mid, _no, n1, n2, s1, s2 in m.fetch_ko_matches(turnier_id, runde)
+            if n1 and n2 and s1 is None and s2 is None
+        ]
+        if not offen:
+            return
+        m.save_ko_results(offen)
+
+
+def fill_meisterschaft(m, turniere: int = 3) -> int:
+    """Meisterschaft mit Punkteschema und mehreren fertig gespielten Turnieren; liefert die ID."""
+    ms_id = m.insert_meisterschaft("Liga", "2026")
+    m.standard_punkteschema_basic(ms_id)
+    ids = [m.insert_teilnehmer(f"Spieler {i:03d}") for i in range(16)]
+    tids = []
+    for t in range(turniere):
+        tid = fill_turnier(m, ids=ids[t:] + ids[:t], datum=f"2026-0{t + 1}-01")
+        play_ko(m, tid)
+        tids.append(tid)
+    m.set_meisterschaft_turniere(ms_id, tids)
+    return ms_id
@@ -0,0 +1,31 @@
+# tests/test_export_batch.py
+# Sammel-Export: Worker-Threads greifen nicht auf die DB zu (keine zusätzlichen Verbindungen).
+from __future__ import annotations
+
+import os
+
+from conftest import fill_meisterschaft
+from database import connection
+from utils import exporter
+
+
+def test_meisterschaft_alles_opens_no_worker_connections(db, tmp_path):
+    ms_id = fill_meisterschaft(db)
+    offen = len(connection._open_connections)
+    for lauf in range(3):  # je Klick ein neuer Pool
+        res = exporter.export_meisterschaft_alles(ms_id, ("csv", "pdf"), str(tmp_path / str(lauf)), workers=4,
+                                                  backend="intern")
+        assert not [e for e in res if e.fehler], exporter.format_report(res)
+        assert len(connection._open_connections) == offen
+    dateien = os.listdir(tmp_path / "0")
+    # Rangliste csv+pdf, Saison-Spiele csv, je Turnier 5 Artefakte × 2 Formate
+    assert len(dateien) == 3 + 3 * 5 * 2
+
+
+def test_turnier_alles_opens_no_worker_connections(db, tmp_path):
+    ms_id = fill_meisterschaft(db, turniere=1)
+    tid = db.fetch_meisterschaft_turnier_ids(ms_id)[0]
+    offen = len(connection._open_connections)
+    res = exporter.export_turnier_alles(tid, ("csv", "pdf"), None, str(tmp_path), workers=4, backend="intern")
+    assert not [e for e in res if e.fehler], exporter.format_report(res)
+    assert len(connection._open_connections) == offen
@@ -0,0 +1,143 @@
+# tests/test_ko_seeding.py
+# Eigenschaften des KO-Plans für 2..256 Qualifikanten und verschiedene Gruppenzahlen.
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import pytest
+
+from conftest import fill_turnier
+from database import seeding
+from database.bracket import bracket_size, plan_rows, seed_order
+from database.rangliste import BRONZE_ROUND
+
+MAX_Q = 256
+
+
+class _ZaehlVerbindung:
+    """Reicht alles an die echte Verbindung durch und merkt sich execute/executemany."""
+
+    def __init__(self, con):
+        self._con = con
+        self.executemany_sql: List[str] = []
+        self.execute_sql: List[str] = []
+
+    def execute(self, sql, *args):
+        self.execute_sql.append(sql)
+        return self._con.execute(sql, *args)
+
+    def executemany(self, sql, rows):
+        self.executemany_sql.append(sql)
+        return self._con.executemany(sql, rows)
+
+    def __enter__(self):
+        self._con.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._con.__exit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._con, name)
+
+
+def _turnier(m, groups: int, per_group: int):
+    tid = fill_turnier(m, groups=groups, per_group=per_group, qualifiers=2)
+    gruppe = {pid: g for g, mem in m.fetch_grouping(tid).items() for pid, _n, _s in mem}
+    con = m._connect()
+    with con:
+        groups_, ranking = m._ko_snapshot(con, tid)
+    return tid, gruppe, groups_, ranking
+
+
+# Startaufstellung vor der Gruppentrennung – daraus ergeben sich die Topgesetzten mit Freilos
+_UNGETRENNT = {
+    "auto": seeding.standard,
+    "standard": seeding.standard,
+    "schlange": lambda groups, ranking, q: seeding._place(seeding._levels(groups, ranking, q, seeding._schlange_order), q),
+}
+
+
+def _check_plan(rows: Sequence[Tuple[int, int, int, int]], q: int, gruppe: Dict[int, str], groups, ranking,
+                verfahren: str = "auto") -> None:
+    """Prüft einen Plan (runde, match_no, p1, p2) für q Qualifikanten."""
+    plan: Dict[int, List[Tuple[int, int, int]]] = {}
+    for r, no, p1, p2 in rows:
+        plan.setdefault(r, []).append((no, p1, p2))
+    size = bracket_size(q)
+    runden = sorted(r for r in plan if r != BRONZE_ROUND)
+
+    # Größe: 2^k Plätze, k Runden, Runde r (r>1) mit size/2^r Spielen, Runde 1 nur echte Spiele
+    assert size >= q > size // 2 or q == size == 2
+    assert runden == list(range(1, size.bit_length())), q
+    assert len(plan[1]) == q - size // 2, q
+    for r in runden[1:]:
+        assert len(plan[r]) == size >> r, (q, r)
+
+    # jeder Qualifikant genau einmal: in Runde 1 oder (Freilos) direkt in Runde 2
+    r1 = [p for _no, p1, p2 in plan[1] for p in (p1, p2)]
+    freilos = [p for _no, p1, p2 in plan.get(2, []) for p in (p1, p2) if p is not None]
+    assert None not in r1, q
+    assert len(r1) + len(freilos) == q == len(set(r1) | set(freilos)), q
+    assert not [p for r in runden[2:] for _no, p1, p2 in plan[r] for p in (p1, p2) if p is not None], q
+
+    # Freilose nur für die Topgesetzten (Setzplätze 1..size-q) – genau diese stehen in Runde 2
+    ungetrennt = _UNGETRENNT[verfahren](groups, ranking, q) if size != q else []
+    order = seed_order(size)
+    top = {pid for pos, pid in enumerate(ungetrennt) if order[pos] <= size - q}
+    assert set(freilos) == top, q
+
+    # Gruppentrennung in Runde 1, wann immer es eine Paarung ohne Gruppenduell gibt
+    # (2k Spieler lassen sich genau dann trennen, wenn keine Gruppe mehr als k stellt)
+    k = len(plan[1])
+    if k and max(Counter(gruppe[p] for p in r1).values()) <= k:
+        duelle = [(gruppe[p1], gruppe[p2]) for _no, p1, p2 in plan[1] if gruppe[p1] == gruppe[p2]]
+        assert not duelle, (q, duelle)
+
+
+@pytest.mark.parametrize("n_groups", [1, 2, 3, 4, 5, 6, 7, 8])
+@pytest.mark.parametrize("verfahren", sorted(_UNGETRENNT))
+def test_plan_properties(db, n_groups, verfahren):
+    tid, gruppe, groups, ranking = _turnier(db, n_groups, math.ceil(MAX_Q / n_groups))
+    for q in range(2, MAX_Q + 1):
+        _check_plan(plan_rows(seeding.build_slots(groups, ranking, q, verfahren)), q, gruppe, groups, ranking, verfahren)
+
+
+def test_single_group_every_total(db):
+    """Eine Gruppe: Trennung unmöglich – jedes Verfahren außer 'klassisch' liefert trotzdem einen Plan."""
+    _tid, _gruppe, groups, ranking = _turnier(db, 1, 16)
+    for verfahren in seeding.SEEDINGS:
+        if verfahren == "klassisch":
+            continue
+        for q in range(2, 17):
+            assert len(seeding.build_slots(groups, ranking, q, verfahren)) == bracket_size(q)
+    with pytest.raises(ValueError):
+        seeding.build_slots(groups, ranking, 6, "schlange", same_group_from=2)  # ausdrücklich verlangt: Fehler
+
+
+def test_three_groups_six_qualifiers_no_round1_duel(db):
+    tid, gruppe, _groups, _ranking = _turnier(db, 3, 4)
+    db.generate_ko_bracket_total(tid, 6)
+    r1 = db.fetch_ko_matches(tid, 1)
+    ids = db._connect().execute("SELECT p1_id, p2_id FROM ko_spiele WHERE turnier_id=? AND runde=1", (tid,)).fetchall()
+    assert len(r1) == 2
+    assert all(gruppe[a] != gruppe[b] for a, b in ids)
+
+
+def test_generate_ko_bracket_total_one_executemany(db, monkeypatch):
+    tid, gruppe, groups, ranking = _turnier(db, 16, MAX_Q // 16)
+    con = db._connect()
+    for q in range(2, MAX_Q + 1):
+        zaehler = _ZaehlVerbindung(con)
+        monkeypatch.setattr(db, "_connect", lambda: zaehler)
+        db.generate_ko_bracket_total(tid, q)
+        monkeypatch.undo()
+
+        assert len([s for s in zaehler.executemany_sql if "INSERT INTO ko_spiele" in s]) == 1, q
+        assert not [s for s in zaehler.execute_sql if "INSERT INTO ko_spiele" in s], q
+        rows = con.execute(
+            "SELECT runde, match_no, p1_id, p2_id FROM ko_spiele WHERE turnier_id=? ORDER BY runde, match_no", (tid,)
+        ).fetchall()
+        _check_plan([tuple(r) for r in rows], q, gruppe, groups, ranking)
@@ -0,0 +1,57 @@
+# tests/test_query_plan.py
+# Heiße Abfragen müssen auf einer frisch migrierten DB über Indizes laufen (kein SCAN).
+from __future__ import annotations
+
+import re
+from typing import Callable, List
+
+import pytest
+
+from conftest import fill_turnier
+
+_TABELLEN = re.compile(r"\b(ko_spiele|spiele)\b", re.I)
+
+
+def _traced(m, fn: Callable[[], object]) -> List[str]:
+    """Alle SELECT/UPDATE auf spiele/ko_spiele, die fn auf der Thread-Verbindung ausführt."""
+    con = m._connect()
+    sqls: List[str] = []
+    con.set_trace_callback(sqls.append)
+    try:
+        fn()
+    finally:
+        con.set_trace_callback(None)
+    return [s for s in sqls if s.lstrip().upper().startswith(("SELECT", "UPDATE")) and _TABELLEN.search(s)]
+
+
+def _plan(m, sql: str) -> List[str]:
+    return [str(r["detail"]) for r in m._connect().execute("EXPLAIN QUERY PLAN " + sql).fetchall()]
+
+
+def _erste_ko_runde(m, tid: int):
+    runde = m.fetch_ko_rounds(tid)[0]
+    return [(mid, 3, 1) for mid, _no, _p1, _p2, _s1, _s2 in m.fetch_ko_matches(tid, runde)[:1]]
+
+
+HOT = {
+    "fetch_group_matches": lambda m, tid: m.fetch_group_matches(tid, m.fetch_groups(tid)[0][0]),
+    "fetch_ko_matches": lambda m, tid: m.fetch_ko_matches(tid, 1),
+    "max_runde": lambda m, tid: m.fetch_ko_champion(tid),
+    "next_slot_update": lambda m, tid: m.save_ko_results(_erste_ko_runde(m, tid)),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT))
+def test_hot_queries_use_index(db, name):
+    tid = fill_turnier(db)
+    sqls = _traced(db, lambda: HOT[name](db, tid))
+    assert sqls, f"{name}: keine Abfrage auf spiele/ko_spiele aufgezeichnet"
+    for sql in sqls:
+        plan = _plan(db, sql)
+        assert not [d for d in plan if d.startswith("SCAN")], f"{name}: {sql}\n" + "\n".join(plan)
+
+
+def test_next_slot_update_is_traced(db):
+    tid = fill_turnier(db)
+    sqls = _traced(db, lambda: HOT["next_slot_update"](db, tid))
+    assert any(s.upper().startswith("UPDATE KO_SPIELE") for s in sqls)
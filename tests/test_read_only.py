@@ -0,0 +1,62 @@
+# tests/test_read_only.py
+# Lese- und Exportpfade dürfen nichts schreiben: con.total_changes bleibt unverändert.
+from __future__ import annotations
+
+import pytest
+
+from conftest import fill_meisterschaft, fill_turnier
+from utils import exporter
+
+
+@pytest.fixture
+def saison(db):
+    ms_id = fill_meisterschaft(db)
+    offen = fill_turnier(db)  # KO-Plan ohne Ergebnisse (kein Bronze, kein Sieger)
+    return ms_id, db.fetch_meisterschaft_turnier_ids(ms_id) + [offen]
+
+
+def _lesen(m, ms_id, tids):
+    m.fetch_turniere()
+    m.fetch_teilnehmer()
+    m.fetch_meisterschaften()
+    m.compute_meisterschaft_rangliste(ms_id)
+    m.check_meisterschaft_rangliste(ms_id)
+    m.fetch_punkteschema(ms_id)
+    list(m.iter_meisterschaft_spiele(ms_id))
+    for tid in tids:
+        m.fetch_turnier_teilnehmer(tid)
+        m.fetch_grouping(tid)
+        m.has_recorded_group_results(tid)
+        m.has_recorded_ko_results(tid)
+        for gid, _name in m.fetch_groups(tid):
+            m.fetch_group_matches(tid, gid)
+            m.compute_group_table(tid, gid)
+        m.compute_group_tables(tid)
+        for runde in m.fetch_ko_rounds(tid):
+            m.fetch_ko_matches(tid, runde)
+        m.fetch_ko_champion(tid)
+        m.fetch_turnier_snapshot(tid)
+
+
+def test_read_paths_do_not_write(saison):
+    import database.models as m
+    ms_id, tids = saison
+    con = m._connect()
+    before = con.total_changes
+    for _ in range(2):
+        _lesen(m, ms_id, tids)
+    assert con.total_changes == before
+    assert not con.in_transaction
+
+
+def test_export_paths_do_not_write(saison, tmp_path):
+    import database.models as m
+    ms_id, tids = saison
+    con = m._connect()
+    before = con.total_changes
+    # workers=0: alles auf diesem Thread, also auf dieser Verbindung
+    res = exporter.export_meisterschaft_alles(ms_id, ("csv", "pdf"), str(tmp_path / "ms"), workers=0, backend="intern")
+    res += exporter.export_turnier_alles(tids[-1], ("csv", "pdf"), None, str(tmp_path / "t"), workers=0, backend="intern")
+    assert not [e for e in res if e.fehler], exporter.format_report(res)
+    assert con.total_changes == before
+    assert not con.in_transaction
@@ -0,0 +1,37 @@
+# tests/test_season_stream.py
+# iter_meisterschaft_spiele liest aus einer eigenen Lesetransaktion: Schreibzugriffe desselben
+# Threads während des Streams sind sofort committet und ändern den gestreamten Stand nicht.
+from __future__ import annotations
+
+from conftest import fill_meisterschaft
+from database import connection
+
+
+def test_stream_snapshot_survives_same_thread_writes(db):
+    ms_id = fill_meisterschaft(db, turniere=2)
+    vorher = list(db.iter_meisterschaft_spiele(ms_id))
+    letztes = db.fetch_meisterschaft_turnier_ids(ms_id)[-1]
+    con = db._connect()
+    ids = [int(r[0]) for r in con.execute("SELECT id FROM spiele WHERE turnier_id=?", (letztes,))]
+
+    stream = db.iter_meisterschaft_spiele(ms_id, batch=3)
+    gelesen = [next(stream)]
+    db.save_results_batch([(mid, 0, 3) for mid in ids])  # schreibt & committet auf der Thread-Verbindung
+    assert not con.in_transaction
+    gelesen.extend(stream)
+
+    assert gelesen == vorher  # Stand vom Beginn des Streams
+    nachher = list(db.iter_meisterschaft_spiele(ms_id))
+    assert nachher != vorher
+    assert sum(1 for z in nachher if not z[2] and (z[9], z[10]) == (0, 3)) >= len(ids)
+
+
+def test_stream_uses_own_connection(db):
+    ms_id = fill_meisterschaft(db, turniere=1)
+    con = db._connect()
+    offen = len(connection._open_connections)
+    stream = db.iter_meisterschaft_spiele(ms_id)
+    next(stream)
+    assert not con.in_transaction  # die Thread-Verbindung bleibt frei
+    stream.close()
+    assert len(connection._open_connections) == offen
@@ -0,0 +1,18 @@
+# tests/test_snapshot.py
+# Export-Snapshot: Reihenfolgen wie im alten Exporter.
+from __future__ import annotations
+
+import csv
+
+from utils import exporter
+
+
+def test_teilnehmer_sorted_case_insensitive(db, tmp_path):
+    tid = db.insert_turnier("Test", "2026-01-01", "Gruppen+KO")
+    ids = [db.insert_teilnehmer(n) for n in ("Bert", "anna", "Carla", "bob")]
+    db.set_turnier_teilnehmer(tid, ids)
+    pfad = exporter.export_turnier_teilnehmer_csv(tid, str(tmp_path / "teilnehmer.csv"))
+    with open(pfad, encoding="utf-8-sig", newline="") as fh:
+        zeilen = list(csv.reader(fh, delimiter=";"))[1:]
+    assert [z[2] for z in zeilen] == ["anna", "Bert", "bob", "Carla"]
+    assert [z[0] for z in zeilen] == ["1", "2", "3", "4"]
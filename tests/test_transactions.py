@@ -0,0 +1,90 @@
+# tests/test_transactions.py
+# Schreibfunktionen, die selbst BEGIN IMMEDIATE setzen, dürfen eine offene Transaktion des
+# Aufrufers weder committen noch zurückrollen.
+from __future__ import annotations
+
+import pytest
+
+from conftest import fill_turnier
+from database.boards import add_board
+from database.scheduler import assign_group_boards, assign_round_boards, schedule_group_slots, schedule_ko_slots
+
+
+def _ko_count(m, tid: int) -> int:
+    return int(m._connect().execute("SELECT COUNT(*) FROM ko_spiele WHERE turnier_id=?", (tid,)).fetchone()[0])
+
+
+def test_ko_bracket_joins_caller_transaction(db):
+    tid = fill_turnier(db, qualifiers=8)
+    con = db._connect()
+    con.execute("BEGIN")
+    con.execute("INSERT INTO teilnehmer(name, spitzname) VALUES('Nachzügler', '')")
+    db.generate_ko_bracket_total(tid, 4)
+    assert con.in_transaction  # nichts committet – der Aufrufer entscheidet
+    con.rollback()
+    assert _ko_count(db, tid) == 7  # alter 8er-Plan (4 + 2 + 1) wieder da
+    assert con.execute("SELECT COUNT(*) FROM teilnehmer WHERE name='Nachzügler'").fetchone()[0] == 0
+
+
+def test_ko_bracket_own_transaction_rolls_back_on_error(db):
+    tid = fill_turnier(db, qualifiers=8)
+    with pytest.raises(ValueError):
+        db.generate_ko_bracket_total(tid, 17)  # nur 16 Spieler
+    con = db._connect()
+    assert not con.in_transaction
+    assert _ko_count(db, tid) == 7
+
+
+def test_ko_bracket_error_leaves_caller_transaction_open(db):
+    tid = fill_turnier(db, qualifiers=8)
+    con = db._connect()
+    con.execute("BEGIN")
+    con.execute("INSERT INTO teilnehmer(name, spitzname) VALUES('Nachzügler', '')")
+    with pytest.raises(ValueError):
+        db.generate_ko_bracket_total(tid, 17)
+    assert con.in_transaction
+    con.commit()
+    assert con.execute("SELECT COUNT(*) FROM teilnehmer WHERE name='Nachzügler'").fetchone()[0] == 1
+
+
+@pytest.mark.parametrize("tabelle, schedule", [("spiele", schedule_group_slots), ("ko_spiele", schedule_ko_slots)])
+def test_slot_schedule_joins_caller_transaction(db, tabelle, schedule):
+    tid = fill_turnier(db, qualifiers=8)
+    db.save_results_batch([(mid, None, None) for mid, *_ in db._connect().execute(
+        "SELECT id FROM spiele WHERE turnier_id=?", (tid,))])  # Gruppenphase wieder offen
+    for nr in (1, 2):
+        add_board(nr, f"Board {nr}", db.DB_PATH)
+    con = db._connect()
+    con.execute("BEGIN")
+    con.execute("INSERT INTO teilnehmer(name, spitzname) VALUES('Nachzügler', '')")
+    plan = schedule(tid, db.DB_PATH)
+    assert plan.spiele > 0
+    assert con.in_transaction
+    con.rollback()
+    assert con.execute(f"SELECT COUNT(*) FROM {tabelle} WHERE turnier_id=? AND slot IS NOT NULL", (tid,)).fetchone()[0] == 0
+    assert con.execute("SELECT COUNT(*) FROM teilnehmer WHERE name='Nachzügler'").fetchone()[0] == 0
+
+    plan = schedule(tid, db.DB_PATH)  # ohne offene Transaktion: eigene, committet
+    assert not con.in_transaction
+    assert con.execute(f"SELECT COUNT(*) FROM {tabelle} WHERE turnier_id=? AND slot IS NOT NULL", (tid,)).fetchone()[0] == plan.spiele
+
+
+
+@pytest.mark.parametrize("tabelle, assign", [("spiele", assign_group_boards), ("ko_spiele", assign_round_boards)])
+def test_board_assignment_joins_caller_transaction(db, tabelle, assign):
+    tid = fill_turnier(db, qualifiers=8)
+    for nr in (1, 2):
+        add_board(nr, f"Board {nr}", db.DB_PATH)
+    key = db.fetch_groups(tid)[0][0] if tabelle == "spiele" else db.fetch_ko_rounds(tid)[0]  # Gruppe bzw. Runde
+    con = db._connect()
+    con.execute("BEGIN")
+    con.execute("INSERT INTO teilnehmer(name, spitzname) VALUES('Nachzügler', '')")
+    assert assign(tid, key, db.DB_PATH) > 0
+    assert con.in_transaction
+    con.rollback()
+    assert con.execute(f"SELECT COUNT(*) FROM {tabelle} WHERE turnier_id=? AND board_id IS NOT NULL", (tid,)).fetchone()[0] == 0
+    assert con.execute("SELECT COUNT(*) FROM teilnehmer WHERE name='Nachzügler'").fetchone()[0] == 0
+
+    n = assign(tid, key, db.DB_PATH)  # ohne offene Transaktion: eigene, committet
+    assert not con.in_transaction
+    assert con.execute(f"SELECT COUNT(*) FROM {tabelle} WHERE turnier_id=? AND board_id IS NOT NULL", (tid,)).fetchone()[0] == n
@@ -8,6 +8,8 @@ import sqlite3
 from datetime import datetime
 from typing import List, Tuple
 
+from database.connection import checkpoint, close_all
+
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 DB_PATH = os.path.join(DATA_DIR, "ibu.sqlite")
@@ -50,6 +52,9 @@ def create_backup() -> str:
     if not os.path.exists(DB_PATH):
         # leere DB ist auch ok – wird einfach kopiert (oder Fehler werfen?)
         open(DB_PATH, "a").close()
+    else:
+        # WAL-Modus: offene Änderungen in die Hauptdatei schreiben, sonst fehlen sie in der Kopie
+        checkpoint(DB_PATH)
     dst = os.path.join(BACKUP_DIR, f"ibu__{_ts()}.sqlite")
     shutil.copy2(DB_PATH, dst)
     return dst
@@ -79,6 +84,9 @@ def restore_backup(backup_path: str) -> str:
         raise RuntimeError(f"Ungültiges Backup: {msg}")
 
     # Sicherheitskopie erstellen
+    if os.path.exists(DB_PATH):
+        checkpoint(DB_PATH)
+    close_all()
     safety = os.path.join(BACKUP_DIR, f"ibu__pre-restore__{_ts()}.sqlite")
     if os.path.exists(DB_PATH):
         shutil.copy2(DB_PATH, safety)
@@ -86,6 +94,11 @@ def restore_backup(backup_path: str) -> str:
         # leere Datei, damit klar ist, dass vorher nichts da war
         open(safety, "a").close()
 
-    # Wiederherstellung
+    # Wiederherstellung (alte WAL-/SHM-Dateien gehören nicht zum Backup)
+    for suffix in ("-wal", "-shm"):
+        try:
+            os.remove(DB_PATH + suffix)
+        except FileNotFoundError:
+            pass
     shutil.copy2(backup_path, DB_PATH)
     return safety
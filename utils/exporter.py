@@ -4,31 +4,26 @@ from __future__ import annotations
 
 import csv
 import os
-from dataclasses import dataclass
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Optional, Sequence, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
 
-from PyQt6.QtGui import QTextDocument, QPageSize, QPageLayout
-from PyQt6.QtPrintSupport import QPrinter
-from PyQt6.QtCore import QMarginsF
-
-from utils.settings import get_export_dir  # Settings-Integration
+from utils.pdfwriter import Absatz, Block, Dokument, Tabelle, write_pdf
+from utils.settings import get_export_dir, get_pdf_backend  # Settings-Integration
 
 # Datenmodell-Funktionen
 from database.models import (
     _connect,
     compute_meisterschaft_rangliste,
+    fetch_meisterschaft_turnier_ids,
     fetch_meisterschaften,
-    fetch_turniere,
-    fetch_turnier_teilnehmer,
-    fetch_groups,
-    fetch_group_matches,
-    compute_group_table,
-    fetch_ko_rounds,
-    fetch_ko_matches,
-    ensure_bronze_from_semis,
-    fetch_ko_champion,
+    fetch_turnier_snapshot,
+    iter_meisterschaft_spiele,
 )
+from database.snapshot import KoZeile, TurnierSnapshot
 
 # Anzeige/Branding
 APP_NAME = "IBU Turniere"
@@ -45,33 +40,38 @@ def ensure_exports_dir() -> str:
 def timestamp() -> str:
     return datetime.now().strftime("%Y%m%d-%H%M")
 
-def unique_path(base_dir: str, base_name: str, ext: str) -> str:
+def unique_path(base_dir: str, base_name: str, ext: str, taken: Optional[Set[str]] = None) -> str:
+    """Freier Dateiname; taken = im selben Lauf schon vergebene (noch nicht geschriebene) Pfade."""
+    taken = taken if taken is not None else set()
     path = os.path.join(base_dir, f"{base_name}.{ext}")
-    if not os.path.exists(path):
-        return path
     i = 1
-    while True:
-        p = os.path.join(base_dir, f"{base_name}__{i}.{ext}")
-        if not os.path.exists(p):
-            return p
+    while os.path.exists(path) or path in taken:
+        path = os.path.join(base_dir, f"{base_name}__{i}.{ext}")
         i += 1
+    taken.add(path)
+    return path
 
 def _csv_writer(path: str):
     fh = open(path, "w", encoding="utf-8-sig", newline="")
     writer = csv.writer(fh, delimiter=";", lineterminator="\r\n")
     return fh, writer
 
-def save_csv(rows: Sequence[Sequence[object]], header: Sequence[str], path: str) -> str:
+def save_csv(rows: Iterable[Sequence[object]], header: Sequence[str], path: str) -> str:
+    """rows darf ein Generator sein (z. B. direkt aus einem Cursor) – wird zeilenweise geschrieben, nie gesammelt."""
     fh, writer = _csv_writer(path)
     try:
         writer.writerow(list(header))
-        for r in rows:
-            writer.writerow([("" if v is None else v) for v in r])
+        writer.writerows([("" if v is None else v) for v in r] for r in rows)
     finally:
         fh.close()
     return path
 
 def save_pdf_from_html(html: str, path: str, orientation: str = "portrait") -> str:
+    # Qt erst hier laden: CSV- und interne PDF-Exporte laufen ohne PyQt6
+    from PyQt6.QtCore import QMarginsF
+    from PyQt6.QtGui import QPageLayout, QPageSize, QTextDocument
+    from PyQt6.QtPrintSupport import QPrinter
+
     printer = QPrinter(QPrinter.PrinterMode.HighResolution)
     printer.setOutputFormat(QPrinter.OutputFormat.PdfFormat)
     printer.setOutputFileName(path)
@@ -86,8 +86,11 @@ def save_pdf_from_html(html: str, path: str, orientation: str = "portrait") -> s
     doc.print(printer)
     return path
 
-def _css_base() -> str:
-    return """
+# HTML-Vorlagen: einmal beim Import in statische Teile zerlegt (\0 = Platzhalter); beim Rendern
+# wird nur noch per str.join zusammengesetzt. Titel, Überschriften und Zellwerte werden escaped
+# (&, <, >). Intro-/Hinweiszeilen sind vertrauenswürdige HTML-Fragmente und werden unverändert
+# eingesetzt – Aufrufer müssen die Werte, die sie hineinschreiben, selbst escapen (_esc).
+_CSS = """
     <style>
     body { font-family: Arial, Helvetica, sans-serif; font-size: 11pt; }
     h1 { font-size: 18pt; margin: 0 0 6pt 0; }
@@ -102,40 +105,116 @@ def _css_base() -> str:
     </style>
     """
 
-def _html_wrap(title: str, intro_lines: Sequence[str], table_html_blocks: Sequence[str]) -> str:
-    intro = "".join(f"<div class='meta'>{line}</div>" for line in intro_lines)
-    tables = "".join(table_html_blocks)
-    return f"""
+def _vorlage(text: str) -> Tuple[str, ...]:
+    return tuple(text.split("\0"))
+
+def _fuellen(teile: Tuple[str, ...], *werte: str) -> str:
+    out = [teile[0]]
+    for wert, teil in zip(werte, teile[1:]):
+        out += (wert, teil)
+    return "".join(out)
+
+_SEITE = _vorlage(f"""
     <html>
     <head>
     <meta charset="utf-8" />
-    {_css_base()}
+    {_CSS}
     </head>
     <body>
-      <h1>{title}</h1>
-      {intro}
-      {tables}
-      <div class="foot">Exportiert am {datetime.now().strftime("%d.%m.%Y %H:%M")} – {APP_NAME} {APP_VERSION}</div>
+      <h1>\0</h1>
+      \0
+      \0
+      <div class="foot">\0</div>
     </body>
     </html>
-    """
+    """)
 
-def _html_table(headers: Sequence[str], rows: Sequence[Sequence[object]], caption: Optional[str] = None) -> str:
-    thead = "".join(f"<th>{h}</th>" for h in headers)
-    body_rows = []
-    for r in rows:
-        tds = "".join(f"<td>{'' if v is None else v}</td>" for v in r)
-        body_rows.append(f"<tr>{tds}</tr>")
-    caption_html = f"<h2>{caption}</h2>" if caption else ""
-    return f"""
-      {caption_html}
+_TABELLE = _vorlage("""
+      \0
       <table>
-        <thead><tr>{thead}</tr></thead>
+        <thead><tr>\0</tr></thead>
         <tbody>
-          {''.join(body_rows)}
+          \0
         </tbody>
       </table>
-    """
+    """)
+
+def _esc(v: object) -> str:
+    """Zelleninhalt -> HTML-Text; None -> leer, Zahlen ohne Prüfung."""
+    if v is None:
+        return ""
+    if v.__class__ is int:
+        return str(v)
+    s = str(v)
+    if "&" in s or "<" in s or ">" in s:
+        return s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return s
+
+def _zeile(r: Sequence[object]) -> str:
+    return "<tr><td>" + "</td><td>".join(map(_esc, r)) + "</td></tr>" if r else "<tr></tr>"
+
+@lru_cache(maxsize=32)
+def _zeilen_vorlage(n: int) -> Tuple[str, int]:
+    """'<tr><td>%s</td>…</tr>' für n Spalten und die Anzahl '<' (= '>') ihrer Tags."""
+    return "<tr>" + "<td>%s</td>" * n + "</tr>", 2 * n + 2
+
+_BLOCK = 256  # Zeilen je Escape-Prüfung
+
+def _tbody(rows: Sequence[Sequence[object]]) -> str:
+    """Zeilen über die Vorlage ihrer Spaltenzahl; geprüft wird je Block, ob mehr '<'/'>' als die
+    Tags oder ein '&' darin stehen – nur dann werden dessen betroffene Zeilen escaped gefüllt.
+    Ungleich lange Zeilen -> zellenweise über _zeile."""
+    if not rows:
+        return ""
+    n = len(rows[0])
+    if any(len(r) != n for r in rows):
+        return "".join(map(_zeile, rows))
+    vorlage, tags = _zeilen_vorlage(n)
+    out: List[str] = []
+    for i in range(0, len(rows), _BLOCK):
+        block = rows[i:i + _BLOCK]
+        zeilen = [vorlage % (tuple(r) if None not in r else tuple(["" if v is None else v for v in r])) for r in block]
+        html = "".join(zeilen)
+        if "&" in html or html.count("<") != tags * len(block) or html.count(">") != tags * len(block):
+            html = "".join([z if "&" not in z and z.count("<") == tags and z.count(">") == tags
+                            else vorlage % tuple(map(_esc, r)) for z, r in zip(zeilen, block)])
+        out.append(html)
+    return "".join(out)
+
+@lru_cache(maxsize=64)
+def _thead(headers: Tuple[str, ...]) -> str:
+    return "".join(f"<th>{_esc(h)}</th>" for h in headers)
+
+def _footer_text() -> str:
+    return f"Exportiert am {datetime.now().strftime('%d.%m.%Y %H:%M')} – {APP_NAME} {APP_VERSION}"
+
+def _html_wrap(title: str, intro_lines: Sequence[str], table_html_blocks: Sequence[str]) -> str:
+    intro = "".join(f"<div class='meta'>{line}</div>" for line in intro_lines)
+    return _fuellen(_SEITE, _esc(title), intro, "".join(table_html_blocks), _footer_text())
+
+def _html_table(headers: Sequence[str], rows: Sequence[Sequence[object]], caption: Optional[str] = None) -> str:
+    caption_html = f"<h2>{_esc(caption)}</h2>" if caption else ""
+    return _fuellen(_TABELLE, caption_html, _thead(tuple(headers)), _tbody(rows))
+
+# PDF-Backends: "qt" (QTextDocument/QPrinter, braucht eine Q(Gui)Application) oder "intern"
+# (utils/pdfwriter, reines Python). Beide bekommen dieselben Blöcke: Tabelle bzw. Absatz.
+PDF_BACKENDS = ("qt", "intern")
+
+def _html_block(b: Block) -> str:
+    if isinstance(b, Tabelle):
+        return _html_table(b.headers, b.rows, b.caption)
+    return f"<div class='{b.klasse}'>{b.html}</div>"
+
+def save_pdf(title: str, intro_lines: Sequence[str], blocks: Sequence[Block], path: str,
+             orientation: str = "portrait", backend: Optional[str] = None) -> str:
+    """backend=None -> Einstellung 'pdf_backend' (Standard qt)."""
+    backend = backend or get_pdf_backend()
+    if backend == "intern":
+        return write_pdf(Dokument(title, intro_lines, blocks, _footer_text()), path, orientation,
+                         producer=f"{APP_NAME} {APP_VERSION}")
+    if backend != "qt":
+        raise ValueError(f"Unbekanntes PDF-Backend: {backend}")
+    return save_pdf_from_html(_html_wrap(title, intro_lines, [_html_block(b) for b in blocks]), path, orientation)
 
 # --------------------- Meisterschaft – Rangliste -----------------------
 
@@ -149,8 +228,19 @@ def _ms_name(ms_id: int) -> Tuple[str, str]:
             return str(r[0] or ""), str(r[1] or "")
     return (f"MS-{ms_id}", "")
 
-def export_meisterschaft_rangliste_csv(ms_id: int, path: Optional[str] = None) -> str:
-    rows = compute_meisterschaft_rangliste(ms_id)
+def _ms_base_name(prefix: str, ms_id: int, ms: Optional[Tuple[str, str]] = None) -> str:
+    ms_name, saison = ms or _ms_name(ms_id)
+    base_name = f"{prefix}__{(ms_name or ('MS-' + str(ms_id))).replace(' ', '-')}"
+    if saison:
+        base_name += f"-{saison}"
+    return base_name + f"__{timestamp()}"
+
+# rangliste/ms: vorab geladene Daten (Sammel-Export), sonst werden sie hier gelesen
+
+def export_meisterschaft_rangliste_csv(ms_id: int, path: Optional[str] = None,
+                                       rangliste: Optional[List[Dict[str, Any]]] = None,
+                                       ms: Optional[Tuple[str, str]] = None) -> str:
+    rows = rangliste if rangliste is not None else compute_meisterschaft_rangliste(ms_id)
     header = ["Rang", "Spieler", "Punkte gesamt", "Turniere", "Beste Platzierung", "Letztes Turnierdatum"]
     csv_rows: List[List[object]] = []
     for r in rows:
@@ -162,17 +252,13 @@ def export_meisterschaft_rangliste_csv(ms_id: int, path: Optional[str] = None) -
             ("" if r.get("beste_platzierung") in (None, 0) else r.get("beste_platzierung")),
             r.get("letztes_datum", ""),
         ])
-    base_dir = ensure_exports_dir()
-    ms_name, saison = _ms_name(ms_id)
-    base_name = f"rangliste__{(ms_name or ('MS-' + str(ms_id))).replace(' ', '-')}"
-    if saison:
-        base_name += f"-{saison}"
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "csv")
+    final_path = path or unique_path(ensure_exports_dir(), _ms_base_name("rangliste", ms_id, ms), "csv")
     return save_csv(csv_rows, header, final_path)
 
-def export_meisterschaft_rangliste_pdf(ms_id: int, path: Optional[str] = None) -> str:
-    rows = compute_meisterschaft_rangliste(ms_id)
+def export_meisterschaft_rangliste_pdf(ms_id: int, path: Optional[str] = None, backend: Optional[str] = None,
+                                       rangliste: Optional[List[Dict[str, Any]]] = None,
+                                       ms: Optional[Tuple[str, str]] = None) -> str:
+    rows = rangliste if rangliste is not None else compute_meisterschaft_rangliste(ms_id)
     headers = ["Rang", "Spieler", "Punkte gesamt", "Turniere", "Beste Platzierung", "Letztes Turnierdatum"]
     table_rows: List[List[object]] = []
     for r in rows:
@@ -184,187 +270,142 @@ def export_meisterschaft_rangliste_pdf(ms_id: int, path: Optional[str] = None) -
             ("" if r.get("beste_platzierung") in (None, 0) else r.get("beste_platzierung")),
             r.get("letztes_datum", ""),
         ])
-    ms_name, saison = _ms_name(ms_id)
+    ms = ms or _ms_name(ms_id)
+    ms_name, saison = ms
     intro = [
-        f"Meisterschaft: <b>{ms_name}</b>" + (f" (Saison {saison})" if saison else ""),
+        f"Meisterschaft: <b>{_esc(ms_name)}</b>" + (f" (Saison {_esc(saison)})" if saison else ""),
         "Punkteschema: 1=30, 2=24, 3=18, 4=15, ab 5=5 (Default, sofern nicht überschrieben).",
     ]
-    html = _html_wrap("Meisterschaft – Rangliste", intro, [
-        _html_table(headers, table_rows),
-    ])
-    base_dir = ensure_exports_dir()
-    base_name = f"rangliste__{(ms_name or ('MS-' + str(ms_id))).replace(' ', '-')}"
-    if saison:
-        base_name += f"-{saison}"
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "pdf")
-    return save_pdf_from_html(html, final_path, orientation="portrait")
+    final_path = path or unique_path(ensure_exports_dir(), _ms_base_name("rangliste", ms_id, ms), "pdf")
+    return save_pdf("Meisterschaft – Rangliste", intro, [Tabelle(headers, table_rows)], final_path, "portrait", backend)
+
+# ---------------- Meisterschaft – alle Spiele (gestreamt) ----------------
+
+def export_meisterschaft_spiele_csv(ms_id: int, path: Optional[str] = None) -> str:
+    """Alle Spiele der Saison; die Zeilen laufen vom Cursor (fetchmany) direkt in die Datei."""
+    header = ["Turnier", "Datum", "Phase", "Gruppe/Runde", "Runde/Match", "Spieler 1", "Spieler 2", "S1", "S2"]
+    rows = (
+        [tname, datum, "KO-Phase", "Bronze" if runde == 99 else _ko_round_label_from_match_count(n), match_no, n1, n2, s1, s2]
+        if ko else
+        [tname, datum, "Gruppenphase", gname, f"{runde}/{match_no}", n1, n2, s1, s2]
+        for tname, datum, ko, gname, runde, match_no, n, n1, n2, s1, s2 in iter_meisterschaft_spiele(ms_id)
+    )
+    final_path = path or unique_path(ensure_exports_dir(), _ms_base_name("spiele", ms_id), "csv")
+    return save_csv(rows, header, final_path)
 
 # --------------------------- Turnier-Stammdaten ------------------------
+# Alle Turnier-Exporte rendern aus einem TurnierSnapshot (eine Lesetransaktion). Wer mehrere
+# Dateien erzeugt, lädt ihn einmal über fetch_turnier_snapshot und reicht ihn durch.
 
-@dataclass
-class _TurnierInfo:
-    id: int
-    name: str
-    datum: str
+def _snapshot(turnier_id: int, snapshot: Optional[TurnierSnapshot]) -> TurnierSnapshot:
+    return snapshot if snapshot is not None else fetch_turnier_snapshot(turnier_id)
 
-def _turnier_info(turnier_id: int) -> _TurnierInfo:
-    for tid, name, datum, _modus, _ms in fetch_turniere():
-        if int(tid) == int(turnier_id):
-            return _TurnierInfo(int(tid), str(name or ""), str(datum or ""))
-    with _connect() as con:
-        r = con.execute("SELECT name, COALESCE(datum,'') FROM turniere WHERE id=?", (turnier_id,)).fetchone()
-        if r:
-            return _TurnierInfo(int(turnier_id), str(r[0] or ""), str(r[1] or ""))
-    return _TurnierInfo(int(turnier_id), f"Turnier-{turnier_id}", "")
+def _turnier_base_name(prefix: str, snap: TurnierSnapshot) -> str:
+    base_name = f"{prefix}__{snap.name.replace(' ', '-')}" + (f"-{snap.datum}" if snap.datum else "")
+    return base_name + f"__{timestamp()}"
 
-# ----------------------- Turnier – Teilnehmerliste ---------------------
+def _turnier_intro(snap: TurnierSnapshot) -> List[str]:
+    return [f"Turnier: <b>{_esc(snap.name)}</b>" + (f" ({_esc(snap.datum)})" if snap.datum else "")]
 
-def export_turnier_teilnehmer_csv(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
-    teilnehmer = fetch_turnier_teilnehmer(turnier_id)
-    teilnehmer_sorted = sorted(teilnehmer, key=lambda x: (x[1] or "").lower())
+def _score(v: Optional[int]) -> object:
+    return "" if v is None else v
 
-    header = ["#", "Teilnehmer-ID", "Spieler"]
-    rows: List[List[object]] = []
-    for i, (pid, name) in enumerate(teilnehmer_sorted, start=1):
-        rows.append([i, pid, name])
+# ----------------------- Turnier – Teilnehmerliste ---------------------
 
-    base_dir = ensure_exports_dir()
-    base_name = f"turnier-teilnehmer__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "csv")
-    return save_csv(rows, header, final_path)
+def _teilnehmer_rows(snap: TurnierSnapshot) -> List[List[object]]:
+    return [[i, pid, name] for i, (pid, name) in enumerate(snap.teilnehmer, start=1)]
 
-def export_turnier_teilnehmer_pdf(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
-    teilnehmer = fetch_turnier_teilnehmer(turnier_id)
-    teilnehmer_sorted = sorted(teilnehmer, key=lambda x: (x[1] or "").lower())
+def export_turnier_teilnehmer_csv(turnier_id: int, path: Optional[str] = None,
+                                  snapshot: Optional[TurnierSnapshot] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
+    header = ["#", "Teilnehmer-ID", "Spieler"]
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("turnier-teilnehmer", snap), "csv")
+    return save_csv(_teilnehmer_rows(snap), header, final_path)
 
+def export_turnier_teilnehmer_pdf(turnier_id: int, path: Optional[str] = None,
+                                  snapshot: Optional[TurnierSnapshot] = None, backend: Optional[str] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
     headers = ["#", "Teilnehmer-ID", "Spieler"]
-    rows: List[List[object]] = []
-    for i, (pid, name) in enumerate(teilnehmer_sorted, start=1):
-        rows.append([i, pid, name])
-
-    intro = [f"Turnier: <b>{info.name}</b>" + (f" ({info.datum})" if info.datum else "")]
-    html = _html_wrap("Teilnehmerliste", intro, [
-        _html_table(headers, rows)
-    ])
-    base_dir = ensure_exports_dir()
-    base_name = f"turnier-teilnehmer__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "pdf")
-    return save_pdf_from_html(html, final_path, orientation="portrait")
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("turnier-teilnehmer", snap), "pdf")
+    return save_pdf("Teilnehmerliste", _turnier_intro(snap), [Tabelle(headers, _teilnehmer_rows(snap))],
+                    final_path, "portrait", backend)
 
 # ----------------------- Turnier – Gruppen: Spielplan ------------------
 
-def export_gruppen_spielplan_csv(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
-    groups = fetch_groups(turnier_id)
+def export_gruppen_spielplan_csv(turnier_id: int, path: Optional[str] = None,
+                                 snapshot: Optional[TurnierSnapshot] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
     header = ["Gruppe", "Runde", "Match", "Spieler 1", "Spieler 2", "S1", "S2"]
     rows: List[List[object]] = []
 
-    if not groups:
+    if not snap.gruppen:
         rows.append(["-", "-", "-", "-", "-", "", ""])
 
-    for gid, gname in groups:
-        matches = fetch_group_matches(turnier_id, gid)
-        for _mid, runde, match_no, n1, n2, s1, s2 in matches:
-            rows.append([gname, runde, match_no, n1, n2, "" if s1 is None else s1, "" if s2 is None else s2])
+    for gid, gname in snap.gruppen:
+        for _mid, runde, match_no, n1, n2, s1, s2 in snap.gruppen_spiele(gid):
+            rows.append([gname, runde, match_no, n1, n2, _score(s1), _score(s2)])
 
-    base_dir = ensure_exports_dir()
-    base_name = f"gruppen-spielplan__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "csv")
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("gruppen-spielplan", snap), "csv")
     return save_csv(rows, header, final_path)
 
-def export_gruppen_spielplan_pdf(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
-    groups = fetch_groups(turnier_id)
-
-    blocks: List[str] = []
-    if not groups:
-        blocks.append("<div class='warn'>Keine Gruppen vorhanden.</div>")
-
-    for gid, gname in groups:
-        matches = fetch_group_matches(turnier_id, gid)
-        headers = ["Runde", "Match", "Spieler 1", "Spieler 2", "S1", "S2"]
-        rows: List[List[object]] = []
-        for _mid, runde, match_no, n1, n2, s1, s2 in matches:
-            rows.append([runde, match_no, n1, n2, "" if s1 is None else s1, "" if s2 is None else s2])
-        blocks.append(_html_table(headers, rows, caption=f"Gruppe {gname}"))
-
-    intro = [f"Turnier: <b>{info.name}</b>" + (f" ({info.datum})" if info.datum else "")]
-    html = _html_wrap("Gruppen – Spielplan", intro, blocks)
-    base_dir = ensure_exports_dir()
-    base_name = f"gruppen-spielplan__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "pdf")
-    return save_pdf_from_html(html, final_path, orientation="portrait")
+def export_gruppen_spielplan_pdf(turnier_id: int, path: Optional[str] = None,
+                                 snapshot: Optional[TurnierSnapshot] = None, backend: Optional[str] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
+
+    blocks: List[Block] = []
+    if not snap.gruppen:
+        blocks.append(Absatz("Keine Gruppen vorhanden.", "warn"))
+
+    headers = ["Runde", "Match", "Spieler 1", "Spieler 2", "S1", "S2"]
+    for gid, gname in snap.gruppen:
+        rows = [[runde, match_no, n1, n2, _score(s1), _score(s2)]
+                for _mid, runde, match_no, n1, n2, s1, s2 in snap.gruppen_spiele(gid)]
+        blocks.append(Tabelle(headers, rows, f"Gruppe {gname}"))
+
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("gruppen-spielplan", snap), "pdf")
+    return save_pdf("Gruppen – Spielplan", _turnier_intro(snap), blocks, final_path, "portrait", backend)
 
 # ----------------------- Turnier – Gruppen: Tabellen -------------------
 
-def export_gruppen_tabellen_csv(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
-    groups = fetch_groups(turnier_id)
+def _tabellen_rows(snap: TurnierSnapshot, gid: int) -> List[List[object]]:
+    tab = snap.tabellen.get(gid)
+    return [[t.rang, t.spieler, t.spiele, t.siege, t.niederlagen, t.lf, t.la, t.diff, t.pkt]
+            for t in (tab.zeilen if tab is not None else ())]
+
+def export_gruppen_tabellen_csv(turnier_id: int, path: Optional[str] = None,
+                                snapshot: Optional[TurnierSnapshot] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
     header = ["Gruppe", "Rang", "Spieler", "Spiele", "Siege", "Niederlagen", "Legs für", "Legs gegen", "Differenz", "Punkte"]
     rows: List[List[object]] = []
 
-    if not groups:
+    if not snap.gruppen:
         rows.append(["-", "-", "-", "-", "-", "-", "-", "-", "-", ""])
 
-    for gid, gname in groups:
-        table = compute_group_table(turnier_id, gid)
+    for gid, gname in snap.gruppen:  # gleiche Wertung wie in der Gruppenphase-Ansicht
+        table = _tabellen_rows(snap, gid)
         if not table:
             rows.append([gname, "-", "-", "-", "-", "-", "-", "-", "-", "-"])
             continue
-        rank = 0
-        last_key = None
-        for t in table:
-            key = (int(t["pkt"]), int(t["diff"]), int(t["lf"]))
-            if key != last_key:
-                rank += 1
-                last_key = key
-            rows.append([gname, rank, t["spieler"], t["spiele"], t["siege"], t["niederlagen"], t["lf"], t["la"], t["diff"], t["pkt"]])
-
-    base_dir = ensure_exports_dir()
-    base_name = f"gruppen-tabellen__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "csv")
+        rows.extend([gname] + t for t in table)
+
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("gruppen-tabellen", snap), "csv")
     return save_csv(rows, header, final_path)
 
-def export_gruppen_tabellen_pdf(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
-    groups = fetch_groups(turnier_id)
+def export_gruppen_tabellen_pdf(turnier_id: int, path: Optional[str] = None,
+                                snapshot: Optional[TurnierSnapshot] = None, backend: Optional[str] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
 
-    blocks: List[str] = []
-    if not groups:
-        blocks.append("<div class='warn'>Keine Gruppen vorhanden.</div>")
+    blocks: List[Block] = []
+    if not snap.gruppen:
+        blocks.append(Absatz("Keine Gruppen vorhanden.", "warn"))
 
-    for gid, gname in groups:
-        table = compute_group_table(turnier_id, gid)
-        headers = ["Rang", "Spieler", "Spiele", "Siege", "Niederlagen", "Legs für", "Legs gegen", "Differenz", "Punkte"]
-        rows: List[List[object]] = []
-        if not table:
-            rows.append(["-", "-", "-", "-", "-", "-", "-", "-", "-"])
-        else:
-            rank = 0
-            last_key = None
-            for t in table:
-                key = (int(t["pkt"]), int(t["diff"]), int(t["lf"]))
-                if key != last_key:
-                    rank += 1
-                    last_key = key
-                rows.append([rank, t["spieler"], t["spiele"], t["siege"], t["niederlagen"], t["lf"], t["la"], t["diff"], t["pkt"]])
-        blocks.append(_html_table(headers, rows, caption=f"Gruppe {gname}"))
-
-    intro = [f"Turnier: <b>{info.name}</b>" + (f" ({info.datum})" if info.datum else "")]
-    html = _html_wrap("Gruppen – Tabellen", intro, blocks)
-    base_dir = ensure_exports_dir()
-    base_name = f"gruppen-tabellen__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "pdf")
-    return save_pdf_from_html(html, final_path, orientation="portrait")
+    headers = ["Rang", "Spieler", "Spiele", "Siege", "Niederlagen", "Legs für", "Legs gegen", "Differenz", "Punkte"]
+    for gid, gname in snap.gruppen:
+        rows = _tabellen_rows(snap, gid) or [["-", "-", "-", "-", "-", "-", "-", "-", "-"]]
+        blocks.append(Tabelle(headers, rows, f"Gruppe {gname}"))
+
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("gruppen-tabellen", snap), "pdf")
+    return save_pdf("Gruppen – Tabellen", _turnier_intro(snap), blocks, final_path, "portrait", backend)
 
 # ----------------------- Turnier – KO-Übersicht -----------------------
 
@@ -376,146 +417,277 @@ def _ko_round_label_from_match_count(count: int) -> str:
     if count == 16: return "Sechzehntelfinale"
     return "Runde"
 
-def _ko_rounds_with_counts(turnier_id: int) -> List[Tuple[int, int]]:
-    rounds = fetch_ko_rounds(turnier_id)
-    out: List[Tuple[int, int]] = []
-    for r in rounds:
-        matches = fetch_ko_matches(turnier_id, r)
-        out.append((r, len(matches)))
-    ensure_bronze_from_semis(turnier_id)
-    if 99 not in [r for r, _ in out]:
-        bron = fetch_ko_matches(turnier_id, 99)
-        if bron:
-            out.append((99, len(bron)))
-    non_bronze = [(r, c) for r, c in out if r != 99]
-    non_bronze.sort(key=lambda x: x[0])
-    bronze = [(r, c) for r, c in out if r == 99]
-    return non_bronze + bronze
-
-def export_ko_csv(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
+def _ko_rounds(snap: TurnierSnapshot) -> List[Tuple[str, Sequence[KoZeile]]]:
+    """(Anzeigename, Spiele) je KO-Runde, Bronze zuletzt."""
+    return [("Bronze" if r == 99 else _ko_round_label_from_match_count(len(ms)), ms) for r, ms in snap.ko]
+
+def export_ko_csv(turnier_id: int, path: Optional[str] = None,
+                  snapshot: Optional[TurnierSnapshot] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
     header = ["Runde", "Match", "Spieler 1", "Spieler 2", "S1", "S2"]
     rows: List[List[object]] = []
 
-    rounds = _ko_rounds_with_counts(turnier_id)
+    rounds = _ko_rounds(snap)
     if not rounds:
         rows.append(["-", "-", "-", "-", "", ""])
 
-    for r, cnt in rounds:
-        matches = fetch_ko_matches(turnier_id, r)
-        rname = "Bronze" if r == 99 else _ko_round_label_from_match_count(cnt)
+    for rname, matches in rounds:
         for _id, match_no, n1, n2, s1, s2 in matches:
-            rows.append([rname, match_no, n1, n2, "" if s1 is None else s1, "" if s2 is None else s2])
-
-    champ = fetch_ko_champion(turnier_id)
-    if champ:
-        rows.append(["Champion", "-", champ[1], "", "", ""])
-    bron = fetch_ko_matches(turnier_id, 99)
-    if bron and bron[0][4] is not None and bron[0][5] is not None and bron[0][4] != bron[0][5]:
-        p1 = bron[0][2]; p2 = bron[0][3]; s1 = bron[0][4]; s2 = bron[0][5]
-        third = p1 if int(s1) > int(s2) else p2
-        rows.append(["Platz 3", "-", third, "", "", ""])
-
-    base_dir = ensure_exports_dir()
-    base_name = f"ko-uebersicht__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "csv")
+            rows.append([rname, match_no, n1, n2, _score(s1), _score(s2)])
+
+    if snap.champion:
+        rows.append(["Champion", "-", snap.champion[1], "", "", ""])
+    if snap.dritter is not None:
+        rows.append(["Platz 3", "-", snap.dritter, "", "", ""])
+
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("ko-uebersicht", snap), "csv")
     return save_csv(rows, header, final_path)
 
-def export_ko_pdf(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
-    rounds = _ko_rounds_with_counts(turnier_id)
+def export_ko_pdf(turnier_id: int, path: Optional[str] = None,
+                  snapshot: Optional[TurnierSnapshot] = None, backend: Optional[str] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
+    rounds = _ko_rounds(snap)
 
-    blocks: List[str] = []
+    blocks: List[Block] = []
     if not rounds:
-        blocks.append("<div class='warn'>Keine KO-Spiele vorhanden.</div>")
+        blocks.append(Absatz("Keine KO-Spiele vorhanden.", "warn"))
 
-    for r, cnt in rounds:
-        matches = fetch_ko_matches(turnier_id, r)
-        headers = ["Match", "Spieler 1", "Spieler 2", "S1", "S2"]
-        rows: List[List[object]] = []
-        for _id, match_no, n1, n2, s1, s2 in matches:
-            rows.append([match_no, n1, n2, "" if s1 is None else s1, "" if s2 is None else s2])
-        caption = "Bronze" if r == 99 else _ko_round_label_from_match_count(cnt)
-        blocks.append(_html_table(headers, rows, caption=caption))
-
-    champ = fetch_ko_champion(turnier_id)
-    if champ:
-        blocks.append(f"<div class='meta'><b>Champion:</b> {champ[1]}</div>")
-    bron = fetch_ko_matches(turnier_id, 99)
-    if bron and bron[0][4] is not None and bron[0][5] is not None and bron[0][4] != bron[0][5]:
-        p1 = bron[0][2]; p2 = bron[0][3]; s1 = bron[0][4]; s2 = bron[0][5]
-        third = p1 if int(s1) > int(s2) else p2
-        blocks.append(f"<div class='meta'><b>Platz 3:</b> {third}</div>")
-
-    intro = [f"Turnier: <b>{info.name}</b>" + (f" ({info.datum})" if info.datum else "")]
-    html = _html_wrap("KO – Übersicht", intro, blocks)
-    base_dir = ensure_exports_dir()
-    base_name = f"ko-uebersicht__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "pdf")
-    return save_pdf_from_html(html, final_path, orientation="portrait")
+    headers = ["Match", "Spieler 1", "Spieler 2", "S1", "S2"]
+    for rname, matches in rounds:
+        rows = [[match_no, n1, n2, _score(s1), _score(s2)] for _id, match_no, n1, n2, s1, s2 in matches]
+        blocks.append(Tabelle(headers, rows, rname))
+
+    if snap.champion:
+        blocks.append(Absatz(f"<b>Champion:</b> {_esc(snap.champion[1])}"))
+    if snap.dritter is not None:
+        blocks.append(Absatz(f"<b>Platz 3:</b> {_esc(snap.dritter)}"))
+
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("ko-uebersicht", snap), "pdf")
+    return save_pdf("KO – Übersicht", _turnier_intro(snap), blocks, final_path, "portrait", backend)
 
 # ------------------ Turnier – Ergebnis-Übersicht (flach) ---------------
 
-def export_turnier_uebersicht_csv(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
-    header = ["Phase", "Gruppe/Runde", "Runde/Match", "Spieler 1", "Spieler 2", "S1", "S2"]
-    rows: List[List[object]] = []
+def _uebersicht_gruppen_rows(snap: TurnierSnapshot) -> List[List[object]]:
+    return [[gname, f"{runde}/{match_no}", n1, n2, _score(s1), _score(s2)]
+            for gid, gname in snap.gruppen
+            for _mid, runde, match_no, n1, n2, s1, s2 in snap.gruppen_spiele(gid)]
 
-    groups = fetch_groups(turnier_id)
-    for gid, gname in groups:
-        matches = fetch_group_matches(turnier_id, gid)
-        for _mid, runde, match_no, n1, n2, s1, s2 in matches:
-            rows.append(["Gruppenphase", gname, f"{runde}/{match_no}", n1, n2, "" if s1 is None else s1, "" if s2 is None else s2])
+def _uebersicht_ko_rows(snap: TurnierSnapshot) -> List[List[object]]:
+    return [[rname, match_no, n1, n2, _score(s1), _score(s2)]
+            for rname, matches in _ko_rounds(snap)
+            for _id, match_no, n1, n2, s1, s2 in matches]
 
-    rounds = _ko_rounds_with_counts(turnier_id)
-    for r, cnt in rounds:
-        rname = "Bronze" if r == 99 else _ko_round_label_from_match_count(cnt)
-        matches = fetch_ko_matches(turnier_id, r)
-        for _id, match_no, n1, n2, s1, s2 in matches:
-            rows.append(["KO-Phase", rname, match_no, n1, n2, "" if s1 is None else s1, "" if s2 is None else s2])
+def export_turnier_uebersicht_csv(turnier_id: int, path: Optional[str] = None,
+                                  snapshot: Optional[TurnierSnapshot] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
+    header = ["Phase", "Gruppe/Runde", "Runde/Match", "Spieler 1", "Spieler 2", "S1", "S2"]
+    rows: List[List[object]] = [["Gruppenphase"] + r for r in _uebersicht_gruppen_rows(snap)]
+    rows += [["KO-Phase"] + r for r in _uebersicht_ko_rows(snap)]
 
     if not rows:
         rows.append(["-", "-", "-", "-", "-", "", ""])
 
-    base_dir = ensure_exports_dir()
-    base_name = f"turnier-uebersicht__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "csv")
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("turnier-uebersicht", snap), "csv")
     return save_csv(rows, header, final_path)
 
-def export_turnier_uebersicht_pdf(turnier_id: int, path: Optional[str] = None) -> str:
-    info = _turnier_info(turnier_id)
-    blocks: List[str] = []
-
-    groups = fetch_groups(turnier_id)
-    if groups:
-        g_rows: List[List[object]] = []
-        for gid, gname in groups:
-            matches = fetch_group_matches(turnier_id, gid)
-            for _mid, runde, match_no, n1, n2, s1, s2 in matches:
-                g_rows.append([gname, f"{runde}/{match_no}", n1, n2, "" if s1 is None else s1, "" if s2 is None else s2])
-        blocks.append(_html_table(["Gruppe", "Runde/Match", "Spieler 1", "Spieler 2", "S1", "S2"], g_rows, caption="Gruppenphase"))
+def export_turnier_uebersicht_pdf(turnier_id: int, path: Optional[str] = None,
+                                  snapshot: Optional[TurnierSnapshot] = None, backend: Optional[str] = None) -> str:
+    snap = _snapshot(turnier_id, snapshot)
+    blocks: List[Block] = []
+
+    if snap.gruppen:
+        blocks.append(Tabelle(["Gruppe", "Runde/Match", "Spieler 1", "Spieler 2", "S1", "S2"],
+                              _uebersicht_gruppen_rows(snap), "Gruppenphase"))
+    else:
+        blocks.append(Absatz("Keine Gruppenspiele vorhanden.", "warn"))
+
+    if snap.ko:
+        blocks.append(Tabelle(["Runde", "Match", "Spieler 1", "Spieler 2", "S1", "S2"],
+                              _uebersicht_ko_rows(snap), "KO-Phase"))
     else:
-        blocks.append("<div class='warn'>Keine Gruppenspiele vorhanden.</div>")
-
-    rounds = _ko_rounds_with_counts(turnier_id)
-    if rounds:
-        k_rows: List[List[object]] = []
-        for r, cnt in rounds:
-            rname = "Bronze" if r == 99 else _ko_round_label_from_match_count(cnt)
-            matches = fetch_ko_matches(turnier_id, r)
-            for _id, match_no, n1, n2, s1, s2 in matches:
-                k_rows.append([rname, match_no, n1, n2, "" if s1 is None else s1, "" if s2 is None else s2])
-        blocks.append(_html_table(["Runde", "Match", "Spieler 1", "Spieler 2", "S1", "S2"], k_rows, caption="KO-Phase"))
+        blocks.append(Absatz("Keine KO-Spiele vorhanden.", "warn"))
+
+    final_path = path or unique_path(ensure_exports_dir(), _turnier_base_name("turnier-uebersicht", snap), "pdf")
+    return save_pdf("Ergebnis-Übersicht", _turnier_intro(snap), blocks, final_path, "portrait", backend)
+
+# ------------------------- Sammel-Export ("Alles") ---------------------
+# Alle Turnier-Artefakte aus einem Snapshot je Turnier. CSV-Dateien schreiben Worker-Threads,
+# Qt-PDFs entstehen derweil auf dem aufrufenden Thread – QTextDocument/QPrinter sind nicht
+# threadsicher und brauchen eine Q(Gui)Application im Hauptthread. Das interne PDF-Backend
+# ist reines Python und läuft mit im Pool.
+# Worker-Jobs bekommen nur fertige Daten und greifen nie auf die DB zu: jeder Thread hielte
+# sonst eine eigene, nie geschlossene Verbindung (database/connection.py). Was aus der DB
+# streamt (Saison-Spiele), läuft auf dem aufrufenden Thread.
+
+ExportFn = Callable[..., str]
+
+# key -> (Dateipräfix, CSV, PDF) – Reihenfolge = Reihenfolge im Bericht
+ARTEFAKTE: Tuple[Tuple[str, str, ExportFn, ExportFn], ...] = (
+    ("teilnehmer", "turnier-teilnehmer", export_turnier_teilnehmer_csv, export_turnier_teilnehmer_pdf),
+    ("spielplan", "gruppen-spielplan", export_gruppen_spielplan_csv, export_gruppen_spielplan_pdf),
+    ("tabellen", "gruppen-tabellen", export_gruppen_tabellen_csv, export_gruppen_tabellen_pdf),
+    ("ko", "ko-uebersicht", export_ko_csv, export_ko_pdf),
+    ("uebersicht", "turnier-uebersicht", export_turnier_uebersicht_csv, export_turnier_uebersicht_pdf),
+)
+
+
+class ExportErgebnis(NamedTuple):
+    turnier_id: Optional[int]   # None = Meisterschafts-Rangliste
+    artefakt: str               # Key aus ARTEFAKTE, "snapshot" (Daten laden) oder "rangliste"
+    format: str                 # "csv" / "pdf" / "" bei snapshot
+    pfad: str
+    sekunden: float
+    fehler: Optional[str] = None
+
+
+def _timed(tid: Optional[int], artefakt: str, fmt: str, path: str, fn: Callable[[], object]) -> ExportErgebnis:
+    t0 = time.perf_counter()
+    try:
+        fn()
+        return ExportErgebnis(tid, artefakt, fmt, path, time.perf_counter() - t0)
+    except Exception as e:  # ein kaputtes Artefakt bricht den Lauf nicht ab
+        return ExportErgebnis(tid, artefakt, fmt, path, time.perf_counter() - t0, f"{type(e).__name__}: {e}")
+
+
+def _run_batch(jobs: List[Tuple[Optional[int], str, str, str, Callable[[], object]]], workers: int,
+               pdf_parallel: bool = False, lokal: Sequence[str] = ()) -> List[ExportErgebnis]:
+    """CSV-Jobs (und bei pdf_parallel auch PDFs) im Pool, den Rest nacheinander hier; Ergebnisse in Job-Reihenfolge.
+
+    lokal: Artefakte, die die DB lesen – laufen immer auf dem aufrufenden Thread.
+    """
+    out: List[Optional[ExportErgebnis]] = [None] * len(jobs)
+    futures: List[Tuple[int, Future]] = []
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="export") if workers > 0 else None
+    in_pool = [pool is not None and job[1] not in lokal and (job[2] == "csv" or pdf_parallel) for job in jobs]
+    try:
+        for i, job in enumerate(jobs):
+            if in_pool[i]:
+                futures.append((i, pool.submit(_timed, *job)))
+        for i, job in enumerate(jobs):
+            if not in_pool[i]:
+                out[i] = _timed(*job)
+        for i, fut in futures:
+            out[i] = fut.result()
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+    return [e for e in out if e is not None]
+
+
+def _turnier_jobs(snap: TurnierSnapshot, formate: Sequence[str], artefakte: Optional[Sequence[str]],
+                  ziel: str, taken: Set[str], backend: str) -> List[Tuple[Optional[int], str, str, str, Callable[[], object]]]:
+    jobs: List[Tuple[Optional[int], str, str, str, Callable[[], object]]] = []
+    for key, prefix, csv_fn, pdf_fn in ARTEFAKTE:
+        if artefakte is not None and key not in artefakte:
+            continue
+        for fmt, fn, kw in (("csv", csv_fn, {}), ("pdf", pdf_fn, {"backend": backend})):
+            if fmt not in formate:
+                continue
+            # Pfade hier vergeben (nicht in den Threads), sonst kollidieren gleichnamige Turniere
+            path = unique_path(ziel, _turnier_base_name(prefix, snap), fmt, taken)
+            jobs.append((snap.id, key, fmt, path,
+                         lambda fn=fn, path=path, kw=kw: fn(snap.id, path=path, snapshot=snap, **kw)))
+    return jobs
+
+
+def _load_snapshot_timed(turnier_id: int) -> Tuple[Optional[TurnierSnapshot], ExportErgebnis]:
+    t0 = time.perf_counter()
+    try:
+        snap = fetch_turnier_snapshot(turnier_id)
+        return snap, ExportErgebnis(turnier_id, "snapshot", "", "", time.perf_counter() - t0)
+    except Exception as e:
+        return None, ExportErgebnis(turnier_id, "snapshot", "", "", time.perf_counter() - t0, f"{type(e).__name__}: {e}")
+
+
+def export_turnier_alles(turnier_id: int, formate: Sequence[str] = ("csv", "pdf"),
+                         artefakte: Optional[Sequence[str]] = None, ziel: Optional[str] = None,
+                         workers: int = 4, backend: Optional[str] = None) -> List[ExportErgebnis]:
+    """Alle (bzw. die gewählten) Artefakte eines Turniers aus einem Snapshot; workers=0 -> alles seriell."""
+    ziel = ziel or ensure_exports_dir()
+    os.makedirs(ziel, exist_ok=True)
+    backend = backend or get_pdf_backend()
+    snap, lade = _load_snapshot_timed(turnier_id)
+    if snap is None:
+        return [lade]
+    jobs = _turnier_jobs(snap, formate, artefakte, ziel, set(), backend)
+    return [lade] + _run_batch(jobs, workers, pdf_parallel=backend == "intern")
+
+
+def export_meisterschaft_alles(ms_id: int, formate: Sequence[str] = ("csv", "pdf"),
+                               ziel: Optional[str] = None, workers: int = 4,
+                               backend: Optional[str] = None) -> List[ExportErgebnis]:
+    """Rangliste plus alle Artefakte jedes Turniers der Meisterschaft in einem Lauf (ein Pool für alle CSVs)."""
+    ziel = ziel or ensure_exports_dir()
+    os.makedirs(ziel, exist_ok=True)
+    backend = backend or get_pdf_backend()
+    taken: Set[str] = set()
+    out: List[ExportErgebnis] = []
+    jobs: List[Tuple[Optional[int], str, str, str, Callable[[], object]]] = []
+
+    # Rangliste & Name hier laden – die Worker bekommen nur die Daten
+    ms = _ms_name(ms_id)
+    daten = {"rangliste": compute_meisterschaft_rangliste(ms_id), "ms": ms}
+    for key, fmt, fn, kw in (("rangliste", "csv", export_meisterschaft_rangliste_csv, daten),
+                             ("rangliste", "pdf", export_meisterschaft_rangliste_pdf, dict(daten, backend=backend)),
+                             ("spiele", "csv", export_meisterschaft_spiele_csv, {})):  # Saison-Spiele gestreamt, nur CSV
+        if fmt in formate:
+            path = unique_path(ziel, _ms_base_name(key, ms_id, ms), fmt, taken)
+            jobs.append((None, key, fmt, path, lambda fn=fn, path=path, kw=kw: fn(ms_id, path=path, **kw)))
+
+    for tid in fetch_meisterschaft_turnier_ids(ms_id):
+        snap, lade = _load_snapshot_timed(tid)
+        out.append(lade)
+        if snap is not None:
+            jobs += _turnier_jobs(snap, formate, None, ziel, taken, backend)
+    # "spiele" streamt aus der DB (Cursor) -> auf diesem Thread, parallel zum Pool
+    return out + _run_batch(jobs, workers, pdf_parallel=backend == "intern", lokal=("spiele",))
+
+
+def format_report(ergebnisse: Sequence[ExportErgebnis]) -> str:
+    """Zeitbericht je Artefakt (Klartext, für MessageBox und Konsole)."""
+    lines: List[str] = []
+    for e in ergebnisse:
+        wer = "Meisterschaft" if e.turnier_id is None else f"Turnier {e.turnier_id}"
+        was = f"{e.artefakt} ({e.format})" if e.format else e.artefakt
+        status = f"FEHLER {e.fehler}" if e.fehler else os.path.basename(e.pfad)
+        lines.append(f"{wer:<12} {was:<18} {e.sekunden * 1000:8.1f} ms  {status}".rstrip())
+    total = sum(e.sekunden for e in ergebnisse)
+    fehler = sum(1 for e in ergebnisse if e.fehler)
+    lines.append(f"{len(ergebnisse)} Schritte, Summe {total * 1000:.1f} ms" + (f", {fehler} Fehler" if fehler else ""))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Headless: python -m utils.exporter --meisterschaft ID | --turnier ID [--format csv|pdf] [--pdf-backend qt|intern] [--ziel DIR]"""
+    import argparse
+    ap = argparse.ArgumentParser(prog="python -m utils.exporter", description="Sammel-Export ohne Oberfläche")
+    g = ap.add_mutually_exclusive_group(required=True)
+    g.add_argument("--meisterschaft", type=int, metavar="ID")
+    g.add_argument("--turnier", type=int, metavar="ID")
+    ap.add_argument("--format", choices=("csv", "pdf"), action="append", help="mehrfach möglich; Standard: beide")
+    ap.add_argument("--ziel", help="Zielordner (Standard: Export-Ordner aus den Settings)")
+    ap.add_argument("--pdf-backend", choices=PDF_BACKENDS, help="Standard: Einstellung (qt); intern = ohne PyQt6")
+    ap.add_argument("--workers", type=int, default=4, help="Threads für CSV und interne PDFs (0 = seriell)")
+    args = ap.parse_args(argv)
+    formate = tuple(args.format or ("csv", "pdf"))
+    backend = args.pdf_backend or get_pdf_backend()
+
+    app = None
+    if "pdf" in formate and backend == "qt":
+        from PyQt6.QtGui import QGuiApplication
+        if QGuiApplication.instance() is None:
+            # QTextDocument/QPrinter brauchen eine Anwendung; ohne Display über die Offscreen-Plattform
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            app = QGuiApplication([sys.argv[0]])
+
+    if args.meisterschaft is not None:
+        res = export_meisterschaft_alles(args.meisterschaft, formate, args.ziel, args.workers, backend)
     else:
-        blocks.append("<div class='warn'>Keine KO-Spiele vorhanden.</div>")
-
-    intro = [f"Turnier: <b>{info.name}</b>" + (f" ({info.datum})" if info.datum else "")]
-    html = _html_wrap("Ergebnis-Übersicht", intro, blocks)
-    base_dir = ensure_exports_dir()
-    base_name = f"turnier-uebersicht__{info.name.replace(' ', '-')}" + (f"-{info.datum}" if info.datum else "")
-    base_name += f"__{timestamp()}"
-    final_path = path or unique_path(base_dir, base_name, "pdf")
-    return save_pdf_from_html(html, final_path, orientation="portrait")
+        res = export_turnier_alles(args.turnier, formate, None, args.ziel, args.workers, backend)
+    print(format_report(res))
+    del app
+    return 1 if any(e.fehler for e in res) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+# utils/pdfwriter.py
+# Schlanker PDF-Schreiber ohne Qt (nur Stdlib): setzt Titel, Intro-Zeilen, Hinweise und Tabellen
+# direkt in PDF-Content-Streams. Schriften: Standard-Type1 Helvetica / Helvetica-Bold mit
+# WinAnsiEncoding (Umlaute, ß, –), daher nichts einzubetten. Benutzt von utils/exporter.py.
+from __future__ import annotations
+
+import html
+import re
+import unicodedata
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class Tabelle(NamedTuple):
+    headers: Sequence[str]
+    rows: Sequence[Sequence[object]]
+    caption: Optional[str] = None
+
+
+class Absatz(NamedTuple):
+    html: str              # HTML-Fragment wie im Qt-Pfad; ausgewertet werden nur <b>…</b> und Entities
+    klasse: str = "meta"   # "meta" | "warn"
+
+
+Block = Union[Tabelle, Absatz]
+
+
+class Dokument(NamedTuple):
+    titel: str
+    intro: Sequence[str]
+    bloecke: Sequence[Block]
+    fusszeile: str = ""
+
+
+# ------------------------------------------------------------
+# Metrik (Helvetica-AFM, 1/1000 em) für ASCII 32..126
+# ------------------------------------------------------------
+_W_REGULAR = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_W_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+_W_EXTRA = {"ß": (611, 611), "–": (556, 556), "—": (1000, 1000), "…": (1000, 1000), "€": (556, 556), "°": (400, 400)}
+_widths: Tuple[Dict[str, int], Dict[str, int]] = ({}, {})
+
+
+def _char_width(ch: str, bold: bool) -> int:
+    cache = _widths[bold]
+    w = cache.get(ch)
+    if w is None:
+        base = unicodedata.normalize("NFKD", ch)[:1] or ch  # ä -> a, É -> E
+        if ch in _W_EXTRA:
+            w = _W_EXTRA[ch][bold]
+        elif 32 <= ord(base) <= 126:
+            w = (_W_BOLD if bold else _W_REGULAR)[ord(base) - 32]
+        else:
+            w = 556
+        cache[ch] = w
+    return w
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    return sum(_char_width(c, bold) for c in text) * size / 1000.0
+
+
+def _fit(text: str, width: float, size: float, bold: bool) -> str:
+    """Kürzt auf width (mit …) – Tabellenzeilen haben feste Höhe, umbrochen wird nicht."""
+    if text_width(text, size, bold) <= width:
+        return text
+    limit = width * 1000.0 / size - _char_width("…", bold)
+    used = 0
+    for i, c in enumerate(text):
+        used += _char_width(c, bold)
+        if used > limit:
+            return text[:i] + "…"
+    return text
+
+
+def _pdf_str(text: str) -> bytes:
+    raw = text.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"\\r") + b")"
+
+
+_TAG_B = re.compile(r"(</?b>)", re.IGNORECASE)
+
+
+def _runs(fragment: str) -> List[Tuple[str, bool]]:
+    """HTML-Fragment -> [(Text, fett)]; nur <b> wird ausgewertet."""
+    out: List[Tuple[str, bool]] = []
+    bold = False
+    for part in _TAG_B.split(fragment):
+        low = part.lower()
+        if low == "<b>":
+            bold = True
+        elif low == "</b>":
+            bold = False
+        elif part:
+            out.append((html.unescape(part), bold))
+    return out
+
+
+# ------------------------------------------------------------
+# Layout (Maße in pt, angelehnt an das CSS der HTML-Exporte)
+# ------------------------------------------------------------
+A4 = (595.276, 841.89)
+MARGIN = 12 * 72 / 25.4
+BODY, H1, H2, META, WARN, FOOT = 11.0, 18.0, 14.0, 9.0, 10.0, 8.0
+LEADING = 1.2
+PAD_X, PAD_Y = 6.0, 4.0
+GRAY_TEXT = b"0.4 0.4 0.4 rg"
+RED_TEXT = b"0.69 0 0 rg"
+HEAD_BG = b"0.941 g"
+ZEBRA_BG = b"0.98 g"
+BORDER = b"0.8 G 0.5 w"
+
+
+class _Seiten:
+    """Sammelt Content-Streams; y läuft von oben nach unten."""
+
+    def __init__(self, width: float, height: float) -> None:
+        self.width, self.height = width, height
+        self.pages: List[List[bytes]] = []
+        self.y = 0.0
+        self.new_page()
+
+    @property
+    def ops(self) -> List[bytes]:
+        return self.pages[-1]
+
+    def new_page(self) -> None:
+        self.pages.append([BORDER])
+        self.y = self.height - MARGIN
+
+    def need(self, h: float) -> None:
+        if self.y - h < MARGIN and self.y < self.height - MARGIN:
+            self.new_page()
+
+    def text(self, x: float, baseline: float, s: str, size: float, bold: bool = False) -> None:
+        self.ops.append(b"BT /F%d %g Tf %.2f %.2f Td %s Tj ET" % (2 if bold else 1, size, x, baseline, _pdf_str(s)))
+
+    def line(self, fragment: str, size: float, color: Optional[bytes] = None, bold: bool = False,
+             is_html: bool = True) -> None:
+        """Eine Textzeile (HTML-Fragment mit <b>-Abschnitten oder Klartext), bei Überlänge gekürzt."""
+        h = size * LEADING
+        self.need(h)
+        baseline = self.y - size * (LEADING - 1) / 2 - size * 0.718
+        if color:
+            self.ops.append(color)
+        x, right = MARGIN, self.width - MARGIN
+        for text, b in (_runs(fragment) if is_html else [(fragment, False)]):
+            b = b or bold
+            text = _fit(text, right - x, size, b)
+            self.text(x, baseline, text, size, b)
+            x += text_width(text, size, b)
+        if color:
+            self.ops.append(b"0 g")
+        self.y -= h
+
+    def table(self, t: Tabelle) -> None:
+        avail = self.width - 2 * MARGIN
+        headers = [str(h) for h in t.headers]
+        rows = [["" if v is None else str(v) for v in r] for r in t.rows]
+        widths = _column_widths(headers, rows, avail)
+        row_h = BODY * LEADING + 2 * PAD_Y
+        baseline_off = PAD_Y + BODY * (LEADING - 1) / 2 + BODY * 0.718
+        xs = [MARGIN]
+        for w in widths:
+            xs.append(xs[-1] + w)
+
+        if t.caption:
+            self.need(H2 * LEADING + 12 + 6 + 2 * row_h)  # Überschrift nicht allein am Seitenende
+            self.y -= 12
+            self.line(t.caption, H2, bold=True, is_html=False)
+            self.y -= 6
+        seg_top = [0.0]
+
+        def row(cells: Sequence[str], bg: Optional[bytes], bold: bool) -> None:
+            top, ops = self.y, self.ops
+            if bg:
+                ops.append(b"%s %.2f %.2f %.2f %.2f re f 0 g" % (bg, MARGIN, top - row_h, avail, row_h))
+            ops.append(b"%.2f %.2f m %.2f %.2f l S" % (MARGIN, top - row_h, MARGIN + avail, top - row_h))
+            for i, c in enumerate(cells[:len(widths)]):
+                if c:
+                    self.text(xs[i] + PAD_X, top - baseline_off, _fit(c, widths[i] - 2 * PAD_X, BODY, bold), BODY, bold)
+            self.y -= row_h
+
+        def close_segment() -> None:
+            top, bottom = seg_top[0], self.y
+            self.ops.append(b"%.2f %.2f m %.2f %.2f l S" % (MARGIN, top, MARGIN + avail, top))
+            self.ops.extend(b"%.2f %.2f m %.2f %.2f l S" % (x, top, x, bottom) for x in xs)
+
+        def head() -> None:
+            seg_top[0] = self.y
+            row(headers, HEAD_BG, True)
+
+        self.need(2 * row_h)
+        head()
+        for n, cells in enumerate(rows, start=1):
+            if self.y - row_h < MARGIN:
+                close_segment()
+                self.new_page()
+                head()  # Kopfzeile auf jeder Folgeseite wiederholen
+            row(cells, ZEBRA_BG if n % 2 == 0 else None, False)
+        close_segment()
+
+
+def _column_widths(headers: Sequence[str], rows: Sequence[Sequence[str]], avail: float) -> List[float]:
+    """Natürliche Breite je Spalte; passt alles, wird proportional auf 100 % gestreckt, sonst
+    behalten schmale Spalten ihre Breite und die breiten teilen sich den Rest."""
+    n = len(headers)
+    nat = [text_width(h, BODY, True) + 2 * PAD_X for h in headers]
+    seen: List[set] = [set() for _ in range(n)]
+    for r in rows:
+        for i, c in enumerate(r[:n]):
+            if c not in seen[i]:
+                seen[i].add(c)
+                w = text_width(c, BODY) + 2 * PAD_X
+                if w > nat[i]:
+                    nat[i] = w
+    total = sum(nat)
+    if total <= avail:
+        return [w * avail / total for w in nat]
+    fixed = [False] * n
+    while True:
+        free = avail - sum(w for w, f in zip(nat, fixed) if f)
+        loose = [i for i in range(n) if not fixed[i]]
+        share = free / max(len(loose), 1)
+        narrow = [i for i in loose if nat[i] <= share]
+        if not narrow:
+            return [nat[i] if fixed[i] else share for i in range(n)]
+        for i in narrow:
+            fixed[i] = True
+
+
+def render(doc: Dokument, orientation: str = "portrait") -> List[bytes]:
+    """Content-Streams je Seite."""
+    w, h = A4 if orientation != "landscape" else (A4[1], A4[0])
+    s = _Seiten(w, h)
+    s.line(doc.titel, H1, bold=True, is_html=False)
+    s.y -= 6
+    for line in doc.intro:
+        s.line(line, META, GRAY_TEXT)
+        s.y -= 8
+    for b in doc.bloecke:
+        if isinstance(b, Tabelle):
+            s.table(b)
+        elif b.klasse == "warn":
+            s.line(b.html, WARN, RED_TEXT)
+            s.y -= 6
+        else:
+            s.line(b.html, META, GRAY_TEXT)
+            s.y -= 8
+    if doc.fusszeile:
+        s.y -= 8
+        s.line(doc.fusszeile, FOOT, GRAY_TEXT)
+    return [b"\n".join(p) for p in s.pages]
+
+
+def write_pdf(doc: Dokument, path: str, orientation: str = "portrait", producer: str = "") -> str:
+    """Schreibt doc als PDF 1.4 (Content-Streams Flate-komprimiert) nach path."""
+    w, h = A4 if orientation != "landscape" else (A4[1], A4[0])
+    streams = render(doc, orientation)
+    objs: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # Pages, unten gefüllt
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        b"<< /Title %s /Producer %s >>" % (_pdf_str(doc.titel), _pdf_str(producer)),
+    ]
+    kids: List[bytes] = []
+    for content in streams:
+        data = zlib.compress(content, 6)
+        objs.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(data), data))
+        objs.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.3f %.3f] /Contents %d 0 R "
+                    b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>" % (w, h, len(objs)))
+        kids.append(b"%d 0 R" % len(objs))
+    objs[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets: List[int] = []
+    for i, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (i, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info 5 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    with open(path, "wb") as fh:
+        fh.write(out)
+    return path
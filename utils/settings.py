@@ -12,6 +12,7 @@ SETTINGS_PATH = os.path.join(DATA_DIR, "settings.json")
 
 DEFAULTS: Dict[str, Any] = {
     "export_dir": os.path.join(PROJECT_ROOT, "exports"),
+    "pdf_backend": "qt",  # "qt" (QTextDocument/QPrinter) oder "intern" (utils/pdfwriter, ohne PyQt6)
 }
 
 def _ensure_dirs() -> None:
@@ -69,3 +70,15 @@ def set_export_dir(path: str) -> str:
 
 def reset_export_dir_to_default() -> str:
     return set_export_dir(DEFAULTS["export_dir"])
+
+# PDF-Backend ---------------------------------------------------------------
+
+def get_pdf_backend() -> str:
+    b = str(get_value("pdf_backend", DEFAULTS["pdf_backend"]))
+    return b if b in ("qt", "intern") else DEFAULTS["pdf_backend"]
+
+def set_pdf_backend(backend: str) -> str:
+    if backend not in ("qt", "intern"):
+        raise ValueError(f"Unbekanntes PDF-Backend: {backend}")
+    set_value("pdf_backend", backend)
+    return backend
@@ -1 +1,33 @@
-# Spielplan-Generator 
+# utils/spielplan_generator.py
+# Spielplan-Generator: Jeder-gegen-jeden nach der Kreismethode (Position 0 fest, Rest rotiert).
+# Die Paarungstabelle hängt nur von der Gruppengröße ab und wird je Größe einmal berechnet.
+from __future__ import annotations
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+
+@lru_cache(maxsize=64)
+def round_robin_table(n: int, legs: int = 1) -> Tuple[Tuple[int, int, int], ...]:
+    """Paarungstabelle für n Spieler als (runde, index_a, index_b), Freilos bereits entfernt.
+
+    Runde k (0-basiert) belegt Position j>0 mit Spieler 1 + (j-1-k) mod (n-1); gepaart wird
+    Position i mit n-1-i. legs=2 hängt die Rückrunde mit getauschtem Heimrecht an.
+    """
+    if n < 2:
+        return ()
+    size = n + (n % 2)  # ungerade: Freilos-Position (Index n)
+    rot = size - 1
+    half = size // 2
+    hin: List[Tuple[int, int, int]] = []
+    for k in range(rot):
+        pos = [0] + [1 + (j - 1 - k) % rot for j in range(1, size)]
+        hin.extend((k + 1, pos[i], pos[size - 1 - i]) for i in range(half) if pos[i] < n and pos[size - 1 - i] < n)
+    out = list(hin)
+    for leg in range(1, legs):
+        out.extend((r + leg * rot, b, a) if leg % 2 else (r + leg * rot, a, b) for r, a, b in hin)
+    return tuple(out)
+
+
+def round_robin_schedule(ids: Sequence[int], legs: int = 1) -> List[Tuple[int, int, int, int]]:
+    """Spielplan einer Gruppe als (runde, match_no, p1_id, p2_id); match_no läuft über alle Runden."""
+    return [(r, no, ids[a], ids[b]) for no, (r, a, b) in enumerate(round_robin_table(len(ids), legs), start=1)]
@@ -2,7 +2,8 @@
 # v0.9.2 – Kleine UI-Helfer (PyQt6)
 
 from __future__ import annotations
-from PyQt6.QtWidgets import QMessageBox, QWidget
+from typing import Dict, List, Set, Tuple
+from PyQt6.QtWidgets import QMessageBox, QTableWidget, QTableWidgetItem, QWidget
 
 def show_info(parent: QWidget, title: str, text: str) -> None:
     QMessageBox.information(parent, title, text)
@@ -13,3 +14,40 @@ def show_error(parent: QWidget, title: str, text: str) -> None:
 def ask_yes_no(parent: QWidget, title: str, text: str) -> bool:
     ret = QMessageBox.question(parent, title, text, QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
     return ret == QMessageBox.StandardButton.Yes
+
+
+class ScoreEdits:
+    """Merkt sich die geladenen S1/S2-Texte einer Ergebnis-Tabelle und welche Zeilen seither geändert wurden.
+
+    Nach jedem Befüllen reset() aufrufen; rows() liefert nur Zeilen, deren S1/S2 vom Stand beim Laden abweicht.
+    """
+
+    def __init__(self, table: QTableWidget, s1_col: int = 3, s2_col: int = 4):
+        self._tbl = table
+        self._cols = (s1_col, s2_col)
+        self._orig: Dict[int, Tuple[str, str]] = {}
+        self._dirty: Set[int] = set()
+        table.itemChanged.connect(self._on_item_changed)
+
+    def _texts(self, row: int) -> Tuple[str, str]:
+        out = []
+        for c in self._cols:
+            it = self._tbl.item(row, c)
+            out.append(it.text().strip() if it else "")
+        return out[0], out[1]
+
+    def reset(self) -> None:
+        self._orig = {r: self._texts(r) for r in range(self._tbl.rowCount())}
+        self._dirty.clear()
+
+    def _on_item_changed(self, item: QTableWidgetItem) -> None:
+        row = item.row()
+        if item.column() not in self._cols or row not in self._orig:
+            return
+        if self._texts(row) == self._orig[row]:
+            self._dirty.discard(row)
+        else:
+            self._dirty.add(row)
+
+    def rows(self) -> List[int]:
+        return sorted(self._dirty)
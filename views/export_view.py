@@ -5,7 +5,7 @@ from __future__ import annotations
 
 import os
 import sys
-from typing import Optional
+from typing import List, Optional, Sequence
 
 from PyQt6.QtCore import Qt, QUrl
 from PyQt6.QtGui import QDesktopServices
@@ -17,19 +17,14 @@ from PyQt6.QtWidgets import (
 from database.models import fetch_meisterschaften, fetch_turniere
 from utils.exporter import (
     ensure_exports_dir,
+    export_meisterschaft_alles,
     export_meisterschaft_rangliste_csv,
     export_meisterschaft_rangliste_pdf,
-    export_turnier_teilnehmer_csv,
-    export_turnier_teilnehmer_pdf,
-    export_gruppen_spielplan_csv,
-    export_gruppen_spielplan_pdf,
-    export_gruppen_tabellen_csv,
-    export_gruppen_tabellen_pdf,
-    export_ko_csv,
-    export_ko_pdf,
-    export_turnier_uebersicht_csv,
-    export_turnier_uebersicht_pdf,
+    export_turnier_alles,
+    format_report,
+    ExportErgebnis,
 )
+from utils.settings import get_pdf_backend, set_pdf_backend
 
 class ExportView(QWidget):
     def __init__(self, parent: Optional[QWidget] = None) -> None:
@@ -55,9 +50,12 @@ class ExportView(QWidget):
         self.btn_ms_pdf = QPushButton("Rangliste (PDF)")
         grid_ms.addWidget(self.btn_ms_csv, 1, 1)
         grid_ms.addWidget(self.btn_ms_pdf, 1, 2)
+        self.btn_ms_all = QPushButton("Alles exportieren (Rangliste + alle Turniere)")
+        grid_ms.addWidget(self.btn_ms_all, 2, 1, 1, 2)
 
         self.btn_ms_csv.clicked.connect(self._on_ms_csv)
         self.btn_ms_pdf.clicked.connect(self._on_ms_pdf)
+        self.btn_ms_all.clicked.connect(self._on_ms_all)
 
         # Turnier
         gb_tn = QGroupBox("Turnier-Exporte")
@@ -83,9 +81,12 @@ class ExportView(QWidget):
         self.btn_tn_pdf = QPushButton("Ausgewählte (PDF)")
         grid_tn.addWidget(self.btn_tn_csv, 4, 1)
         grid_tn.addWidget(self.btn_tn_pdf, 4, 2)
+        self.btn_tn_all = QPushButton("Alles exportieren (CSV + PDF)")
+        grid_tn.addWidget(self.btn_tn_all, 5, 1, 1, 2)
 
         self.btn_tn_csv.clicked.connect(self._on_tn_csv)
         self.btn_tn_pdf.clicked.connect(self._on_tn_pdf)
+        self.btn_tn_all.clicked.connect(self._on_tn_all)
 
         # Ausgabe / Ordner
         gb_out = QGroupBox("Ausgabe")
@@ -97,6 +98,13 @@ class ExportView(QWidget):
         lay_out.addWidget(QLabel("Zielordner:"))
         lay_out.addWidget(self.lbl_dir, 1)
         lay_out.addWidget(self.btn_open)
+        lay_out.addWidget(QLabel("PDF:"))
+        self.cmb_pdf = QComboBox()
+        self.cmb_pdf.addItem("Qt (Druck-Layout)", "qt")
+        self.cmb_pdf.addItem("Intern (schnell, ohne Qt)", "intern")
+        self.cmb_pdf.setCurrentIndex(max(0, self.cmb_pdf.findData(get_pdf_backend())))
+        self.cmb_pdf.currentIndexChanged.connect(lambda _i: set_pdf_backend(self._pdf_backend()))
+        lay_out.addWidget(self.cmb_pdf)
 
         root.addWidget(gb_ms)
         root.addWidget(gb_tn)
@@ -123,6 +131,9 @@ class ExportView(QWidget):
         idx = self.cmb_tn.currentIndex()
         return None if idx < 0 else int(self.cmb_tn.currentData())
 
+    def _pdf_backend(self) -> str:
+        return str(self.cmb_pdf.currentData() or "qt")
+
     def _notify_ok(self, path: str) -> None:
         QMessageBox.information(self, "Export", f"Erfolgreich exportiert:\n{path}")
 
@@ -158,56 +169,63 @@ class ExportView(QWidget):
             QMessageBox.warning(self, "Hinweis", "Bitte eine Meisterschaft auswählen.")
             return
         try:
-            path = export_meisterschaft_rangliste_pdf(ms_id)
+            path = export_meisterschaft_rangliste_pdf(ms_id, backend=self._pdf_backend())
             self._notify_ok(path)
         except Exception as e:
             self._notify_fail(e)
 
+    def _on_ms_all(self) -> None:
+        ms_id = self._current_ms_id()
+        if ms_id is None:
+            QMessageBox.warning(self, "Hinweis", "Bitte eine Meisterschaft auswählen.")
+            return
+        try:
+            self._notify_batch(export_meisterschaft_alles(ms_id, backend=self._pdf_backend()))
+        except Exception as e:
+            self._notify_fail(e)
+
     # Buttons: Turnier
-    def _on_tn_csv(self) -> None:
+    def _selected_artefakte(self) -> List[str]:
+        return [key for key, cb in (("spielplan", self.chk_spielplan), ("tabellen", self.chk_tabellen), ("ko", self.chk_ko),
+                                    ("uebersicht", self.chk_gesamt), ("teilnehmer", self.chk_spieler)) if cb.isChecked()]
+
+    def _notify_batch(self, res: Sequence[ExportErgebnis]) -> None:
+        paths = [e.pfad for e in res if e.pfad and not e.fehler]
+        fehler = [e for e in res if e.fehler]
+        box = QMessageBox.warning if fehler else QMessageBox.information
+        box(self, "Export", f"{len(paths)} Dateien exportiert nach:\n{ensure_exports_dir()}\n\n{format_report(res)}")
+
+    def _export_selected(self, fmt: str) -> None:
         tid = self._current_tn_id()
         if tid is None:
             QMessageBox.warning(self, "Hinweis", "Bitte ein Turnier auswählen.")
             return
-        if not any(cb.isChecked() for cb in (self.chk_spielplan, self.chk_tabellen, self.chk_ko, self.chk_gesamt, self.chk_spieler)):
+        artefakte = self._selected_artefakte()
+        if not artefakte:
             QMessageBox.information(self, "Hinweis", "Bitte mindestens einen Export-Typ auswählen.")
             return
         try:
-            paths = []
-            if self.chk_spielplan.isChecked():
-                paths.append(export_gruppen_spielplan_csv(tid))
-            if self.chk_tabellen.isChecked():
-                paths.append(export_gruppen_tabellen_csv(tid))
-            if self.chk_ko.isChecked():
-                paths.append(export_ko_csv(tid))
-            if self.chk_gesamt.isChecked():
-                paths.append(export_turnier_uebersicht_csv(tid))
-            if self.chk_spieler.isChecked():
-                paths.append(export_turnier_teilnehmer_csv(tid))
-            QMessageBox.information(self, "Export", "Erfolgreich exportiert:\n" + "\n".join(paths))
+            res = export_turnier_alles(tid, formate=(fmt,), artefakte=artefakte, backend=self._pdf_backend())
+            fehler = [e for e in res if e.fehler]
+            if fehler:
+                self._notify_batch(res)
+                return
+            QMessageBox.information(self, "Export", "Erfolgreich exportiert:\n" + "\n".join(e.pfad for e in res if e.pfad))
         except Exception as e:
             self._notify_fail(e)
 
+    def _on_tn_csv(self) -> None:
+        self._export_selected("csv")
+
     def _on_tn_pdf(self) -> None:
+        self._export_selected("pdf")
+
+    def _on_tn_all(self) -> None:
         tid = self._current_tn_id()
         if tid is None:
             QMessageBox.warning(self, "Hinweis", "Bitte ein Turnier auswählen.")
             return
-        if not any(cb.isChecked() for cb in (self.chk_spielplan, self.chk_tabellen, self.chk_ko, self.chk_gesamt, self.chk_spieler)):
-            QMessageBox.information(self, "Hinweis", "Bitte mindestens einen Export-Typ auswählen.")
-            return
         try:
-            paths = []
-            if self.chk_spielplan.isChecked():
-                paths.append(export_gruppen_spielplan_pdf(tid))
-            if self.chk_tabellen.isChecked():
-                paths.append(export_gruppen_tabellen_pdf(tid))
-            if self.chk_ko.isChecked():
-                paths.append(export_ko_pdf(tid))
-            if self.chk_gesamt.isChecked():
-                paths.append(export_turnier_uebersicht_pdf(tid))
-            if self.chk_spieler.isChecked():
-                paths.append(export_turnier_teilnehmer_pdf(tid))
-            QMessageBox.information(self, "Export", "Erfolgreich exportiert:\n" + "\n".join(paths))
+            self._notify_batch(export_turnier_alles(tid, backend=self._pdf_backend()))
         except Exception as e:
             self._notify_fail(e)
@@ -10,9 +10,16 @@ from PyQt6.QtWidgets import (
     QAbstractItemView
 )
 
+from database.connection import get_connection
+from database.schema import column_map
+from database.namen import display_names
+from database.tabellen import TabellenZeile
+from database.scheduler import assign_group_boards, schedule_group_slots
+from database.boards import board_label
+from utils.ui import ScoreEdits
 from database.models import (
-    fetch_turniere, fetch_groups, fetch_group_matches, save_match_result,
-    generate_group_round_robin, has_group_matches, clear_group_matches,
+    fetch_turniere, fetch_groups, fetch_group_matches, save_results_batch,
+    generate_group_round_robin, has_group_matches, clear_group_matches, compute_group_tables,
 )
 
 # --------------------------------------------------------------
@@ -34,44 +41,13 @@ RANK_MODE_KEY_TO_LABEL = {v: k for k, v in RANK_MODE_LABEL_TO_KEY.items()}
 # DB / Helpers
 # --------------------------------------------------------------
 
-def _ensure_schema_v094(con: sqlite3.Connection) -> None:
-    cur = con.cursor()
-    # 1) Ranglisten-Modus je Turnier
-    cur.execute("PRAGMA table_info(turniere);")
-    cols = {row[1] for row in cur.fetchall()}
-    if "group_rank_mode" not in cols:
-        cur.execute("ALTER TABLE turniere ADD COLUMN group_rank_mode TEXT NOT NULL DEFAULT 'punkte';")
-
-    # 2) Dartscheiben-Tabelle (CRUD ist im Einstellungen-Tab)
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS dartscheiben (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nummer INTEGER NOT NULL UNIQUE,
-            name TEXT NOT NULL,
-            aktiv INTEGER NOT NULL DEFAULT 1
-        );
-        """
-    )
-
-    # 3) Board-Zuordnung pro Gruppenspiel
-    cur.execute("PRAGMA table_info(spiele);")
-    s_cols = {row[1] for row in cur.fetchall()}
-    if "board_id" not in s_cols:
-        cur.execute("ALTER TABLE spiele ADD COLUMN board_id INTEGER NULL REFERENCES dartscheiben(id);")
-    con.commit()
-
-
 def _db() -> sqlite3.Connection:
-    con = sqlite3.connect(DB_PATH.as_posix())
-    con.row_factory = sqlite3.Row
-    _ensure_schema_v094(con)
-    return con
+    # Schema (group_rank_mode, dartscheiben, board_id) legt database/schema.py einmalig an
+    return get_connection(DB_PATH.as_posix())
 
 
 def _round_col(con: sqlite3.Connection) -> str:
-    cols = {r[1] for r in con.execute("PRAGMA table_info(spiele)").fetchall()}
-    return "spieltag" if "spieltag" in cols else "runde"
+    return column_map(DB_PATH.as_posix()).group_round or "runde"
 
 
 def _get_turnier_rank_mode(tid: int) -> str:
@@ -88,268 +64,20 @@ def _set_turnier_rank_mode(tid: int, mode: str) -> None:
         con.commit()
 
 
-def _boards_list(only_active: bool = True) -> List[sqlite3.Row]:
-    with _db() as con:
-        if only_active:
-            return list(con.execute("SELECT * FROM dartscheiben WHERE aktiv=1 ORDER BY nummer").fetchall())
-        return list(con.execute("SELECT * FROM dartscheiben ORDER BY aktiv DESC, nummer").fetchall())
-
-
-def _board_name(board_row: sqlite3.Row | None) -> str:
-    if not board_row:
-        return ""
-    return f"{board_row['nummer']} – {board_row['name']}"
-
-
-def _get_board(board_id: Optional[int]) -> Optional[sqlite3.Row]:
-    if not board_id:
-        return None
-    with _db() as con:
-        return con.execute("SELECT * FROM dartscheiben WHERE id=?", (board_id,)).fetchone()
-
-
 def _assign_boards_fair_for_group(tid: int, gid: int) -> None:
-    """Weist allen Gruppenspielen faire Boards zu (min Spieler×Board-Nutzung, dann globale Last, dann Nummer)."""
-    boards = _boards_list(True)
-    if not boards:
-        return
-
-    with _db() as con:
-        rc = _round_col(con)
-        matches = con.execute(
-            f"""
-            SELECT s.id as mid, s.{rc} as runde, s.match_no, s.p1_id, s.p2_id, s.board_id
-            FROM spiele s
-            WHERE s.turnier_id=? AND s.gruppe_id=?
-            ORDER BY s.{rc}, s.match_no, s.id
-            """,
-            (tid, gid),
-        ).fetchall()
-
-        # Nutzungszähler
-        count_sb: Dict[Tuple[int, int], int] = {}
-        count_b: Dict[int, int] = {int(b["id"]): 0 for b in boards}
-
-        # Historie (alle Spiele des Turniers)
-        hist = con.execute(
-            "SELECT p1_id, p2_id, board_id FROM spiele WHERE turnier_id=? AND board_id IS NOT NULL",
-            (tid,),
-        ).fetchall()
-        for row in hist:
-            b = row["board_id"]
-            if not b:
-                continue
-            for pid in (row["p1_id"], row["p2_id"]):
-                if pid is None:
-                    continue
-                count_sb[(pid, b)] = count_sb.get((pid, b), 0) + 1
-            count_b[b] = count_b.get(b, 0) + 1
-
-        # Zuweisung
-        for m in matches:
-            if m["board_id"]:
-                # vorhandene Zuweisung mitzählen
-                b = int(m["board_id"])
-                for pid in (m["p1_id"], m["p2_id"]):
-                    if pid is None:
-                        continue
-                    count_sb[(pid, b)] = count_sb.get((pid, b), 0) + 1
-                count_b[b] = count_b.get(b, 0) + 1
-                continue
-
-            p1, p2 = m["p1_id"], m["p2_id"]
-            best_bid = None
-            best_tuple = None  # (sum players on board, global board load, board number)
-            for b in boards:
-                bid = int(b["id"])
-                sum_players = 0
-                for pid in (p1, p2):
-                    if pid is None:
-                        continue
-                    sum_players += count_sb.get((pid, bid), 0)
-                tup = (sum_players, count_b.get(bid, 0), int(b["nummer"]))
-                if best_tuple is None or tup < best_tuple:
-                    best_tuple = tup
-                    best_bid = bid
-
-            if best_bid is None:
-                best_bid = int(boards[0]["id"])
-
-            con.execute("UPDATE spiele SET board_id=? WHERE id=?", (best_bid, int(m["mid"])) )
-            # Zähler updaten
-            count_b[best_bid] = count_b.get(best_bid, 0) + 1
-            for pid in (p1, p2):
-                if pid is None:
-                    continue
-                count_sb[(pid, best_bid)] = count_sb.get((pid, best_bid), 0) + 1
-        con.commit()
+    """Weist allen offenen Gruppenspielen Scheiben zu – je Spieltag als Zuordnungsproblem (database/scheduler.py)."""
+    assign_group_boards(tid, gid, DB_PATH.as_posix())
 
 
 # --------------------------------------------------------------
-# Ranglistenberechnung (inkl. Tie-Breaks & 3er-Tabelle)
+# Ranglistenberechnung (inkl. Tie-Breaks & 3er-Tabelle) – database/tabellen.py
 # --------------------------------------------------------------
 
-def _fetch_group_raw(con: sqlite3.Connection, tid: int, gid: int) -> Tuple[List[int], Dict[int, Dict[str, Any]], List[sqlite3.Row]]:
-    """Liefert (spieler_ids, spieler_info, matches_rows). Verwendet Tabelle 'teilnehmer'."""
-    players = con.execute(
-        """
-        SELECT DISTINCT t.id, COALESCE(NULLIF(TRIM(t.spitzname),''), t.name) AS name
-        FROM spiele s
-        JOIN teilnehmer t ON t.id IN (s.p1_id, s.p2_id)
-        WHERE s.turnier_id=? AND s.gruppe_id=?
-        ORDER BY name
-        """,
-        (tid, gid),
-    ).fetchall()
-    pids = [int(r["id"]) for r in players]
-    pinfo = {int(r["id"]): {"name": str(r["name"]) } for r in players}
-
-    rc = _round_col(con)
-    # Ergebnis-Spalten neutralisieren (sets1/sets2 ODER s1/s2)
-    cols = {r[1] for r in con.execute("PRAGMA table_info(spiele)").fetchall()}
-    s1c = "sets1" if "sets1" in cols else ("s1" if "s1" in cols else "")
-    s2c = "sets2" if "sets2" in cols else ("s2" if "s2" in cols else "")
-    if not s1c or not s2c:
-        raise RuntimeError("Spalten fuer Ergebnisse (sets1/sets2 oder s1/s2) fehlen in 'spiele'.")
-
-    matches = con.execute(
-        f"""
-        SELECT id, {rc} AS runde, match_no, p1_id, p2_id, {s1c} AS sets1, {s2c} AS sets2
-        FROM spiele
-        WHERE turnier_id=? AND gruppe_id=?
-        ORDER BY {rc}, match_no, id
-        """,
-        (tid, gid),
-    ).fetchall()
-    return pids, pinfo, matches
-
-
-def _compute_table(tid: int, gid: int, mode: str) -> Tuple[List[Dict[str, Any]], List[List[int]]]:
-    with _db() as con:
-        pids, pinfo, matches = _fetch_group_raw(con, tid, gid)
-
-        stats = {
-            pid: {"spiele": 0, "siege": 0, "niederlagen": 0, "lf": 0, "la": 0, "pkt": 0}
-            for pid in pids
-        }
-
-        # Ergebnisse verarbeiten (keine Unentschieden erlaubt)
-        for m in matches:
-            s1, s2 = m["sets1"], m["sets2"]
-            p1, p2 = m["p1_id"], m["p2_id"]
-            if s1 is None or s2 is None:
-                continue
-            if p1 is None or p2 is None:
-                continue
-            s1 = int(s1); s2 = int(s2)
-            stats[p1]["spiele"] += 1
-            stats[p2]["spiele"] += 1
-            stats[p1]["lf"] += s1
-            stats[p1]["la"] += s2
-            stats[p2]["lf"] += s2
-            stats[p2]["la"] += s1
-            if s1 == s2:
-                continue
-            if s1 > s2:
-                stats[p1]["siege"] += 1
-                stats[p2]["niederlagen"] += 1
-                stats[p1]["pkt"] += 3
-            else:
-                stats[p2]["siege"] += 1
-                stats[p1]["niederlagen"] += 1
-                stats[p2]["pkt"] += 3
-
-        def sort_key(pid: int) -> Tuple:
-            diff = stats[pid]["lf"] - stats[pid]["la"]
-            if mode == "punkte":
-                return (-stats[pid]["pkt"], -diff, -stats[pid]["siege"], -stats[pid]["lf"], stats[pid]["la"], pinfo[pid]["name"])  # noqa
-            elif mode == "differenz":
-                return (-diff, -stats[pid]["pkt"], -stats[pid]["siege"], -stats[pid]["lf"], stats[pid]["la"], pinfo[pid]["name"])  # noqa
-            else:  # siege
-                return (-stats[pid]["siege"], -stats[pid]["pkt"], -diff, -stats[pid]["lf"], stats[pid]["la"], pinfo[pid]["name"])  # noqa
-
-        ordered = sorted(pids, key=sort_key)
-
-        def primary_tuple(pid: int) -> Tuple:
-            diff = stats[pid]["lf"] - stats[pid]["la"]
-            if mode == "punkte":
-                return (stats[pid]["pkt"], diff)
-            elif mode == "differenz":
-                return (diff,)
-            else:
-                return (stats[pid]["siege"], stats[pid]["pkt"], diff)
-
-        tie_groups: List[List[int]] = []
-        i = 0; n = len(ordered)
-        while i < n:
-            j = i + 1
-            base = primary_tuple(ordered[i])
-            group = [ordered[i]]
-            while j < n and primary_tuple(ordered[j]) == base:
-                group.append(ordered[j]); j += 1
-            if len(group) >= 2:
-                resolved = _resolve_ties_subtable(group, stats, matches, pinfo, mode)
-                ordered[i:j] = resolved
-                if len(resolved) >= 2:
-                    # Noch immer voll gleich? -> Stichmatch-Gruppe merken
-                    def sk(pid: int):
-                        diff = stats[pid]["lf"] - stats[pid]["la"]
-                        if mode == "punkte":
-                            return (stats[pid]["pkt"], diff, stats[pid]["siege"])
-                        elif mode == "differenz":
-                            return (diff, stats[pid]["pkt"], stats[pid]["siege"])
-                        else:
-                            return (stats[pid]["siege"], stats[pid]["pkt"], diff)
-                    base2 = sk(resolved[0])
-                    if all(sk(x) == base2 for x in resolved):
-                        tie_groups.append(resolved[:])
-            i = j
-
-        rows: List[Dict[str, Any]] = []
-        for pid in ordered:
-            diff = stats[pid]["lf"] - stats[pid]["la"]
-            rows.append({
-                "spieler": pinfo[pid]["name"],
-                "spiele": stats[pid]["spiele"],
-                "siege": stats[pid]["siege"],
-                "niederlagen": stats[pid]["niederlagen"],
-                "lf": stats[pid]["lf"],
-                "la": stats[pid]["la"],
-                "diff": diff,
-                "pkt": stats[pid]["pkt"],
-                "pid": pid,
-            })
-        return rows, tie_groups
-
-
-def _resolve_ties_subtable(group: List[int], stats: Dict[int, Dict[str, int]], matches: List[sqlite3.Row], pinfo: Dict[int, Dict[str, str]], mode: str) -> List[int]:
-    # Sub-Stats aus Direktbegegnungen
-    sub = {pid: {"siege": 0, "pkt": 0, "lf": 0, "la": 0} for pid in group}
-    for m in matches:
-        p1, p2, s1, s2 = m["p1_id"], m["p2_id"], m["sets1"], m["sets2"]
-        if s1 is None or s2 is None:
-            continue
-        if p1 in sub and p2 in sub:
-            s1 = int(s1); s2 = int(s2)
-            sub[p1]["lf"] += s1; sub[p1]["la"] += s2
-            sub[p2]["lf"] += s2; sub[p2]["la"] += s1
-            if s1 == s2:
-                continue
-            if s1 > s2:
-                sub[p1]["siege"] += 1; sub[p1]["pkt"] += 3
-            else:
-                sub[p2]["siege"] += 1; sub[p2]["pkt"] += 3
-
-    def key(pid: int) -> Tuple:
-        diff = sub[pid]["lf"] - sub[pid]["la"]
-        if mode == "punkte":
-            return (-sub[pid]["pkt"], -diff, pinfo[pid]["name"])  # Punkte -> Diff -> Direktbegegnung steckt in Subtabelle
-        elif mode == "differenz":
-            return (-diff, pinfo[pid]["name"])  # Differenz -> Direktbegegnung
-        else:
-            return (-sub[pid]["siege"], -sub[pid]["pkt"], -diff, pinfo[pid]["name"])  # Siege -> Punkte -> Diff
-
-    return sorted(group, key=key)
+def _compute_table(tid: int, gid: int, mode: str) -> Tuple[List[TabellenZeile], List[List[int]]]:
+    tab = compute_group_tables(tid, mode).get(gid)
+    if tab is None:
+        return [], []
+    return list(tab.zeilen), [list(g) for g in tab.stichmatch]
 
 
 # --------------------------------------------------------------
@@ -399,14 +127,18 @@ class GruppenphaseView(QWidget):
         self.btn_assign_boards = QPushButton("Scheiben neu verteilen"); self.btn_assign_boards.clicked.connect(self._assign_boards_current_group)
         row.addWidget(self.btn_assign_boards)
 
+        self.btn_schedule = QPushButton("Zeitplan (Slots)"); self.btn_schedule.clicked.connect(self._schedule_slots)
+        self.btn_schedule.setToolTip("Alle offenen Gruppenspiele des Turniers in Wellen auf die aktiven Scheiben verteilen.")
+        row.addWidget(self.btn_schedule)
+
         root.addLayout(row)
 
         # Split: links Spiele, rechts Tabelle
         splitter = QSplitter(); splitter.setOrientation(Qt.Orientation.Horizontal)
 
         # Tabelle: Spiele (+ Board)
-        self.tbl_matches = QTableWidget(0, 6)
-        self.tbl_matches.setHorizontalHeaderLabels(["Runde", "Spieler 1", "Spieler 2", "S1", "S2", "Scheibe"])
+        self.tbl_matches = QTableWidget(0, 7)
+        self.tbl_matches.setHorizontalHeaderLabels(["Runde", "Spieler 1", "Spieler 2", "S1", "S2", "Scheibe", "Slot"])
         self.tbl_matches.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         # ✅ Editier-Modus: Benutzer kann S1/S2 per Doppelklick/AnyKey/EditKey öffnen
         self.tbl_matches.setEditTriggers(
@@ -414,6 +146,7 @@ class GruppenphaseView(QWidget):
             | QAbstractItemView.EditTrigger.EditKeyPressed
             | QAbstractItemView.EditTrigger.AnyKeyPressed
         )
+        self._edits = ScoreEdits(self.tbl_matches)  # nur geänderte S1/S2 werden gespeichert
         splitter.addWidget(self.tbl_matches)
 
         # Tabelle: Rangliste (komplett read-only)
@@ -495,15 +228,17 @@ class GruppenphaseView(QWidget):
         with _db() as con:
             rc = _round_col(con)
             rows = con.execute(
-                f"SELECT id, board_id FROM spiele WHERE turnier_id=? AND gruppe_id=? ORDER BY {rc}, match_no, id",
+                f"""
+                SELECT s.id, d.nummer, d.name, s.slot FROM spiele s
+                LEFT JOIN dartscheiben d ON d.id=s.board_id
+                WHERE s.turnier_id=? AND s.gruppe_id=? ORDER BY s.{rc}, s.match_no, s.id
+                """,
                 (tid, gid),
             ).fetchall()
-            board_map: Dict[int, str] = {}
-            for r in rows:
-                b = _get_board(r["board_id"]) if r["board_id"] else None
-                board_map[r["id"]] = _board_name(b)
+            board_map: Dict[int, str] = {r["id"]: board_label(r["nummer"], r["name"]) for r in rows}
+            slot_map: Dict[int, str] = {r["id"]: "" if r["slot"] is None else str(r["slot"]) for r in rows}
 
-        self._load_matches_into_table(matches, board_map)
+        self._load_matches_into_table(matches, board_map, slot_map)
 
         mode_key = _get_turnier_rank_mode(tid)
         rows, tie_groups = _compute_table(tid, gid, mode_key)
@@ -513,7 +248,8 @@ class GruppenphaseView(QWidget):
     # ----------------------------------------------------------
     # UI-Füller
     # ----------------------------------------------------------
-    def _load_matches_into_table(self, matches, board_map: Optional[Dict[int, str]] = None):
+    def _load_matches_into_table(self, matches, board_map: Optional[Dict[int, str]] = None,
+                                 slot_map: Optional[Dict[int, str]] = None):
         self._matches = matches[:]  # (id, runde, match_no, p1, p2, s1, s2)
         self.tbl_matches.setRowCount(len(matches))
         for r, (mid, runde, _mno, p1, p2, s1, s2) in enumerate(matches):
@@ -536,14 +272,18 @@ class GruppenphaseView(QWidget):
             board_txt = board_map.get(mid, "") if board_map else ""
             b_item = QTableWidgetItem(board_txt); b_item.setFlags(b_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
             self.tbl_matches.setItem(r, 5, b_item)
+            # Slot (read-only)
+            sl_item = QTableWidgetItem(slot_map.get(mid, "") if slot_map else ""); sl_item.setFlags(sl_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self.tbl_matches.setItem(r, 6, sl_item)
             # ID im UserRole hinterlegen auf einer read-only Zelle
             it_r.setData(Qt.ItemDataRole.UserRole, mid)
+        self._edits.reset()
 
-    def _load_table_into_table(self, rows: List[dict], tie_groups: List[List[int]], show_dialog: bool):
+    def _load_table_into_table(self, rows: List[TabellenZeile], tie_groups: List[List[int]], show_dialog: bool):
         self.tbl_table.setRowCount(len(rows))
         for r, row in enumerate(rows):
             for c, key in enumerate(["spieler", "spiele", "siege", "niederlagen", "lf", "la", "diff", "pkt"]):
-                it = QTableWidgetItem(str(row[key]))
+                it = QTableWidgetItem(str(getattr(row, key)))
                 it.setFlags(it.flags() & ~Qt.ItemFlag.ItemIsEditable)
                 self.tbl_table.setItem(r, c, it)
 
@@ -551,11 +291,8 @@ class GruppenphaseView(QWidget):
         if show_dialog and tie_groups:
             turnier = self.cbo_turnier.currentText() or "(kein Turnier)"
             gruppe = self.cbo_group.currentText() or "(keine Gruppe)"
-            namesets = []
-            with _db() as con:
-                for grp in tie_groups:
-                    n = [con.execute("SELECT COALESCE(NULLIF(TRIM(spitzname),''), name) FROM teilnehmer WHERE id=?", (pid,)).fetchone()[0] for pid in grp]
-                    namesets.append("- " + ", ".join(n))
+            names = display_names(DB_PATH.as_posix())
+            namesets = ["- " + ", ".join(names.get(pid, "") for pid in grp) for grp in tie_groups]
             QMessageBox.information(
                 self,
                 f"Stichmatch erforderlich – {turnier} | Gruppe {gruppe}",
@@ -610,20 +347,19 @@ class GruppenphaseView(QWidget):
         if not self._matches:
             QMessageBox.information(self, "Hinweis", "Kein Spiel geladen."); return
 
-        changed = 0
-        for r, (mid, _runde, _mno, _p1, _p2, _s1_old, _s2_old) in enumerate(self._matches):
-            s1_txt = self.tbl_matches.item(r, 3).text() if self.tbl_matches.item(r, 3) else ""
-            s2_txt = self.tbl_matches.item(r, 4).text() if self.tbl_matches.item(r, 4) else ""
+        def parse(v):
+            v = (v or "").strip()
+            return None if v == "" else int(v)
 
-            def parse(v):
-                v = (v or "").strip()
-                if v == "":
-                    return None
-                try:
-                    return int(v)
-                except ValueError:
-                    raise
+        dirty = self._edits.rows()
+        if not dirty:
+            QMessageBox.information(self, "Hinweis", "Keine Änderungen."); return
 
+        rows: List[Tuple[int, Optional[int], Optional[int]]] = []
+        for r in dirty:
+            mid = self._matches[r][0]
+            s1_txt = self.tbl_matches.item(r, 3).text() if self.tbl_matches.item(r, 3) else ""
+            s2_txt = self.tbl_matches.item(r, 4).text() if self.tbl_matches.item(r, 4) else ""
             try:
                 s1 = parse(s1_txt); s2 = parse(s2_txt)
             except ValueError:
@@ -634,17 +370,23 @@ class GruppenphaseView(QWidget):
             if s1 is not None and s2 is not None and s1 == s2:
                 QMessageBox.warning(self, "Ungültig", f"Zeile {r+1}: Unentschieden ist nicht erlaubt.")
                 return
+            rows.append((mid, s1, s2))
 
-            save_match_result(mid, s1, s2)
-            changed += 1
+        # Alles in einer Transaktion; nur geänderte Spiele werden geschrieben
+        try:
+            changed = save_results_batch(rows)
+        except ValueError as e:
+            QMessageBox.warning(self, "Ungültig", str(e)); return
+        if not changed:
+            QMessageBox.information(self, "Hinweis", "Keine Änderungen."); return
 
         # Nach Speichern Tabelle berechnen und ggf. Popup zeigen
         tid = self._current_turnier_id(); gid = self._current_group_id()
         mode_key = _get_turnier_rank_mode(tid) if tid else "punkte"
-        rows, tie_groups = _compute_table(tid, gid, mode_key) if (tid and gid) else ([], [])
-        self._load_table_into_table(rows, tie_groups, show_dialog=True)
+        tbl_rows, tie_groups = _compute_table(tid, gid, mode_key) if (tid and gid) else ([], [])
+        self._load_table_into_table(tbl_rows, tie_groups, show_dialog=True)
 
-        QMessageBox.information(self, "OK", f"{changed} Spiele gespeichert.")
+        QMessageBox.information(self, "OK", f"{len(changed)} Spiele gespeichert.")
         # Liste neu laden (z. B. Board-Texte)
         self._load_matches_only()
 
@@ -660,3 +402,16 @@ class GruppenphaseView(QWidget):
         if not tid or not gid: return
         _assign_boards_fair_for_group(tid, gid)
         self._load_matches_only()
+
+    def _schedule_slots(self):
+        tid = self._current_turnier_id()
+        if not tid: return
+        try:
+            plan = schedule_group_slots(tid, DB_PATH.as_posix())
+        except ValueError as e:
+            QMessageBox.warning(self, "Zeitplan", str(e)); return
+        QMessageBox.information(
+            self, "Zeitplan",
+            f"{plan.spiele} offene Spiele eingeplant – {plan.slots} Slots (Untergrenze {plan.untergrenze}).\n"
+            f"Leerlauf: {plan.leerlauf} Slots gesamt, max. {plan.max_leerlauf} je Spieler.")
+        self._load_matches_only()
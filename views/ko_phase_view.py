@@ -1,8 +1,7 @@
 from __future__ import annotations
-import random
 import sqlite3
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton,
@@ -11,18 +10,16 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from database.connection import get_connection
+from database.scheduler import assign_round_boards, schedule_ko_slots
+from database.boards import board_label
+from database.seeding import SEEDINGS
+from utils.ui import ScoreEdits
 from database.models import (
     fetch_turniere, generate_ko_bracket_total, fetch_ko_rounds, fetch_ko_matches,
-    save_ko_result_and_propagate, clear_ko_matches, fetch_ko_champion,
-    rebuild_rangliste_for_turnier
+    save_ko_results, preview_ko_results, clear_ko_matches, fetch_ko_champion
 )
 
-try:
-    from database.models import ensure_bronze_from_semis
-    _HAS_ENSURE_BRONZE = True
-except Exception:
-    _HAS_ENSURE_BRONZE = False
-
 DELETE_PASSWORD = "6460"
 BRONZE_LABEL = "Bronze"
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "ibu.sqlite"
@@ -32,130 +29,13 @@ DB_PATH = Path(__file__).resolve().parents[1] / "data" / "ibu.sqlite"
 # DB-Helfer
 # -----------------------------
 
-def _ensure_schema_v094(con: sqlite3.Connection) -> None:
-    cur = con.cursor()
-    # Dartscheiben-Tabelle (global)
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS dartscheiben (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nummer INTEGER NOT NULL UNIQUE,
-            name TEXT NOT NULL,
-            aktiv INTEGER NOT NULL DEFAULT 1
-        );
-        """
-    )
-    # Board-Zuordnung pro KO-Spiel
-    cur.execute("PRAGMA table_info(ko_spiele);")
-    ks_cols = {row[1] for row in cur.fetchall()}
-    if "board_id" not in ks_cols:
-        try:
-            cur.execute("ALTER TABLE ko_spiele ADD COLUMN board_id INTEGER NULL REFERENCES dartscheiben(id);")
-        except Exception:
-            pass
-    con.commit()
-
-
 def _db() -> sqlite3.Connection:
-    con = sqlite3.connect(DB_PATH.as_posix())
-    con.row_factory = sqlite3.Row
-    _ensure_schema_v094(con)
-    return con
-
-
-def _boards_list(only_active: bool = True) -> List[sqlite3.Row]:
-    with _db() as con:
-        if only_active:
-            return list(con.execute("SELECT * FROM dartscheiben WHERE aktiv=1 ORDER BY nummer").fetchall())
-        return list(con.execute("SELECT * FROM dartscheiben ORDER BY aktiv DESC, nummer").fetchall())
-
-
-def _board_name(board_row: sqlite3.Row | None) -> str:
-    if not board_row:
-        return ""
-    return f"{board_row['nummer']} – {board_row['name']}"
-
-
-def _get_board(board_id: Optional[int]) -> Optional[sqlite3.Row]:
-    if not board_id:
-        return None
-    with _db() as con:
-        return con.execute("SELECT * FROM dartscheiben WHERE id=?", (board_id,)).fetchone()
+    # Schema (dartscheiben, ko_spiele.board_id) legt database/schema.py einmalig an
+    return get_connection(DB_PATH.as_posix())
 
 
 def _assign_boards_fair_for_round(tid: int, rsel: int) -> None:
-    boards = _boards_list(True)
-    if not boards:
-        return
-    with _db() as con:
-        # KO-Matches der Runde
-        matches = con.execute(
-            """
-            SELECT id, p1_id, p2_id, board_id
-            FROM ko_spiele
-            WHERE turnier_id=? AND runde=?
-            ORDER BY match_no, id
-            """,
-            (tid, int(rsel)),
-        ).fetchall()
-
-        # Zaehler
-        count_sb: Dict[tuple[int, int], int] = {}
-        count_b: Dict[int, int] = {b["id"]: 0 for b in boards}
-
-        # Historie (Gruppen + KO)
-        hist1 = con.execute(
-            "SELECT p1_id, p2_id, board_id FROM spiele WHERE turnier_id=? AND board_id IS NOT NULL",
-            (tid,),
-        ).fetchall()
-        hist2 = con.execute(
-            "SELECT p1_id, p2_id, board_id FROM ko_spiele WHERE turnier_id=? AND board_id IS NOT NULL",
-            (tid,),
-        ).fetchall()
-        for row in list(hist1) + list(hist2):
-            b = row["board_id"]
-            if not b:
-                continue
-            for pid in (row["p1_id"], row["p2_id"]):
-                if pid is None:
-                    continue
-                count_sb[(pid, b)] = count_sb.get((pid, b), 0) + 1
-            count_b[b] = count_b.get(b, 0) + 1
-
-        # Zuweisung
-        for m in matches:
-            if m["board_id"]:
-                bid = int(m["board_id"])
-                for pid in (m["p1_id"], m["p2_id"]):
-                    if pid is None:
-                        continue
-                    count_sb[(pid, bid)] = count_sb.get((pid, bid), 0) + 1
-                count_b[bid] = count_b.get(bid, 0) + 1
-                continue
-
-            p1, p2 = m["p1_id"], m["p2_id"]
-            best_bid = None
-            best_tuple = None
-            for b in boards:
-                bid = b["id"]
-                sum_players = 0
-                for pid in (p1, p2):
-                    if pid is None:
-                        continue
-                    sum_players += count_sb.get((pid, bid), 0)
-                tup = (sum_players, count_b.get(bid, 0), b["nummer"])  # Spieler-last, global, Nummer
-                if best_tuple is None or tup < best_tuple:
-                    best_tuple = tup
-                    best_bid = bid
-            if best_bid is None:
-                best_bid = boards[0]["id"]
-            con.execute("UPDATE ko_spiele SET board_id=? WHERE id=?", (best_bid, m["id"]))
-            count_b[best_bid] = count_b.get(best_bid, 0) + 1
-            for pid in (p1, p2):
-                if pid is None:
-                    continue
-                count_sb[(pid, best_bid)] = count_sb.get((pid, best_bid), 0) + 1
-        con.commit()
+    assign_round_boards(tid, int(rsel), DB_PATH.as_posix())
 
 
 # -----------------------------
@@ -181,10 +61,23 @@ class KOPhaseView(QWidget):
         self.cb_turnier = QComboBox(); self.cb_turnier.currentIndexChanged.connect(self._on_turnier_changed)
         top.addWidget(self.cb_turnier, 1)
 
-        top.addWidget(QLabel("Gesamt-Qualifikanten (2,4,6,8,16,):"))
-        self.sb_total = QSpinBox(); self.sb_total.setRange(2, 128); self.sb_total.setSingleStep(2); self.sb_total.setValue(8)
+        top.addWidget(QLabel("Gesamt-Qualifikanten:"))
+        self.sb_total = QSpinBox(); self.sb_total.setRange(2, 256); self.sb_total.setValue(8)
         top.addWidget(self.sb_total)
 
+        top.addWidget(QLabel("Setzung:"))
+        self.cb_seeding = QComboBox()
+        for key, (label, _fn) in SEEDINGS.items():
+            self.cb_seeding.addItem(label, key)
+        top.addWidget(self.cb_seeding)
+
+        top.addWidget(QLabel("Gleiche Gruppe ab Runde:"))
+        self.sb_same_group = QSpinBox(); self.sb_same_group.setRange(0, 8); self.sb_same_group.setValue(0)
+        self.sb_same_group.setSpecialValueText("Auto")  # 0 -> None: bis Runde 2 trennen, wenn möglich
+        self.sb_same_group.setToolTip("Spieler derselben Gruppe treffen frühestens in dieser Runde aufeinander (1 = egal; "
+                                      "Auto = ab Runde 2, soweit die Gruppen es zulassen).")
+        top.addWidget(self.sb_same_group)
+
         self.btn_build = QPushButton("KO-Plan erstellen/überschreiben"); self.btn_build.clicked.connect(self._on_build_clicked)
         top.addWidget(self.btn_build)
 
@@ -198,26 +91,32 @@ class KOPhaseView(QWidget):
         self.btn_assign_boards = QPushButton("Scheiben für Runde zuweisen"); self.btn_assign_boards.clicked.connect(self._assign_boards_current_round)
         top.addWidget(self.btn_assign_boards)
 
+        self.btn_schedule = QPushButton("Zeitplan (Slots)"); self.btn_schedule.clicked.connect(self._schedule_slots)
+        self.btn_schedule.setToolTip("Alle offenen KO-Spiele in Wellen auf die aktiven Scheiben verteilen (Runde für Runde).")
+        top.addWidget(self.btn_schedule)
+
         mid = QHBoxLayout(); root.addLayout(mid)
         mid.addWidget(QLabel("Runde:"))
         self.cb_round = QComboBox(); self.cb_round.currentIndexChanged.connect(self._on_round_changed)
         mid.addWidget(self.cb_round)
         self.lbl_champion = QLabel("\U0001F3C6 Sieger: –"); mid.addWidget(self.lbl_champion, 1)
 
-        self.tbl = QTableWidget(0, 6)
-        self.tbl.setHorizontalHeaderLabels(["Match", "Spieler 1", "Spieler 2", "S1", "S2", "Scheibe"])
+        self.tbl = QTableWidget(0, 7)
+        self.tbl.setHorizontalHeaderLabels(["Match", "Spieler 1", "Spieler 2", "S1", "S2", "Scheibe", "Slot"])
         self.tbl.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self.tbl.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.tbl.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         self.tbl.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
         self.tbl.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
         self.tbl.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+        self.tbl.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeMode.ResizeToContents)
         # ✅ Editier-Modus: Benutzer kann S1/S2 per Doppelklick/AnyKey/EditKey öffnen
         self.tbl.setEditTriggers(
             QAbstractItemView.EditTrigger.DoubleClicked
             | QAbstractItemView.EditTrigger.EditKeyPressed
             | QAbstractItemView.EditTrigger.AnyKeyPressed
         )
+        self._edits = ScoreEdits(self.tbl)  # nur geänderte S1/S2 werden gespeichert
         root.addWidget(self.tbl)
 
         bottom = QHBoxLayout(); root.addLayout(bottom)
@@ -229,23 +128,13 @@ class KOPhaseView(QWidget):
         super().showEvent(event)
         self._reload_turniere_keep_selection()
 
-    # Hilfsfunktion: Runden-Label anhand Matchanzahl bestimmen
-    def _round_display_name(self, tid: int, r: int) -> str:
+    # Hilfsfunktion: Runden-Label anhand des Abstands zum Finale (Runde 1 kann Freilos-Lücken haben)
+    def _round_display_name(self, r: int, final_round: int) -> str:
         if r == 99:
             return BRONZE_LABEL
-        matches = fetch_ko_matches(tid, int(r))
-        n = len(matches)
-        if n == 1:
-            return "Finale"
-        if n == 2:
-            return "Halbfinale"
-        if n == 4:
-            return "Viertelfinale"
-        if n == 8:
-            return "Achtelfinale"
-        if n == 16:
-            return "Sechzehntelfinale"
-        return f"Runde {r}"
+        names = ["Finale", "Halbfinale", "Viertelfinale", "Achtelfinale", "Sechzehntelfinale"]
+        d = final_round - r
+        return names[d] if 0 <= d < len(names) else f"Runde {r}"
 
     # Laden
     def _load_turniere(self):
@@ -279,7 +168,7 @@ class KOPhaseView(QWidget):
         bronze_present = 99 in rounds
         rounds = [r for r in rounds if r != 99]
         for r in rounds:
-            self.cb_round.addItem(self._round_display_name(tid, r), r)
+            self.cb_round.addItem(self._round_display_name(r, max(rounds)), r)
         if bronze_present:
             self.cb_round.addItem(BRONZE_LABEL, 99)
         self.cb_round.blockSignals(False)
@@ -288,22 +177,21 @@ class KOPhaseView(QWidget):
     def _reload_matches(self):
         tid = self.current_tid
         if not tid: return
-        if _HAS_ENSURE_BRONZE:
-            try: ensure_bronze_from_semis(tid)
-            except Exception: pass
         rsel = self.cb_round.currentData()
         if rsel is None: self._reload_rounds(); rsel = self.cb_round.currentData()
         matches = fetch_ko_matches(tid, int(rsel)) if rsel is not None else []
 
         with _db() as con:
             rows = con.execute(
-                "SELECT id, board_id FROM ko_spiele WHERE turnier_id=? AND runde=? ORDER BY match_no, id",
+                """
+                SELECT k.id, d.nummer, d.name, k.slot FROM ko_spiele k
+                LEFT JOIN dartscheiben d ON d.id=k.board_id
+                WHERE k.turnier_id=? AND k.runde=? ORDER BY k.match_no, k.id
+                """,
                 (tid, int(rsel) if rsel is not None else -1),
             ).fetchall()
-            board_map: Dict[int, str] = {}
-            for r in rows:
-                b = _get_board(r["board_id"]) if r["board_id"] else None
-                board_map[r["id"]] = _board_name(b)
+            board_map: Dict[int, str] = {r["id"]: board_label(r["nummer"], r["name"]) for r in rows}
+            slot_map: Dict[int, str] = {r["id"]: "" if r["slot"] is None else str(r["slot"]) for r in rows}
 
         self.tbl.setRowCount(0)
         for mid, match_no, n1, n2, s1, s2 in matches:
@@ -326,6 +214,9 @@ class KOPhaseView(QWidget):
             # Board (read-only Text)
             b_item = QTableWidgetItem(board_map.get(mid, "")); b_item.setFlags(b_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
             self.tbl.setItem(row, 5, b_item)
+            sl_item = QTableWidgetItem(slot_map.get(mid, "")); sl_item.setFlags(sl_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self.tbl.setItem(row, 6, sl_item)
+        self._edits.reset()
         self._update_champion()
 
     def _on_round_changed(self): self._reload_matches()
@@ -341,20 +232,10 @@ class KOPhaseView(QWidget):
         if not tid: return
         total = int(self.sb_total.value())
         try:
-            if total == 6:
-                # 6 Teilnehmer -> 8er-Bracket + 2 BYEs in Viertelfinale
-                generate_ko_bracket_total(tid, 8)
-                QMessageBox.information(self, "KO-Plan", "8er-Bracket erzeugt (für 6 Teilnehmer). Zwei BYEs werden zufällig vergeben.")
-                self._reload_rounds()
-                with _db() as con:
-                    qms = con.execute("SELECT id FROM ko_spiele WHERE turnier_id=? AND runde=1 ORDER BY match_no, id", (tid,)).fetchall()
-                    qm_ids = [row["id"] for row in qms]
-                if len(qm_ids) >= 2:
-                    for mid in random.sample(qm_ids, 2):
-                        try: save_ko_result_and_propagate(mid, 1, 0, tid)
-                        except TypeError: save_ko_result_and_propagate(mid, 1, 0)
-            else:
-                generate_ko_bracket_total(tid, total)
+            # Beliebige Anzahl: fehlende Plätze bis zur 2er-Potenz werden als Freilose gesetzt
+            generate_ko_bracket_total(
+                tid, total, self.cb_seeding.currentData(), int(self.sb_same_group.value()) or None
+            )
 
             # Erste vorhandene Runde ermitteln (nicht Bronze) und Boards sofort zuweisen
             rounds_now = [r for r in fetch_ko_rounds(tid) if r != 99]
@@ -377,7 +258,11 @@ class KOPhaseView(QWidget):
     def _save_results(self):
         tid = self.current_tid
         if not tid: return
-        for row in range(self.tbl.rowCount()):
+        dirty = self._edits.rows()
+        if not dirty:
+            QMessageBox.information(self, "Gespeichert", "Keine Änderungen."); return
+        rows = []
+        for row in dirty:
             mid = self.tbl.item(row, 0).data(Qt.ItemDataRole.UserRole)
             try:
                 s1_txt = (self.tbl.item(row, 3).text() if self.tbl.item(row, 3) else "").strip()
@@ -390,19 +275,49 @@ class KOPhaseView(QWidget):
             if s1 is not None and s2 is not None and s1 == s2:
                 QMessageBox.warning(self, "Ungültig", f"Match {mid}: Unentschieden ist nicht erlaubt.")
                 return
-            try:
-                save_ko_result_and_propagate(mid, s1, s2, tid)
-            except TypeError:
-                save_ko_result_and_propagate(mid, s1, s2)
-            except Exception as e:
-                QMessageBox.critical(self, "Fehler beim Speichern", f"Match {mid}: {e}")
+            rows.append((int(mid), s1, s2))
+        # Korrekturen früherer Runden verwerfen spätere Ergebnisse -> vorher nachfragen
+        try:
+            stale = preview_ko_results(rows).zurueckgesetzt
+        except ValueError as e:
+            QMessageBox.warning(self, "Ungültig", str(e)); return
+        if stale:
+            lst = "\n".join(
+                f"{BRONZE_LABEL if r == 99 else f'Runde {r}'}, Match {no}" for _mid, r, no in stale
+            )
+            if QMessageBox.question(
+                self, "Spätere Ergebnisse verwerfen?",
+                f"Diese Korrektur ändert die Paarungen folgender, bereits gespielter Spiele:\n{lst}\n\n"
+                "Deren Ergebnisse werden gelöscht. Fortfahren?",
+            ) != QMessageBox.StandardButton.Yes:
                 return
-        try: rebuild_rangliste_for_turnier(tid)
-        except Exception: pass
-        QMessageBox.information(self, "Gespeichert", "Ergebnisse gespeichert.")
+        # Eine Transaktion: Weitertragen, Bronze & Rangliste passieren beim Schreiben
+        try:
+            res = save_ko_results(rows)
+        except Exception as e:
+            QMessageBox.critical(self, "Fehler beim Speichern", str(e))
+            return
+        if not res.geaendert:
+            QMessageBox.information(self, "Gespeichert", "Keine Änderungen."); return
+        msg = "Ergebnisse gespeichert."
+        if res.zurueckgesetzt:
+            msg += f" {len(res.zurueckgesetzt)} spätere Ergebnisse wurden zurückgesetzt."
+        QMessageBox.information(self, "Gespeichert", msg)
         self._reload_rounds(); self._reload_matches()
 
     def _assign_boards_current_round(self):
         tid = self.current_tid; rsel = self.cb_round.currentData()
         if not tid or rsel is None: return
         _assign_boards_fair_for_round(tid, int(rsel)); self._reload_matches()
+
+    def _schedule_slots(self):
+        tid = self.current_tid
+        if not tid: return
+        try:
+            plan = schedule_ko_slots(tid, DB_PATH.as_posix())
+        except ValueError as e:
+            QMessageBox.warning(self, "Zeitplan", str(e)); return
+        QMessageBox.information(
+            self, "Zeitplan",
+            f"{plan.spiele} offene KO-Spiele eingeplant – {plan.slots} Slots (Untergrenze {plan.untergrenze}).")
+        self._reload_matches()
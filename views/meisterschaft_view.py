@@ -18,7 +18,7 @@ from database.models import (
     fetch_meisterschaften, fetch_turniere,
     fetch_punkteschema, save_punkteschema, standard_punkteschema_basic,
     set_meisterschaft_turniere, fetch_meisterschaft_turnier_ids,
-    compute_meisterschaft_rangliste
+    compute_meisterschaft_rangliste, rebuild_meisterschaft_rangliste
 )
 
 STANDARD_FALLBACK5 = 5  # Ab Platz 5
@@ -44,7 +44,7 @@ class MeisterschaftView(QWidget):
         head.addWidget(self.cbo_ms, 2)
 
         self.btn_recalc = QPushButton("Rangliste neu berechnen")
-        self.btn_recalc.clicked.connect(self._load_rangliste)
+        self.btn_recalc.clicked.connect(self._recalc_rangliste)
         head.addWidget(self.btn_recalc)
 
         root.addLayout(head)
@@ -206,6 +206,12 @@ class MeisterschaftView(QWidget):
         self._load_rangliste()
 
     # ---- Rangliste ----
+    def _recalc_rangliste(self):
+        ms_id = self._current_ms_id()
+        if ms_id is not None:
+            rebuild_meisterschaft_rangliste(ms_id)
+        self._load_rangliste()
+
     def _load_rangliste(self):
         self.tbl_rank.setRowCount(0)
         ms_id = self._current_ms_id()
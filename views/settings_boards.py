@@ -9,32 +9,12 @@ from PyQt6.QtWidgets import (
     QPushButton, QInputDialog, QLineEdit, QMessageBox, QHeaderView, QLabel
 )
 
+from database.boards import add_board, delete_board, fetch_boards, rename_board, toggle_board
+
 DELETE_PASSWORD = "6460"
 DB_PATH = Path(__file__).resolve().parents[1] / "data" / "ibu.sqlite"
 
 
-def _ensure_schema(con: sqlite3.Connection) -> None:
-    cur = con.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS dartscheiben (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nummer INTEGER NOT NULL UNIQUE,
-            name TEXT NOT NULL,
-            aktiv INTEGER NOT NULL DEFAULT 1
-        );
-        """
-    )
-    con.commit()
-
-
-def _db() -> sqlite3.Connection:
-    con = sqlite3.connect(DB_PATH.as_posix())
-    con.row_factory = sqlite3.Row
-    _ensure_schema(con)
-    return con
-
-
 class BoardsSettingsWidget(QWidget):
     """Dartscheiben-Verwaltung für den Einstellungen-Tab.
 
@@ -75,8 +55,7 @@ class BoardsSettingsWidget(QWidget):
         root.addLayout(btns)
 
     def _reload(self):
-        with _db() as con:
-            rows = con.execute("SELECT * FROM dartscheiben ORDER BY aktiv DESC, nummer").fetchall()
+        rows = fetch_boards(False, DB_PATH.as_posix())  # gemeinsames, gecachtes Register
         self.tbl.setRowCount(len(rows))
         for r, row in enumerate(rows):
             self.tbl.setItem(r, 0, QTableWidgetItem(str(row["nummer"])))
@@ -92,24 +71,18 @@ class BoardsSettingsWidget(QWidget):
         if not ok: return
         name, ok = QInputDialog.getText(self, "Name", "Bezeichnung:")
         if not ok: return
-        with _db() as con:
-            try:
-                con.execute("INSERT INTO dartscheiben(nummer, name, aktiv) VALUES(?,?,1)", (num, name.strip() or f"Board {num}"))
-                con.commit()
-            except sqlite3.IntegrityError:
-                QMessageBox.warning(self, "Fehler", "Nummer bereits vergeben.")
-                return
+        try:
+            add_board(num, name.strip() or f"Board {num}", DB_PATH.as_posix())
+        except sqlite3.IntegrityError:
+            QMessageBox.warning(self, "Fehler", "Nummer bereits vergeben.")
+            return
         self._reload()
 
     def _toggle(self):
         r = self.tbl.currentRow()
         if r < 0: return
         bid = int(self.tbl.item(r, 0).data(Qt.ItemDataRole.UserRole))
-        with _db() as con:
-            cur = con.execute("SELECT aktiv FROM dartscheiben WHERE id=?", (bid,)).fetchone()
-            newv = 0 if cur and cur[0] else 1
-            con.execute("UPDATE dartscheiben SET aktiv=? WHERE id=?", (newv, bid))
-            con.commit()
+        toggle_board(bid, DB_PATH.as_posix())
         self._reload()
 
     def _rename(self):
@@ -118,9 +91,7 @@ class BoardsSettingsWidget(QWidget):
         bid = int(self.tbl.item(r, 0).data(Qt.ItemDataRole.UserRole))
         name, ok = QInputDialog.getText(self, "Umbenennen", "Neuer Name:")
         if not ok: return
-        with _db() as con:
-            con.execute("UPDATE dartscheiben SET name=? WHERE id=?", (name.strip(), bid))
-            con.commit()
+        rename_board(bid, name.strip(), DB_PATH.as_posix())
         self._reload()
 
     def _delete(self):
@@ -132,7 +103,5 @@ class BoardsSettingsWidget(QWidget):
         if (pw or "").strip() != DELETE_PASSWORD:
             QMessageBox.warning(self, "Abbruch", "Falsches Passwort.")
             return
-        with _db() as con:
-            con.execute("DELETE FROM dartscheiben WHERE id=?", (bid,))
-            con.commit()
+        delete_board(bid, DB_PATH.as_posix())
         self._reload()
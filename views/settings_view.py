@@ -11,6 +11,8 @@ from PyQt6.QtWidgets import (
     QLineEdit, QMessageBox, QGroupBox, QTabWidget
 )
 
+from database.connection import checkpoint, close_all
+
 APP_ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = APP_ROOT / "data"
 DB_FILE = DATA_DIR / "ibu.sqlite"
@@ -182,6 +184,7 @@ class SettingsView(QWidget):
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         dst = BACKUPS_DIR / f"ibu_backup_{ts}.sqlite"
         try:
+            checkpoint(DB_FILE.as_posix())
             shutil.copy2(DB_FILE, dst)
             QMessageBox.information(self, "Backup", f"Backup gespeichert: {dst.name}")
         except Exception as e:
@@ -201,6 +204,9 @@ class SettingsView(QWidget):
             return
         src = Path(fn)
         try:
+            close_all()  # offene Verbindungen (WAL) vor dem Überschreiben schließen
+            for suffix in ("-wal", "-shm"):
+                Path(DB_FILE.as_posix() + suffix).unlink(missing_ok=True)
             shutil.copy2(src, DB_FILE)
             QMessageBox.information(self, "Restore", f"Datenbank aus {src.name} wiederhergestellt.")
         except Exception as e: